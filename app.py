@@ -1,19 +1,37 @@
 from datetime import date
+import contextlib
+import dataclasses
+import functools
+import hashlib
+import io
+import json
+import os
+import uuid
 import streamlit as st
 import numpy as np
-import plotly.express as px
+# Déjà chargé par Streamlit ; folium, streamlit_folium, fpdf (engine.report)
+# et pandas ne sont importés que par les pages et fonctions qui s'en servent
 import plotly.graph_objects as go
-from engine.ahp_logic import AHPEngine
-import folium
-from streamlit_folium import st_folium
-from fpdf import FPDF
-from fpdf.enums import XPos, YPos
+from engine.ahp_logic import AHPEngine, AHPLookup, SAATY_SLIDER_SCALE, reciprocal_matrices
+from engine.consistency import repair_consistency, format_judgment
+from engine.group import group_decision
+from engine.sensitivity import monte_carlo_sensitivity, rank_reversal_map, nearest_reversals
 import time
-from engine.data_loader import get_zone_context, get_available_zones
+from engine.data_loader import (get_zone_context, get_available_zones, get_zone_criteria,
+                                get_default_performance, CRITERES_ADDITIONNELS)
+from engine.pipeline import (OPTIONS, DEFAULT_FINANCE, HORIZON_YEARS, HYBRID_NETWORK_SHARE,
+                             score_options, recommend, option_projection)
+from engine.finance import project_options
+from engine.simulation import simulate_cash_flows
+from engine.photos import PhotoPipeline, JPEG_QUALITY
+from engine.charts import ChartRenderer, donut_svg, report_chart_specs
+from engine.figures import create_radar_chart, create_weights_donut, create_cost_curves
+from engine.warmup import WarmUp
+from engine.instrumentation import Instrumentation, RerunProfile
 
 # --- ÉCRAN DE CHARGEMENT ---
 def show_loading_screen():
-    """Affiche un écran de chargement avec animations"""
+    """Affiche un écran de chargement avec animations (tant que le préchauffage n'est pas terminé)"""
     st.markdown("""
     <style>
     .loading-container {
@@ -136,88 +154,216 @@ def show_loading_screen():
         <div class="loading-subtext">Initialisation des modules AHP, carte et calculs financiers...</div>
     </div>
     """, unsafe_allow_html=True)
+
+def build_ahp_lookup():
+    """Table AHP préremplie pour tout le domaine des curseurs"""
+    lookup = AHPLookup(AHPEngine(lambda_method="auto"))
+    lookup.precompute(SAATY_SLIDER_SCALE)
+    return lookup
+
+def warm_plotly():
+    """Premier tracé de chaque figure Plotly (chargement des gabarits et des validateurs)"""
+    figures = [create_weights_donut([1, 1], ["a", "b"]),
+               create_cost_curves([0, 1], [[0, 1]] * 3),
+               create_radar_chart([1, 1, 1], [1, 1, 1], [1, 1, 1])]
+    return [fig.to_json() for fig in figures]
+
+def warm_site_map():
+    """Carte de base de la zone par défaut (tuiles, icônes et gabarits folium, composant streamlit_folium)"""
+    import streamlit_folium  # noqa: F401
+    
+    zone = get_zone_context()
+    coords = zone["coordonnees"]
+    return site_map(coords["latitude"], coords["longitude"], coords["zoom"], zone["quartier"], zone["description"])
+
+def warm_report():
+    """Gabarit du rapport (métriques des polices, justifications) et premier graphique SVG"""
+    from engine.report import get_report_template
     
-    # Pause pour montrer l'animation (optionnel)
-    time.sleep(1.5)
+    template = get_report_template()
+    pdf = template.new_document()
+    pdf.add_page()
+    pdf.image(io.BytesIO(donut_svg(["a", "b"], [1, 1])), x=20, w=170)
+    return template
+
+@st.cache_resource
+def get_warm_up():
+    """Préchauffage du processus, lancé en arrière-plan dès la page d'accueil (une fois par processus)"""
+    return WarmUp({
+        "Tables AHP": build_ahp_lookup,
+        "Zones et carte de base": warm_site_map,
+        "Figures Plotly": warm_plotly,
+        "Polices et gabarit du rapport": warm_report,
+        "Rendu des graphiques du rapport": ChartRenderer,
+    }).start()
+
+def get_ahp_lookup():
+    """Table AHP partagée par le processus (préparée par le préchauffage)"""
+    return get_warm_up().result("Tables AHP")
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def run_sensitivity(comparisons, performances, n_samples, judgment_spread, score_spread):
+    """Analyse Monte Carlo mise en cache par jeu d'entrées (graine fixe, résultat reproductible)"""
+    result = monte_carlo_sensitivity(comparisons, performances, [label for *_, label in OPTIONS],
+                                     n_samples=n_samples, judgment_spread=judgment_spread,
+                                     score_spread=score_spread, seed=0)
+    # Un sous-échantillon suffit pour les boîtes à moustaches
+    result["scores"] = result["scores"][:5000]
+    return result
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def get_rank_reversal_map(performances):
+    """Carte des verdicts sur tout le domaine des curseurs, mise en cache par jeu de notes"""
+    return rank_reversal_map(performances, [label for *_, label in OPTIONS], SAATY_SLIDER_SCALE,
+                             AHPEngine(lambda_method="auto"))
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def run_cash_flow_simulation(capex, opex_monthly, months, n_paths, network_share, risks):
+    """Simulation des risques mise en cache par jeu d'entrées (graine fixe, résultat reproductible)"""
+    result = simulate_cash_flows(capex, opex_monthly, months, n_paths, dict(risks), network_share, seed=0)
+    # Les coûts par trajectoire ne sont pas affichés
+    del result["final_costs"]
+    return result
+
+@st.cache_resource
+def get_photo_pipeline():
+    """Vignettes et photos d'impression partagées par le processus (qualité JPEG choisie à l'encodage)"""
+    return PhotoPipeline()
+
+def get_chart_renderer():
+    """Graphiques du rapport rendus en arrière-plan, partagés par le processus (cache par spec)"""
+    return get_warm_up().result("Rendu des graphiques du rapport")
+
+# --- FIGURES ET CARTE EN CACHE ---
+# Chaque construction renvoie (objet, durée de construction en s) : cached_stage()
+# en déduit le temps gagné à chaque rerun servi par le cache.
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def build_radar_chart(camwater_scores, forage_scores, hybride_scores, categories):
+    """Radar des performances, partagé en lecture seule (st.plotly_chart ne modifie pas la figure)"""
+    start = time.perf_counter()
+    fig = create_radar_chart(list(camwater_scores), list(forage_scores), list(hybride_scores), list(categories))
+    return fig, time.perf_counter() - start
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def build_weights_donut(weights, labels):
+    """Anneau des poids des critères, partagé en lecture seule"""
+    start = time.perf_counter()
+    fig = create_weights_donut(list(weights), list(labels))
+    return fig, time.perf_counter() - start
 
-def create_radar_chart(camwater_scores, forage_scores, hybride_scores):
+@st.cache_resource(max_entries=64, show_spinner=False)
+def build_cost_curves(years, cumulative):
+    """Courbes de coûts cumulés des 3 options, partagées en lecture seule"""
+    start = time.perf_counter()
+    fig = create_cost_curves(years, cumulative, [label for *_, label in OPTIONS])
+    return fig, time.perf_counter() - start
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def build_site_map(lat, lon, zoom, quartier, description):
     """
-    Crée un graphique radar pour comparer les performances des options
-    sur les 3 critères : Coût, Disponibilité, Accessibilité
+    Carte de base de la zone. Mise en cache par valeur : folium modifie la
+    carte à chaque rendu, chaque rerun en reçoit donc une copie neuve (mêmes
+    identifiants d'éléments, la carte n'est pas rechargée par le navigateur).
     """
-    categories = ['Coût', 'Disponibilité', 'Accessibilité']
-    
-    fig = go.Figure()
-    
-    # Courbe pour CAMWATER
-    fig.add_trace(go.Scatterpolar(
-        r=camwater_scores,
-        theta=categories,
-        fill='toself',
-        name='CAMWATER',
-        line_color='#003399',
-        fillcolor='rgba(0, 51, 153, 0.2)'
-    ))
-    
-    # Courbe pour FORAGE
-    fig.add_trace(go.Scatterpolar(
-        r=forage_scores,
-        theta=categories,
-        fill='toself',
-        name='FORAGE',
-        line_color='#228B22',
-        fillcolor='rgba(34, 139, 34, 0.2)'
-    ))
-    
-    # Courbe pour HYBRIDE
-    fig.add_trace(go.Scatterpolar(
-        r=hybride_scores,
-        theta=categories,
-        fill='toself',
-        name='HYBRIDE',
-        line_color='#FFA500',
-        fillcolor='rgba(255, 165, 0, 0.2)'
-    ))
-    
-    fig.update_layout(
-        polar=dict(
-            radialaxis=dict(
-                visible=True,
-                range=[0, 10],
-                tickfont=dict(size=10),
-                gridcolor='lightgray'
-            ),
-            angularaxis=dict(
-                tickfont=dict(size=12),
-                gridcolor='lightgray'
-            ),
-            bgcolor='white'
-        ),
-        showlegend=True,
-        legend=dict(
-            yanchor="top",
-            y=0.99,
-            xanchor="left",
-            x=1.05,
-            bgcolor='rgba(255, 255, 255, 0.8)',
-            bordercolor='gray',
-            borderwidth=1
-        ),
-        title={
-            'text': 'Analyse Comparative des Performances',
-            'y':0.95,
-            'x':0.5,
-            'xanchor': 'center',
-            'yanchor': 'top',
-            'font': dict(size=16, color='#003366')
-        },
-        paper_bgcolor='white',
-        plot_bgcolor='white',
-        height=500,
-        margin=dict(l=80, r=80, t=80, b=80)
-    )
-    
-    return fig    
+    start = time.perf_counter()
+    m = site_map(lat, lon, zoom, quartier, description)
+    return m, time.perf_counter() - start
+
+def site_map(lat, lon, zoom, quartier, description):
+    """Carte folium de la zone, avec capture des clics et marqueur du quartier"""
+    import folium
+    
+    m = folium.Map(location=[lat, lon], zoom_start=zoom)
+    m.add_child(folium.LatLngPopup())
+    
+    # Ajouter un marqueur pour la zone
+    folium.Marker(
+        [lat, lon],
+        popup=f"<b>{quartier}</b><br>{description[:50]}...",
+        tooltip=quartier,
+        icon=folium.Icon(color='blue', icon='tint', prefix='fa')
+    ).add_to(m)
+    return m
+
+def cached_stage(stage, build, *args):
+    """
+    Appelle une construction mise en cache et note, pour ce rerun, sa durée
+    initiale et celle de l'appel (le temps gagné est la différence).
+    """
+    start = time.perf_counter()
+    value, build_seconds = build(*args)
+    st.session_state.cache_timings[stage] = (build_seconds, time.perf_counter() - start)
+    return value
+
+# --- FRAGMENTS DU TABLEAU DE BORD ---
+# Chaque section du tableau de bord est un fragment nommé : un widget ne réexécute
+# que les sections qui dépendent de lui (rerun_fragments), pas tout le script.
+# Les résultats partagés entre sections passent par st.session_state.
+
+# Sections à réexécuter quand les jugements ou les notes changent (producteurs d'abord)
+DECISION_FRAGMENTS = ("ahp", "poids", "evaluation", "radar", "export")
+
+def rerun_fragments(*keys):
+    """
+    Callback de widget : ne réexécute que les fragments nommés, dans l'ordre
+    donné, puis le panneau des mesures (et celui de l'instrumentation).
+    """
+    st.session_state.rerun_scope = keys
+    st.session_state.cache_timings = {}
+    begin_profile(keys)
+    st.rerun([*keys, "mesures", *(["instrumentation"] if st.session_state.get("debug_panel") else [])])
+
+def timed_fragment(key):
+    """
+    Fragment nommé dont chaque exécution est chronométrée dans
+    st.session_state.fragment_timings (durée, rerun complet ou partiel).
+    """
+    def decorate(body):
+        @functools.wraps(body)
+        def run(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                with profiled(f"fragment {key}"):
+                    return body(*args, **kwargs)
+            finally:
+                # Pas de rerun complet depuis la dernière exécution : rerun partiel
+                record = st.session_state.fragment_timings.setdefault(key, {"partial_runs": 0})
+                partial = record.get("app_run") == st.session_state.app_runs
+                record.update(seconds=time.perf_counter() - start, partial=partial,
+                              app_run=st.session_state.app_runs)
+                record["partial_runs"] += partial
+        return st.fragment(run, key=key)
+    return decorate
+
+# --- INSTRUMENTATION (OPT-IN) ---
+# ?debug=1 : profil de chaque rerun de la session et panneau latéral 🛠️.
+# HYDRO_INSTRUMENTATION : profil de toutes les sessions (valeur 1, ou chemin d'un
+# journal JSON Lines où chaque rerun est ajouté).
+INSTRUMENTATION_ENV = os.environ.get("HYDRO_INSTRUMENTATION", "")
+
+@st.cache_resource
+def get_instrumentation():
+    """Durées par étape de toutes les sessions du processus (percentiles glissants)"""
+    return Instrumentation(log_path=INSTRUMENTATION_ENV if INSTRUMENTATION_ENV not in ("", "0", "1") else None)
+
+def begin_profile(scope=None):
+    """Ouvre le profil du rerun (complet si scope est None) quand l'instrumentation est activée"""
+    st.session_state.profile = (RerunProfile(st.session_state.session_tag, scope)
+                                if st.session_state.get("instrumented") else None)
+
+def profiled(stage):
+    """Chronomètre une étape du rerun en cours (sans effet hors instrumentation)"""
+    profile = st.session_state.get("profile")
+    return profile.stage(stage) if profile is not None else contextlib.nullcontext()
+
+def finish_profile():
+    """Enregistre le profil du rerun dans les mesures du processus"""
+    profile = st.session_state.get("profile")
+    if profile is not None:
+        st.session_state.last_profile = get_instrumentation().record(profile)
+        st.session_state.profile = None
+
 # --- CONFIGURATION INITIALE ---
 st.set_page_config(page_title="HYDRO-DECISIO | SIAD", layout="wide", page_icon="💧")
 
@@ -225,351 +371,597 @@ st.set_page_config(page_title="HYDRO-DECISIO | SIAD", layout="wide", page_icon="
 if "page" not in st.session_state:
     st.session_state.page = "home"
 
-# --- LOGIQUE PDF (COMPLÈTE AVEC 3 OPTIONS) ---
-def generate_pdf(score_cw, score_f, score_h, weights, cr, recommendation, 
-                 fin_data, zone_context=None, project_name="", 
-                 uploaded_images=[], gps_coords=None):
+def report_fingerprint(*parts):
     """
-    Génère un rapport PDF complet avec :
-    - Contexte de l'étude
-    - Analyse AHP
-    - Comparaison des options
-    - Synthèse financière
-    - Recommandation finale
+    Empreinte des entrées du rapport : ne change que si scores, finances,
+    zone, GPS, photos ou graphiques changent.
     """
+    digest = hashlib.sha256()
+    
+    def update(value):
+        if isinstance(value, np.ndarray):
+            digest.update(value.tobytes())
+        elif dataclasses.is_dataclass(value):
+            for field in dataclasses.fields(value):
+                update(getattr(value, field.name))
+        elif isinstance(value, dict):
+            for key in sorted(value, key=str):
+                update(key)
+                update(value[key])
+        elif hasattr(value, "future"):
+            # Graphique en cours de rendu : empreinte de sa spec
+            digest.update(value.digest.encode())
+        elif isinstance(value, (list, tuple)):
+            digest.update(f"[{len(value)}".encode())
+            for item in value:
+                update(item)
+        elif hasattr(value, "getvalue"):
+            # Photo téléversée : identifiant de l'envoi, sinon contenu
+            file_id = getattr(value, "file_id", None)
+            digest.update(file_id.encode() if file_id else value.getvalue())
+        else:
+            digest.update(repr(value).encode())
     
-    pdf = FPDF(orientation="P", unit="mm", format="A4")
-    pdf.set_margin(15)
-    pdf.add_page()
+    for part in parts:
+        update(part)
+    return digest.hexdigest()
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def render_report(fingerprint, _report_inputs):
+    """Rapport PDF mis en cache par empreinte des entrées (les entrées elles-mêmes ne sont pas hachées)"""
+    from engine.report import generate_pdf
+    return generate_pdf(**_report_inputs)
+
+def apply_consistency_repair(changes):
+    """Reporte les jugements corrigés sur les curseurs de comparaison"""
+    for key, value in changes.items():
+        st.session_state[key] = value
+    rerun_fragments(*DECISION_FRAGMENTS)
+
+# Modifie la fonction reset_inputs pour utiliser les valeurs de la zone :
+def reset_inputs():
+    zone_context = st.session_state.get('zone_context', get_zone_context())
+    criteria = get_zone_criteria(zone_context, st.session_state.get("extra_criteria", []))
+    
+    for i, crit_a in enumerate(criteria):
+        for crit_b in criteria[i + 1:]:
+            st.session_state[f"{crit_a['cle']}_vs_{crit_b['cle']}"] = 1
+    
+    # Utiliser les valeurs par défaut de la zone
+    for option, prefix, _, _ in OPTIONS:
+        for crit in criteria:
+            st.session_state[f"{prefix}_{crit['cle']}"] = get_default_performance(zone_context, option, crit)
+    rerun_fragments(*DECISION_FRAGMENTS)
+
+# --- SECTIONS DU TABLEAU DE BORD ---
+
+@timed_fragment("ahp")
+def ahp_sidebar(criteria):
+    """Jugements par paire (ou poids du groupe) et cohérence -> st.session_state.ahp_result"""
+    # Une comparaison par paire de critères, lue ligne par ligne (c_vs_d, c_vs_a, d_vs_a...)
+    comparisons = []
+    for i, crit_a in enumerate(criteria):
+        for crit_b in criteria[i + 1:]:
+            comparisons.append(st.select_slider(
+                f"{crit_a['libelle']} vs {crit_b['libelle']}", options=SAATY_SLIDER_SCALE, value=1,
+                key=f"{crit_a['cle']}_vs_{crit_b['cle']}", on_change=rerun_fragments, args=DECISION_FRAGMENTS))
+    st.button("🔄 Réinitialiser", on_click=reset_inputs)
+    
+    # Décision de groupe : une ligne de jugements par expert
+    group = None
+    with st.expander("👥 Décision de groupe"):
+        comparison_keys = [f"{a['cle']}_vs_{b['cle']}" for i, a in enumerate(criteria) for b in criteria[i + 1:]]
+        st.caption(f"CSV avec une ligne par expert et les colonnes {', '.join(comparison_keys)} "
+                   "(colonne « poids » optionnelle).")
+        group_file = st.file_uploader("Jugements des experts", type=["csv"], key="group_file",
+                                      on_change=rerun_fragments, args=DECISION_FRAGMENTS)
+        if group_file is not None:
+            import pandas as pd
+            experts = pd.read_csv(group_file)
+            missing = [key for key in comparison_keys if key not in experts.columns]
+            if missing:
+                st.error(f"Colonnes manquantes : {', '.join(missing)}")
+            else:
+                group = group_decision(
+                    reciprocal_matrices(experts[comparison_keys].to_numpy(dtype=float)),
+                    expert_weights=experts["poids"].to_numpy(dtype=float) if "poids" in experts else None,
+                    engine=AHPEngine(lambda_method="auto")
+                )
+                st.write(f"**{len(experts)}** experts — CR du groupe : {group['aij_cr']:.3f}")
+                st.write(f"Incohérents (CR ≥ 0.1) : {len(group['inconsistent'])} — "
+                         f"atypiques : {len(group['outliers'])}")
+                if len(group['outliers']):
+                    st.caption(f"Lignes atypiques : {', '.join(str(i + 1) for i in group['outliers'][:20])}")
+                if not st.toggle("Utiliser les poids du groupe", value=True, key="use_group",
+                                 on_change=rerun_fragments, args=DECISION_FRAGMENTS):
+                    group = None
+    
+    # Moteur AHP (résultats mémoïsés par jugements)
+    with profiled("compute_weights"):
+        weights, cr = get_ahp_lookup().get(comparisons)
+    if group is not None:
+        weights, cr = group["aij_weights"], group["aij_cr"]
+        # Jugements derrière les poids affichés (triangle supérieur de la matrice AIJ), pour les
+        # inversions de verdict et le Monte Carlo
+        comparisons = group["group_matrix"][np.triu_indices(len(criteria), 1)].tolist()
+    
+    # Suggestions de correction si les jugements sont incohérents
+    repair_suggestions = []
+    if cr >= 0.1 and group is None:
+        repair = repair_consistency(reciprocal_matrices([comparisons])[0], SAATY_SLIDER_SCALE,
+                                    engine=AHPEngine(lambda_method="auto"))
+        repair_changes = {}
+        for change in repair["changes"]:
+            crit_a, crit_b = criteria[change["i"]], criteria[change["j"]]
+            key = f"{crit_a['cle']}_vs_{crit_b['cle']}"
+            # Valeur exacte de l'échelle, attendue par le curseur
+            repair_changes[key] = min(SAATY_SLIDER_SCALE, key=lambda v: abs(v - change["new"]))
+            repair_suggestions.append(f"{crit_a['libelle']} vs {crit_b['libelle']} : "
+                                      f"{format_judgment(change['old'])} -> {format_judgment(change['new'])}")
+        st.warning(f"CR = {cr:.3f} ≥ 0.1 : jugements incohérents.")
+        if repair_suggestions:
+            st.markdown("**Corrections suggérées** (CR → "
+                        f"{repair['cr']:.3f}) :\n" + "\n".join(f"- {s}" for s in repair_suggestions))
+            st.button("✅ Appliquer les corrections", on_click=apply_consistency_repair,
+                      args=(repair_changes,), key="apply_repair")
+    
+    st.session_state.ahp_result = dict(comparisons=comparisons, weights=weights, cr=cr,
+                                       repair_suggestions=repair_suggestions, group=group is not None)
+
+@timed_fragment("projet")
+def project_section(zone_context):
+    """Nom du projet et photos du terrain -> st.session_state.project_info"""
+    with st.expander("📸 Informations Projet & Photos"):
+        col_p1, col_p2 = st.columns([2, 1])
+        project_name = col_p1.text_input("Nom du Projet", value=f"{zone_context['quartier']} - Lotissement X",
+                                         on_change=rerun_fragments, args=("projet", "export"))
+        site_photos = col_p2.file_uploader("Photos du terrain", accept_multiple_files=True, 
+                                          type=['jpg', 'jpeg', 'png'],
+                                          on_change=rerun_fragments, args=("projet", "export"))
+        photo_quality = col_p2.slider("Qualité JPEG des photos du rapport", 50, 95, JPEG_QUALITY, 5,
+                                      on_change=rerun_fragments, args=("projet", "export"))
+        if site_photos:
+            # Décodées une seule fois (en parallèle) ; les reruns et les changements de qualité resservent
+            # les vignettes du cache
+            processed = get_photo_pipeline().process_many([img.getvalue() for img in site_photos], photo_quality)
+            cols = st.columns(4)
+            for idx, photo in enumerate(processed):
+                cols[idx % 4].image(photo.thumbnail, use_container_width=True)
+    
+    st.session_state.project_info = dict(project_name=project_name, site_photos=site_photos,
+                                         photo_quality=photo_quality)
+
+@timed_fragment("carte")
+def map_section(zone_context):
+    """Carte de la zone et point capturé au clic -> st.session_state.gps_coords"""
+    from streamlit_folium import st_folium
+    
+    st.markdown(f"##### 📍 Localisation du site - {zone_context['quartier']}")
+    
+    # Utiliser les coordonnées de la zone sélectionnée
+    lat = zone_context['coordonnees']['latitude']
+    lon = zone_context['coordonnees']['longitude']
+    zoom = zone_context['coordonnees']['zoom']
+    
+    m = cached_stage("Carte", build_site_map, lat, lon, zoom, zone_context['quartier'],
+                     zone_context['description'])
+    
+    # Un clic ne réexécute que la carte et l'export (clé par zone : le point est oublié au changement de zone)
+    with profiled("st_folium"):
+        map_data = st_folium(m, key=f"site_map_{zone_context['quartier']}", width=700, height=300,
+                             returned_objects=["last_clicked"],
+                             on_change=functools.partial(rerun_fragments, "carte", "export"))
+    
+    selected_lat, selected_lon = lat, lon
+    if map_data and map_data["last_clicked"]:
+        selected_lat = map_data["last_clicked"]["lat"]
+        selected_lon = map_data["last_clicked"]["lng"]
+        st.success(f"Point capturé : {selected_lat:.5f}, {selected_lon:.5f}")
+    st.session_state.gps_coords = (selected_lat, selected_lon)
+
+@timed_fragment("poids")
+def weights_section(criteria):
+    """Anneau des poids des critères"""
+    st.markdown("##### 📊 Poids des Critères")
+    fig_donut = cached_stage("Poids (anneau)", build_weights_donut,
+                             tuple(np.asarray(st.session_state.ahp_result["weights"]).tolist()),
+                             tuple(crit['libelle'] for crit in criteria))
+    st.plotly_chart(fig_donut, use_container_width=True)
+
+@timed_fragment("evaluation")
+def evaluation_section(zone_context, criteria):
+    """Notes des options et verdict pondéré -> st.session_state.evaluation_result"""
+    # 1. ÉVALUATION TECHNIQUE
+    st.header("1️⃣ Évaluation Technique")
+    tabs = st.tabs(["🏢 CAMWATER", "🚰 FORAGE", "🔄 HYBRIDE"])
+    
+    # Notes (1-10) de chaque option sur chaque critère actif
+    performances = {}
+    for tab, (option, prefix, suffix, label) in zip(tabs, OPTIONS):
+        with tab:
+            cols = st.columns(len(criteria))
+            performances[label] = [
+                cols[j].slider(f"{crit['libelle']} ({suffix})", 1, 10,
+                               value=st.session_state.get(f"{prefix}_{crit['cle']}",
+                                                          get_default_performance(zone_context, option, crit)),
+                               key=f"{prefix}_{crit['cle']}",
+                               on_change=rerun_fragments, args=("evaluation", "radar", "export"))
+                for j, crit in enumerate(criteria)
+            ]
+
+    scw, sf, sh = score_options(st.session_state.ahp_result["weights"],
+                                [performances[label] for *_, label in OPTIONS]).tolist()
+    
+    # 2. VERDICT
+    st.header("2️⃣ Verdict de Performance")
+    r1, r2, r3 = st.columns(3)
+    r1.metric("CAMWATER", f"{scw:.2%}")
+    r2.metric("FORAGE", f"{sf:.2%}")
+    r3.metric("HYBRIDE", f"{sh:.2%}")
+    
+    # Petite explication
+    st.caption("⚠️ Note : Ces scores sont pondérés par les critères AHP. Voir ci-dessous pour l'analyse détaillée par critère.")
     
-    # ============================================
-    # EN-TÊTE PROFESSIONNELLE
-    # ============================================
-    pdf.set_fill_color(0, 51, 102)  # Bleu marine
-    pdf.rect(0, 0, 210, 45, "F")
-    pdf.set_y(15)
-    
-    # Logo/Titre principal
-    pdf.set_font("Helvetica", "B", 24)
-    pdf.set_text_color(255, 255, 255)
-    pdf.cell(0, 12, "HYDRO-DECISIO SIAD", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
-    
-    # Sous-titre
-    pdf.set_font("Helvetica", "I", 11)
-    pdf.cell(0, 8, "Système d'Aide à la Décision Hydraulique", 
-             new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
-    
-    # Date
-    pdf.set_font("Helvetica", "", 10)
-    pdf.cell(0, 8, f"Rapport généré le {date.today().strftime('%d/%m/%Y')}", 
-             new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
-    
-    pdf.set_y(55)
-    pdf.set_text_color(0, 0, 0)
-    
-    # ============================================
-    # SECTION 1 : CONTEXTE DE L'ÉTUDE
-    # ============================================
-    pdf.set_font("Helvetica", "B", 16)
-    pdf.set_draw_color(0, 102, 204)
-    pdf.set_line_width(0.5)
-    pdf.cell(0, 12, "1. CONTEXTE DE L'ÉTUDE", "B", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-    pdf.ln(2)
-    
-    # Informations du projet
-    pdf.set_font("Helvetica", "B", 12)
-    pdf.cell(40, 8, "Projet :", 0, 0)
-    pdf.set_font("Helvetica", "", 12)
-    pdf.cell(0, 8, project_name or "Non spécifié", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-    
-    # Informations de la zone si disponibles
-    if zone_context:
-        pdf.set_font("Helvetica", "B", 12)
-        pdf.cell(40, 8, "Quartier :", 0, 0)
-        pdf.set_font("Helvetica", "", 12)
-        pdf.cell(0, 8, zone_context.get('quartier', 'N/A'), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    st.session_state.evaluation_result = dict(performances=performances, scores=(scw, sf, sh))
+
+@timed_fragment("radar")
+def radar_section(criteria):
+    """Radar, tableau des scores, distance au prochain verdict et robustesse Monte Carlo"""
+    comparisons = st.session_state.ahp_result["comparisons"]
+    performances = st.session_state.evaluation_result["performances"]
+    scw, sf, sh = st.session_state.evaluation_result["scores"]
+    criteria_names = [crit['nom'] for crit in criteria]
+    
+    # 3. ANALYSE RADAR (VISUALISATION DES PERFORMANCES)
+    st.markdown("---")
+    st.markdown("<h3 style='color: #003366;'>📊 Analyse Radar des Performances</h3>", unsafe_allow_html=True)
+    
+    col_radar, col_table = st.columns([2, 1])
+    
+    with col_radar:
+        # Créer le graphique radar
+        with profiled("create_radar_chart"):
+            radar_fig = cached_stage("Radar", build_radar_chart, tuple(performances["CAMWATER"]),
+                                     tuple(performances["FORAGE"]), tuple(performances["HYBRIDE"]),
+                                     tuple(criteria_names))
+        st.plotly_chart(radar_fig, use_container_width=True)
+    
+    with col_table:
+        st.markdown("##### 📋 Scores détaillés (sur 10)")
         
-        pdf.set_font("Helvetica", "B", 12)
-        pdf.cell(40, 8, "Secteur :", 0, 0)
-        pdf.set_font("Helvetica", "", 12)
-        pdf.cell(0, 8, zone_context.get('secteur', 'N/A'), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        # Créer un DataFrame pour le tableau
+        with profiled("tableau pandas"):
+            import pandas as pd
         
-        pdf.set_font("Helvetica", "B", 12)
-        pdf.cell(40, 8, "Description :", 0, 0)
-        pdf.set_font("Helvetica", "", 10)
-        # Gestion du texte long avec multi_cell
-        pdf.multi_cell(0, 5, zone_context.get('description', 'Aucune description disponible'))
-        pdf.ln(3)
-    
-    # Coordonnées GPS avec lien Google Maps
-    if gps_coords:
-        lat, lon = gps_coords
-        pdf.set_font("Helvetica", "B", 12)
-        pdf.cell(45, 8, "Coordonnées GPS :", 0, 0)
-        pdf.set_font("Helvetica", "", 11)
-        pdf.cell(0, 8, f"{lat:.6f}°N, {lon:.6f}°E", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            data = {
+                'Critère': criteria_names + ['**Score total (pondéré)**'],
+                'CAMWATER': performances["CAMWATER"] + [f"{scw*100:.1f}%"],
+                'FORAGE': performances["FORAGE"] + [f"{sf*100:.1f}%"],
+                'HYBRIDE': performances["HYBRIDE"] + [f"{sh*100:.1f}%"]
+            }
         
-        # Lien Google Maps
-        google_maps_url = f"https://maps.google.com/?q={lat},{lon}"
-        pdf.set_font("Helvetica", "I", 10)
-        pdf.set_text_color(0, 102, 204)
-        pdf.cell(0, 8, f"Lien Google Maps : {google_maps_url}", 
-                 new_x=XPos.LMARGIN, new_y=YPos.NEXT, link=google_maps_url)
-        pdf.set_text_color(0, 0, 0)
-    
-    pdf.ln(5)
-    
-    # ============================================
-    # SECTION 2 : MÉTHODOLOGIE AHP
-    # ============================================
-    pdf.set_font("Helvetica", "B", 16)
-    pdf.cell(0, 12, "2. MÉTHODOLOGIE AHP", "B", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-    pdf.ln(3)
-    
-    # Pondération des critères
-    pdf.set_font("Helvetica", "B", 14)
-    pdf.cell(0, 10, "2.1 Pondération des Critères", 0, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-    
-    pdf.set_font("Helvetica", "", 11)
-    # Tableau des poids
-    pdf.set_fill_color(240, 248, 255)
-    pdf.cell(60, 10, "Critère", border=1, fill=True, align="C")
-    pdf.cell(40, 10, "Poids", border=1, fill=True, align="C")
-    pdf.cell(40, 10, "Valeur", border=1, fill=True, align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-    
-    criteria_names = ["Coût", "Disponibilité", "Accessibilité"]
-    for i, (name, weight) in enumerate(zip(criteria_names, weights)):
-        pdf.cell(60, 10, name, border=1)
-        pdf.cell(40, 10, f"{weight:.2%}", border=1, align="C")
-        pdf.cell(40, 10, f"{weight:.4f}", border=1, align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-    
-    # Indice de cohérence
-    pdf.ln(3)
-    pdf.set_font("Helvetica", "B", 11)
-    pdf.cell(0, 8, f"Indice de Cohérence (CR) : {cr:.4f}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-    if cr < 0.1:
-        pdf.set_text_color(0, 128, 0)
-        pdf.cell(0, 8, "[OK] L'analyse est coherente (CR < 0.1)", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-    else:
-        pdf.set_text_color(255, 0, 0)
-        pdf.cell(0, 8, "[ATTENTION] CR eleve, revoir les comparaisons", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            df = pd.DataFrame(data)
         
-    pdf.set_text_color(0, 0, 0)
-    pdf.ln(5)
-    
-    # ============================================
-    # SECTION 3 : ANALYSE COMPARATIVE
-    # ============================================
-    pdf.set_font("Helvetica", "B", 16)
-    pdf.cell(0, 12, "3. ANALYSE COMPARATIVE DES OPTIONS", "B", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-    pdf.ln(3)
-    
-    # Tableau comparatif
-    pdf.set_font("Helvetica", "B", 12)
-    pdf.set_fill_color(240, 248, 255)
-    pdf.cell(70, 10, "Option", border=1, fill=True, align="C")
-    pdf.cell(40, 10, "Score", border=1, fill=True, align="C")
-    pdf.cell(40, 10, "Performance", border=1, fill=True, align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-    
-    options = [
-        ("CAMWATER (Réseau)", score_cw),
-        ("FORAGE (Autonome)", score_f),
-        ("HYBRIDE (Mixte)", score_h)
-    ]
-    
-    for option_name, score in options:
-        pdf.set_font("Helvetica", "", 11)
-        pdf.cell(70, 10, f" {option_name}", border=1)
-        pdf.cell(40, 10, f"{score:.2%}", border=1, align="C")
-        pdf.cell(40, 10, f"{score*10:.1f}/10", border=1, align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-    
-    pdf.ln(5)
-    
-    # Graphique en barres textuel
-    pdf.set_font("Helvetica", "B", 12)
-    pdf.cell(0, 10, "Visualisation comparative :", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-    
-    max_score = max(score_cw, score_f, score_h)
-    for option_name, score in options:
-        bar_width = (score / max_score) * 100 if max_score > 0 else 0
-        pdf.set_font("Helvetica", "", 10)
-        pdf.cell(40, 8, f"{option_name[:15]} :", 0, 0)
-        pdf.set_fill_color(200, 220, 255)
-        pdf.cell(bar_width, 8, "", border=0, fill=True)
-        pdf.cell(5, 8, f" {score:.1%}", 0, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-    
-    pdf.ln(5)
-    
-    # ============================================
-    # SECTION 4 : SYNTHÈSE FINANCIÈRE
-    # ============================================
-    pdf.set_font("Helvetica", "B", 16)
-    pdf.cell(0, 12, "4. SYNTHÈSE FINANCIÈRE (10 ans)", "B", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-    pdf.ln(3)
-    
-    pdf.set_font("Helvetica", "B", 12)
-    pdf.cell(0, 10, "Coûts cumulés sur 10 ans :", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-    
-    pdf.set_font("Helvetica", "", 11)
-    # Tableau des coûts
-    pdf.set_fill_color(245, 245, 245)
-    pdf.cell(70, 10, "Option", border=1, fill=True, align="C")
-    pdf.cell(40, 10, "CAPEX", border=1, fill=True, align="C")
-    pdf.cell(40, 10, "Total 10 ans", border=1, fill=True, align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-    
-    # Récupération des données financières
-    total_cw = fin_data.get('total_cw', 0)
-    total_f = fin_data.get('total_f', 0)
-    total_h = fin_data.get('total_h', 0)
-    
-    # Trouver la meilleure option financière
-    costs = {"CAMWATER": total_cw, "FORAGE": total_f, "HYBRIDE": total_h}
-    best_financial = min(costs, key=costs.get)
-    
-    for option in ["CAMWATER", "FORAGE", "HYBRIDE"]:
-        total = costs[option]
-        # Estimation du CAPEX (première année)
-        capex = total * 0.4 if option == "FORAGE" else total * 0.6
+            # Afficher le tableau stylisé
+            st.dataframe(
+                df,
+                column_config={
+                    "Critère": st.column_config.TextColumn("Critère", width="medium"),
+                    "CAMWATER": st.column_config.NumberColumn(
+                        "CAMWATER",
+                        help="Score CAMWATER (1-10)",
+                        format="%d",
+                    ),
+                    "FORAGE": st.column_config.NumberColumn(
+                        "FORAGE",
+                        help="Score FORAGE (1-10)",
+                        format="%d",
+                    ),
+                    "HYBRIDE": st.column_config.NumberColumn(
+                        "HYBRIDE",
+                        help="Score HYBRIDE (1-10)",
+                        format="%d",
+                    ),
+                },
+                hide_index=True,
+                use_container_width=True
+            )
         
-        pdf.set_font("Helvetica", "", 10)
-        pdf.cell(70, 10, f" {option}", border=1)
-        pdf.cell(40, 10, f"{int(capex):,} FCFA".replace(',', ' '), border=1, align="C")
+        # Indicateur de performance - LOGIQUE CORRIGÉE
+        st.markdown("##### 🎯 Synthèse par critère")
         
-        if option == best_financial:
-            pdf.set_text_color(0, 128, 0)
-            pdf.set_font("Helvetica", "B", 10)
-        else:
-            pdf.set_text_color(0, 0, 0)
+        # CORRECTION : Pour le coût, MAX = meilleur (car note haute = coût faible)
+        # Pour les autres critères, MAX = meilleur
+        # Détecter les égalités
+        synthese = []
+        for j, name in enumerate(criteria_names):
+            best = max(performances[label][j] for _, _, _, label in OPTIONS)
+            best_options = [label for _, _, _, label in OPTIONS if performances[label][j] == best]
+            synthese.append(f"- **{name}** : {', '.join(best_options) if best_options else 'Aucun'}")
         
-        pdf.cell(40, 10, f"{int(total):,} FCFA".replace(',', ' '), border=1, align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-    
-    pdf.set_text_color(0, 0, 0)
-    pdf.ln(3)
-    pdf.set_font("Helvetica", "I", 10)
-    pdf.cell(0, 8, f"* Option la plus économique : {best_financial}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-    
-    # ============================================
-    # SECTION 5 : RECOMMANDATION FINALE
-    # ============================================
-    pdf.add_page()
-    pdf.set_font("Helvetica", "B", 16)
-    pdf.cell(0, 12, "5. RECOMMANDATION FINALE", "B", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-    pdf.ln(10)
-    
-    # Encadré de recommandation
-    if recommendation == "CAMWATER":
-        fill_color = (0, 102, 204)  # Bleu
-        border_color = (0, 51, 102)
-    elif recommendation == "FORAGE":
-        fill_color = (0, 153, 0)    # Vert
-        border_color = (0, 102, 0)
-    else:  # Hybride
-        fill_color = (255, 153, 0)  # Orange
-        border_color = (204, 102, 0)
-    
-    pdf.set_fill_color(*fill_color)
-    pdf.set_draw_color(*border_color)
-    pdf.set_line_width(1)
-    pdf.rect(15, pdf.get_y(), 180, 25, "F")
-    
-    pdf.set_y(pdf.get_y() + 5)
-    pdf.set_font("Helvetica", "B", 20)
-    pdf.set_text_color(255, 255, 255)
-    pdf.cell(0, 10, "DÉCISION PRÉCONISÉE", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
-    
-    pdf.set_font("Helvetica", "B", 28)
-    pdf.cell(0, 15, recommendation, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
-    
-    pdf.set_y(pdf.get_y() + 10)
-    pdf.set_text_color(0, 0, 0)
-    
-    # Justification
-    pdf.set_font("Helvetica", "B", 14)
-    pdf.cell(0, 10, "Justification :", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-    pdf.set_font("Helvetica", "", 11)
-    
-    justification_text = ""
-    if recommendation == "CAMWATER":
-        justification_text = "Cette option offre le meilleur compromis coût/performance pour les zones proches du réseau existant avec une demande modérée."
-    elif recommendation == "FORAGE":
-        justification_text = "Recommandé pour assurer une autonomie complète et une disponibilité permanente, malgré l'investissement initial plus élevé."
-    else:  # Hybride
-        justification_text = "Solution optimale combinant la fiabilité du forage avec la flexibilité du réseau, idéale pour les besoins élevés et variables."
-    
-    pdf.multi_cell(0, 6, justification_text)
-    
-    # Synthèse
-    pdf.ln(5)
-    pdf.set_font("Helvetica", "B", 12)
-    pdf.cell(0, 10, "Synthèse des avantages :", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-    
-    pdf.set_font("Helvetica", "", 10)
-    advantages = {
-        "CAMWATER": ["- Coût initial réduit", "- Maintenance externalisée", "- Pas de gestion d'infrastructure"],
-        "FORAGE": ["- Indépendance totale", "- Disponibilité 24h/24", "- Coût à long terme maîtrisé"],
-        "HYBRIDE": ["- Redondance et sécurité", "- Flexibilité d'approvisionnement", "- Optimisation des coûts"]
-    }
-    
-    for advantage in advantages.get(recommendation, []):
-        pdf.cell(10, 6, "")
-        pdf.cell(0, 6, advantage, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-    
-    # ============================================
-    # SECTION 6 : DOCUMENTATION PHOTOGRAPHIQUE
-    # ============================================
-    if uploaded_images:
-        for i, img in enumerate(uploaded_images):
-            pdf.add_page()
-            pdf.set_font("Helvetica", "B", 14)
-            pdf.set_draw_color(200, 200, 200)
-            pdf.cell(0, 10, f"Documentation - Vue {i+1}/{len(uploaded_images)}", "B", 
-                     new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-            pdf.ln(5)
+        # Afficher avec formatage
+        st.markdown("\n".join(synthese))
+        
+        # Explication des résultats
+        st.markdown("##### ℹ️ Comment interpréter")
+        st.markdown("""
+        - **Score total** = moyenne pondérée par l'AHP
+        - **Scores bruts** = évaluation directe (1-10)
+        - Le radar montre les performances brutes
+        - Le verdict final intègre les préférences (poids)
+        """)
+
+    # CARTE DES INVERSIONS DE VERDICT
+    with st.expander("🧭 Distance au prochain verdict"):
+        try:
+            rank_map = get_rank_reversal_map(tuple(tuple(performances[label]) for *_, label in OPTIONS))
+        except ValueError:
+            st.info("Trop de combinaisons de jugements à énumérer pour ce nombre de critères.")
+        else:
+            consistent_only = st.checkbox("Uniquement les jugements cohérents (CR < 0.1)", value=True,
+                                          key="reversal_consistent", on_change=rerun_fragments, args=("radar",))
+            nearest = nearest_reversals(rank_map, comparisons, consistent_only=consistent_only)
+            if st.session_state.ahp_result["group"]:
+                st.caption("Poids du groupe : jugements agrégés (AIJ) ramenés au cran de curseur le plus proche.")
+            pair_labels = [f"{a['libelle']} vs {b['libelle']}"
+                           for i, a in enumerate(criteria) for b in criteria[i + 1:]]
             
-            try:
-                pdf.image(img, x=20, w=170)
-                pdf.set_font("Helvetica", "I", 9)
-                pdf.cell(0, 10, f"Photo {i+1} - Site de {project_name}", 
-                         new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
-            except:
-                pdf.set_text_color(255, 0, 0)
-                pdf.cell(0, 10, f"Impossible de charger l'image {i+1}", 
-                         new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
-                pdf.set_text_color(0, 0, 0)
-    
-    # ============================================
-    # PIED DE PAGE
-    # ============================================
-    pdf.set_y(-20)
-    pdf.set_font("Helvetica", "I", 8)
-    pdf.set_text_color(100, 100, 100)
-    pdf.cell(0, 10, "Document généré par HYDRO-DECISIO SIAD - Système d'Aide à la Décision Hydraulique", 
-             new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
-    pdf.cell(0, 5, "Confidentialité : Ce rapport est destiné à l'usage exclusif du client", 
-             new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
-    
-    return bytes(pdf.output())
+            share_cols = st.columns(len(nearest["win_share"]))
+            for col, (name, share) in zip(share_cols, nearest["win_share"].items()):
+                col.metric(f"{name} gagne", f"{share:.0%} des combinaisons")
+            
+            if nearest["reversals"]:
+                closest = nearest["reversals"][0]
+                st.markdown(f"Verdict actuel : **{nearest['winner']}** — le verdict bascule vers "
+                            f"**{closest['winner']}** en {closest['distance']} cran(s) de curseur.")
+                st.dataframe(
+                    [{"Crans": r["distance"], "Nouveau verdict": r["winner"], "CR": round(r["cr"], 3),
+                      **{label: f"{v:.2g}" for label, v in zip(pair_labels, r["comparisons"])}}
+                     for r in nearest["reversals"]],
+                    hide_index=True, use_container_width=True
+                )
+            else:
+                st.success(f"**{nearest['winner']}** reste en tête pour toutes les combinaisons de jugements.")
 
-# Modifie la fonction reset_inputs pour utiliser les valeurs de la zone :
-def reset_inputs():
-    zone_context = st.session_state.get('zone_context', get_zone_context())
+    # ANALYSE DE SENSIBILITÉ (MONTE CARLO)
+    with st.expander("🎲 Robustesse du verdict (Monte Carlo)"):
+        # Calcul uniquement à la demande, puis servi depuis le cache à chaque rerun
+        on_change = dict(on_change=rerun_fragments, args=("radar",))
+        if st.toggle("Activer l'analyse de sensibilité", key="mc_enabled", **on_change):
+            col_mc1, col_mc2, col_mc3 = st.columns(3)
+            n_samples = col_mc1.select_slider("Tirages", options=[1000, 10000, 100000], value=10000, **on_change)
+            judgment_spread = col_mc2.slider("Incertitude des jugements", 0.0, 1.0, 0.25, 0.05, **on_change)
+            score_spread = col_mc3.slider("Incertitude des notes (points)", 0.0, 3.0, 1.0, 0.25, **on_change)
+            
+            mc = run_sensitivity(tuple(comparisons), tuple(tuple(performances[label]) for *_, label in OPTIONS),
+                                 n_samples, judgment_spread, score_spread)
+            
+            mc_cols = st.columns(len(mc["options"]))
+            for col, name in zip(mc_cols, mc["options"]):
+                col.metric(f"P(victoire) {name}", f"{mc['win_probability'][name]:.1%}")
+            st.caption(f"Probabilité d'inversion du verdict ({mc['base_winner']}) : "
+                       f"{mc['rank_reversal_probability']:.1%} — tirages cohérents (CR < 0.1) : "
+                       f"{mc['consistent_ratio']:.1%}")
+            
+            fig_mc = go.Figure()
+            for i, name in enumerate(mc["options"]):
+                fig_mc.add_trace(go.Box(y=mc["scores"][:, i], name=name, boxpoints=False))
+            fig_mc.update_layout(template="plotly_white", yaxis_title="Score pondéré", yaxis_tickformat=".0%",
+                                 height=350, showlegend=False)
+            st.plotly_chart(fig_mc, use_container_width=True)
+
+@timed_fragment("finance")
+def finance_section():
+    """Projection financière et coûts sous incertitude -> st.session_state.finance_result"""
+    # Un paramètre financier ne réexécute que la finance et l'export
+    on_change = dict(on_change=rerun_fragments, args=("finance", "export"))
     
-    st.session_state["c_vs_d"] = 1
-    st.session_state["c_vs_a"] = 1
-    st.session_state["d_vs_a"] = 1
+    # 3. FINANCE
+    st.markdown("---")
+    horizon = st.session_state.get("fin_horizon", HORIZON_YEARS)
+    st.markdown(f"<h2 style='color: #1b5e20;'>📈 Rentabilité sur {horizon} ans</h2>", unsafe_allow_html=True)
     
-    # Utiliser les valeurs par défaut de la zone
-    st.session_state["cw_c"] = zone_context["performances_par_defaut"]["camwater"]["cout"]
-    st.session_state["cw_d"] = zone_context["performances_par_defaut"]["camwater"]["disponibilite"]
-    st.session_state["cw_a"] = zone_context["performances_par_defaut"]["camwater"]["accessibilite"]
+    with st.expander("💰 Paramètres Financiers"):
+        col_f1, col_f2 = st.columns(2)
+        capex_cw = col_f1.number_input("CAPEX Camwater", value=DEFAULT_FINANCE["capex_cw"], **on_change)
+        opex_cw = col_f1.number_input("Facture réseau/mois", value=DEFAULT_FINANCE["opex_cw"], **on_change)
+        capex_f = col_f2.number_input("CAPEX Forage", value=DEFAULT_FINANCE["capex_f"], **on_change)
+        opex_f = col_f2.number_input("Maintenance forage/mois", value=DEFAULT_FINANCE["opex_f"], **on_change)
+        
+        col_f3, col_f4, col_f5 = st.columns(3)
+        horizon = col_f3.slider("Horizon (années)", 5, 40, HORIZON_YEARS, key="fin_horizon", **on_change)
+        discount_rate = col_f3.number_input("Taux d'actualisation (%/an)", 0.0, 30.0, 0.0, 0.5, **on_change) / 100
+        inflation = col_f4.number_input("Inflation (%/an)", 0.0, 30.0, 0.0, 0.5, **on_change) / 100
+        tariff_escalation = col_f4.number_input("Hausse tarifs CAMWATER (%/an)", 0.0, 30.0, 0.0, 0.5,
+                                                **on_change) / 100
+        pump_cost = col_f5.number_input("Remplacement pompe (FCFA)", 0, value=0, step=50000, **on_change)
+        pump_cycle = col_f5.number_input("Cycle de remplacement (années)", 0, 30, 0, **on_change)
+        network_share = st.slider("Part du réseau dans l'OPEX hybride", 0.0, 1.0, HYBRID_NETWORK_SHARE, 0.05,
+                                  **on_change)
+        
+    # Projection mensuelle des 3 options, la même qu'en lot (engine.cli) et dans les rapports
+    # (logique hybride : somme des installs, OPEX partagé)
+    with profiled("project_options"):
+        capex, opex, projection = option_projection(capex_cw, opex_cw, capex_f, opex_f, network_share,
+                                                    discount_rate, inflation, tariff_escalation, pump_cost,
+                                                    pump_cycle)
+        finance = project_options([label for *_, label in OPTIONS], capex, opex, years=horizon, **projection)
+    st.session_state.finance_result = finance
+    fig_fin = cached_stage("Coûts cumulés", build_cost_curves, finance.years, finance.cumulative)
+    st.plotly_chart(fig_fin, use_container_width=True)
     
-    st.session_state["f_c"] = zone_context["performances_par_defaut"]["forage"]["cout"]
-    st.session_state["f_d"] = zone_context["performances_par_defaut"]["forage"]["disponibilite"]
-    st.session_state["f_a"] = zone_context["performances_par_defaut"]["forage"]["accessibilite"]
+    fin_cols = st.columns(3)
+    for j, (col, (*_, label)) in enumerate(zip(fin_cols, OPTIONS)):
+        col.metric(f"VAN des coûts {label}", f"{finance.npv[j]:,.0f} FCFA".replace(",", " "))
+        if j > 0:
+            irr, payback = finance.irr[j], finance.payback_year[j]
+            col.caption(f"TRI vs CAMWATER : {'—' if np.isnan(irr) else f'{irr:.1%}'} · "
+                        f"Retour sur investissement : {'au-delà de l’horizon' if np.isnan(payback) else f'{payback:.1f} ans'}")
+    
+    # SIMULATION DES RISQUES (PANNES, ÉLECTRICITÉ, COUPURES, FORAGE)
+    with st.expander("🎲 Coûts sous incertitude (P10 / P50 / P90)"):
+        # Les risques n'entrent pas dans le rapport : rerun de la seule section finance
+        on_change = dict(on_change=rerun_fragments, args=("finance",))
+        if st.toggle("Activer la simulation des risques", key="risk_sim_enabled", **on_change):
+            col_r1, col_r2, col_r3 = st.columns(3)
+            n_paths = col_r1.select_slider("Trajectoires", options=[1000, 10000, 50000], value=10000, **on_change)
+            risks = {
+                "pump_failures_per_year": col_r1.slider("Pannes de pompe par an", 0.0, 3.0, 0.5, 0.1, **on_change),
+                "pump_repair_cost": col_r2.number_input("Coût d'une réparation (FCFA)", 0, value=120000, step=10000,
+                                                        **on_change),
+                "outage_days_per_month": col_r2.slider("Jours de coupure réseau par mois", 0.0, 15.0, 3.0, 0.5,
+                                                       **on_change),
+                "water_purchase_per_day": col_r3.number_input("Eau achetée par jour de coupure (FCFA)", 0,
+                                                              value=1500, step=100, **on_change),
+                "drilling_overrun": col_r3.slider("Dépassement moyen du forage", 0.0, 1.0, 0.15, 0.05, **on_change),
+            }
+            sim = run_cash_flow_simulation((capex_cw, capex_f), (opex_cw, opex_f), horizon * 12, n_paths,
+                                           network_share, tuple(sorted(risks.items())))
+            
+            fig_sim = go.Figure()
+            years_axis = sim["months"] / 12
+            for (*_, label), color, curves in zip(OPTIONS, ("0,51,153", "34,139,34", "255,165,0"), sim["curves"]):
+                p10, p50, p90 = curves
+                fig_sim.add_trace(go.Scatter(x=years_axis, y=p90, line=dict(width=0), showlegend=False,
+                                             hoverinfo="skip"))
+                fig_sim.add_trace(go.Scatter(x=years_axis, y=p10, fill="tonexty", line=dict(width=0),
+                                             fillcolor=f"rgba({color},0.2)", name=f"{label} P10-P90"))
+                fig_sim.add_trace(go.Scatter(x=years_axis, y=p50, line=dict(color=f"rgb({color})", width=3),
+                                             name=f"{label} P50"))
+            fig_sim.update_layout(template="plotly_white", xaxis_title="Années", yaxis_title="CFA")
+            st.plotly_chart(fig_sim, use_container_width=True)
+            
+            sim_cols = st.columns(3)
+            for col, (*_, label), p in zip(sim_cols, OPTIONS, sim["cheapest_probability"]):
+                col.metric(f"P(moins chère) {label}", f"{p:.1%}")
+
+@timed_fragment("export")
+def export_section(zone_context, criteria):
+    """Rapport PDF, assemblé depuis les résultats des autres sections"""
+    ahp = st.session_state.ahp_result
+    evaluation = st.session_state.evaluation_result
+    project = st.session_state.project_info
+    finance = st.session_state.finance_result
+    criteria_names = [crit['nom'] for crit in criteria]
     
-    st.session_state["h_c"] = zone_context["performances_par_defaut"]["hybride"]["cout"]
-    st.session_state["h_d"] = zone_context["performances_par_defaut"]["hybride"]["disponibilite"]
-    st.session_state["h_a"] = zone_context["performances_par_defaut"]["hybride"]["accessibilite"]
+    # EXPORT PDF
+    st.divider()
+    scw, sf, sh = evaluation["scores"]
+    best_option = recommend([scw, sf, sh])
+    
+    # Graphiques du rapport rendus en arrière-plan dès maintenant : le rerun ne les attend pas
+    report_charts = get_chart_renderer().submit_many(report_chart_specs(
+        [evaluation["performances"][label] for *_, label in OPTIONS], criteria_names, ahp["weights"], finance))
+    
+    report_inputs = dict(
+        score_cw=scw, 
+        score_f=sf, 
+        score_h=sh,
+        weights=ahp["weights"], 
+        cr=ahp["cr"], 
+        recommendation=best_option, 
+        finance=finance,
+        zone_context=zone_context,
+        project_name=project["project_name"],
+        uploaded_images=project["site_photos"],
+        gps_coords=st.session_state.gps_coords,
+        criteria_names=criteria_names,
+        repair_suggestions=ahp["repair_suggestions"],
+        photo_pipeline=get_photo_pipeline(),
+        photo_quality=project["photo_quality"],
+        charts=report_charts
+    )
+    fingerprint = report_fingerprint(report_inputs)
+    
+    # Profil propre au téléchargement : le PDF est construit hors de tout rerun
+    instrumentation = get_instrumentation() if st.session_state.get("instrumented") else None
+    session_tag = st.session_state.session_tag
+    
+    def build_report():
+        if instrumentation is None:
+            return render_report(fingerprint, report_inputs)
+        profile = RerunProfile(session_tag, scope=("téléchargement",))
+        with profile.stage("generate_pdf"):
+            pdf = render_report(fingerprint, report_inputs)
+        instrumentation.record(profile)
+        return pdf
+    
+    # Le PDF n'est construit qu'au clic (sans rerun), puis resservi tant que les entrées ne changent pas
+    st.download_button(
+        label="📥 Télécharger le Rapport PDF Complet", 
+        data=build_report,
+        file_name=f"Rapport_HYDRO_{project['project_name']}_{date.today().strftime('%Y%m%d')}.pdf",
+        on_click="ignore",
+        use_container_width=True,
+        type="primary"
+    )
+
+@st.fragment(key="mesures")
+def timings_section(warm_up):
+    """Durée du dernier rerun (complet ou partiel), par fragment, et temps gagné par le cache des figures"""
+    scope = st.session_state.rerun_scope
+    fragments = st.session_state.fragment_timings
+    if scope is None:
+        run_label, run_seconds = "rerun complet", time.perf_counter() - st.session_state.run_started_at
+    else:
+        run_label = f"rerun partiel ({', '.join(scope)})"
+        run_seconds = sum(fragments[key]["seconds"] for key in scope if key in fragments)
+    
+    # Temps gagné à ce rerun par le cache des figures et de la carte
+    timings = st.session_state.cache_timings
+    saved = {stage: max(built - elapsed, 0.0) for stage, (built, elapsed) in timings.items()}
+    with st.expander(f"⏱️ {run_label.capitalize()} en {run_seconds * 1000:.0f} ms — cache des figures : "
+                     f"{sum(saved.values()) * 1000:.1f} ms gagnés"):
+        if "time_to_interactive" in st.session_state:
+            tti, cold = st.session_state.time_to_interactive
+            st.caption(f"Tableau de bord prêt en {tti * 1000:.0f} ms après le clic "
+                       f"({'préchauffage attendu' if cold else 'préchauffage déjà terminé'}) ; "
+                       f"préchauffage du processus : {warm_up.seconds * 1000:.0f} ms "
+                       f"({', '.join(f'{name} {t * 1000:.0f} ms' for name, t in warm_up.timings.items())})")
+        st.table({
+            "Fragment": list(fragments),
+            "Dernière exécution (ms)": [f"{record['seconds'] * 1000:.1f}" for record in fragments.values()],
+            "Type": ["partielle" if record["partial"] else "complète" for record in fragments.values()],
+            "Reruns partiels": [record["partial_runs"] for record in fragments.values()],
+        })
+        st.table({
+            "Étape": list(timings),
+            "Construction (ms)": [f"{built * 1000:.1f}" for built, _ in timings.values()],
+            "Ce rerun (ms)": [f"{elapsed * 1000:.2f}" for _, elapsed in timings.values()],
+            "Gagné (ms)": [f"{saved[stage] * 1000:.1f}" for stage in timings],
+        })
+    finish_profile()
+
+@st.fragment(key="instrumentation")
+def instrumentation_section():
+    """Panneau de débogage : étapes du dernier rerun et percentiles de toutes les sessions"""
+    instrumentation = get_instrumentation()
+    with st.expander("🛠️ Instrumentation", expanded=True):
+        last = st.session_state.get("last_profile")
+        if last is not None:
+            scope = "rerun complet" if last["scope"] == "complet" else f"rerun partiel ({', '.join(last['scope'])})"
+            st.caption(f"Dernier rerun : {scope}, {last['ms']:.1f} ms")
+            st.dataframe(
+                [{"Étape": "· " * stage["depth"] + stage["stage"], "ms": round(stage["ms"], 2),
+                  "Δ mémoire (Kio)": None if stage["memory_kib"] is None else round(stage["memory_kib"])}
+                 for stage in last["stages"]],
+                hide_index=True, use_container_width=True
+            )
+        
+        stats = instrumentation.percentiles()
+        st.caption(f"Percentiles glissants ({instrumentation.window} dernières mesures par étape, "
+                   "toutes sessions du processus)")
+        st.dataframe(
+            [{"Étape": name, "n": stat["n"], "p50 (ms)": round(stat["p50"], 2), "p90 (ms)": round(stat["p90"], 2),
+              "p99 (ms)": round(stat["p99"], 2)}
+             for name, stat in sorted(stats.items(), key=lambda item: -item[1]["p90"])],
+            hide_index=True, use_container_width=True
+        )
+        st.download_button("⬇️ Exporter les mesures (JSON)",
+                           data=lambda: json.dumps(instrumentation.export(), ensure_ascii=False, indent=2),
+                           file_name=f"instrumentation_{date.today().strftime('%Y%m%d')}.json",
+                           mime="application/json", on_click="ignore", use_container_width=True)
+
 # ==========================================
 # LOGIQUE DE NAVIGATION
 # ==========================================
@@ -659,12 +1051,10 @@ if st.session_state.page == "home":
             use_container_width=True,
             help="Lancez l'analyse multicritère AHP et l'évaluation financière"
         ):
-            # Afficher l'écran de chargement
-            with st.spinner("Préparation de l'analyse..."):
-                show_loading_screen()
-                st.session_state.page = "dashboard"
-                # Donner le temps à l'écran de chargement de s'afficher
-                st.rerun()
+            # Temps jusqu'au tableau de bord utilisable, mesuré à la fin de son premier rendu
+            st.session_state.dashboard_requested_at = time.perf_counter()
+            st.session_state.page = "dashboard"
+            st.rerun()
     
     st.markdown("""
             <div style="position: absolute; top: 50%; right: -60px; transform: translateY(-50%); 
@@ -773,8 +1163,33 @@ if st.session_state.page == "home":
     </div>
     """, unsafe_allow_html=True)
 
+    # Préchauffage lancé une fois l'accueil affiché (imports lourds compris) :
+    # en général terminé avant l'entrée dans le tableau de bord
+    get_warm_up()
+
 else:
     # --- DASHBOARD PAGE ---
+    # Écran de chargement tant que le préchauffage du processus n'est pas terminé
+    warm_up = get_warm_up()
+    warm_up_pending = not warm_up.ready
+    if warm_up_pending:
+        loading = st.empty()
+        with loading.container():
+            show_loading_screen()
+        warm_up.wait()
+        loading.empty()
+    
+    # Rerun complet : les fragments chronométrés ensuite le sont comme tel
+    st.session_state.run_started_at = time.perf_counter()
+    st.session_state.app_runs = st.session_state.get("app_runs", 0) + 1
+    st.session_state.rerun_scope = None
+    st.session_state.cache_timings = {}
+    st.session_state.setdefault("fragment_timings", {})
+    st.session_state.setdefault("session_tag", uuid.uuid4().hex[:8])
+    st.session_state.debug_panel = st.query_params.get("debug") == "1"
+    st.session_state.instrumented = st.session_state.debug_panel or INSTRUMENTATION_ENV not in ("", "0")
+    begin_profile()
+    
     with st.sidebar:
         st.markdown("## ⚙️ Configuration")
         
@@ -799,290 +1214,39 @@ else:
         **Description :** {zone_context['description'][:100]}...
         """)
 
-        c_vs_d = st.select_slider("Coût vs Dispo", options=[1/9, 1/5, 1, 5, 9], value=1, key="c_vs_d")
-        c_vs_a = st.select_slider("Coût vs Accès", options=[1/9, 1/5, 1, 5, 9], value=1, key="c_vs_a")
-        d_vs_a = st.select_slider("Dispo vs Accès", options=[1/9, 1/5, 1, 5, 9], value=1, key="d_vs_a")
-        st.button("🔄 Réinitialiser", on_click=reset_inputs)
+        # Critères additionnels (qualité, énergie, maintenance, réglementation)
+        extra_criteria = st.multiselect("➕ Critères additionnels", options=list(CRITERES_ADDITIONNELS),
+                                        key="extra_criteria")
+        criteria = get_zone_criteria(zone_context, extra_criteria)
+        
+        # La zone et les critères changent toute la page (rerun complet) ; les jugements
+        # ne réexécutent que les sections qui dépendent des poids
+        ahp_sidebar(criteria)
         st.divider()
         st.info(f"📍 **Zone d'étude :** {zone_context['quartier']}, {zone_context['secteur']}")
+        # Panneau d'instrumentation, rempli en fin de rerun
+        debug_slot = st.empty()
 
-    # Moteur AHP
-    matrix = np.array([[1, c_vs_d, c_vs_a], [1/c_vs_d, 1, d_vs_a], [1/c_vs_a, 1/d_vs_a, 1]])
-    engine = AHPEngine()
-    weights, cr = engine.compute_weights(matrix)
-
-    zone_context = st.session_state.get('zone_context', get_zone_context())
     st.title(f"Tableau de Bord Expert 💧 - {zone_context['quartier']}")
 
-    with st.expander("📸 Informations Projet & Photos"):
-        col_p1, col_p2 = st.columns([2, 1])
-        project_name = col_p1.text_input("Nom du Projet", value=f"{zone_context['quartier']} - Lotissement X")
-        site_photos = col_p2.file_uploader("Photos du terrain", accept_multiple_files=True, 
-                                          type=['jpg', 'jpeg', 'png'])
-        if site_photos:
-            cols = st.columns(4)
-            for idx, img in enumerate(site_photos):
-                cols[idx % 4].image(img, use_container_width=True)
+    project_section(zone_context)
 
     c_m, c_d = st.columns([2, 1])
-    
     with c_m:
-        st.markdown(f"##### 📍 Localisation du site - {zone_context['quartier']}")
-        
-        # Utiliser les coordonnées de la zone sélectionnée
-        lat = zone_context['coordonnees']['latitude']
-        lon = zone_context['coordonnees']['longitude']
-        zoom = zone_context['coordonnees']['zoom']
-        
-        m = folium.Map(location=[lat, lon], zoom_start=zoom)
-        m.add_child(folium.LatLngPopup())
-        
-        # Ajouter un marqueur pour la zone
-        folium.Marker(
-            [lat, lon],
-            popup=f"<b>{zone_context['quartier']}</b><br>{zone_context['description'][:50]}...",
-            tooltip=zone_context['quartier'],
-            icon=folium.Icon(color='blue', icon='tint', prefix='fa')
-        ).add_to(m)
-        
-        map_data = st_folium(m, width=700, height=300, returned_objects=["last_clicked"])
-        
-        selected_lat, selected_lon = lat, lon
-        if map_data and map_data["last_clicked"]:
-            selected_lat = map_data["last_clicked"]["lat"]
-            selected_lon = map_data["last_clicked"]["lng"]
-            st.success(f"Point capturé : {selected_lat:.5f}, {selected_lon:.5f}")
-
+        map_section(zone_context)
     with c_d:
-        st.markdown("##### 📊 Poids des Critères")
-        fig_donut = px.pie(values=weights, names=['Coût', 'Dispo', 'Accès'], hole=0.5)
-        st.plotly_chart(fig_donut, use_container_width=True)
-
-    # 1. ÉVALUATION TECHNIQUE
-    st.header("1️⃣ Évaluation Technique")
-    t1, t2, t3 = st.tabs(["🏢 CAMWATER", "🚰 FORAGE", "🔄 HYBRIDE"])
-    
-    with t1:
-        cw1, cw2, cw3 = st.columns(3)
-        vc_cw = cw1.slider("Coût (CW)", 1, 10, 
-                          value=st.session_state.get("cw_c", zone_context["performances_par_defaut"]["camwater"]["cout"]), 
-                          key="cw_c")
-        vd_cw = cw2.slider("Dispo (CW)", 1, 10, 
-                          value=st.session_state.get("cw_d", zone_context["performances_par_defaut"]["camwater"]["disponibilite"]), 
-                          key="cw_d")
-        va_cw = cw3.slider("Accès (CW)", 1, 10, 
-                          value=st.session_state.get("cw_a", zone_context["performances_par_defaut"]["camwater"]["accessibilite"]), 
-                          key="cw_a")
-    
-    with t2:
-        f1, f2, f3 = st.columns(3)
-        vc_f = f1.slider("Coût (F)", 1, 10, 
-                        value=st.session_state.get("f_c", zone_context["performances_par_defaut"]["forage"]["cout"]), 
-                        key="f_c")
-        vd_f = f2.slider("Dispo (F)", 1, 10, 
-                        value=st.session_state.get("f_d", zone_context["performances_par_defaut"]["forage"]["disponibilite"]), 
-                        key="f_d")
-        va_f = f3.slider("Accès (F)", 1, 10, 
-                        value=st.session_state.get("f_a", zone_context["performances_par_defaut"]["forage"]["accessibilite"]), 
-                        key="f_a")
-    
-    with t3:
-        h1, h2, h3 = st.columns(3)
-        vc_h = h1.slider("Coût (H)", 1, 10, 
-                        value=st.session_state.get("h_c", zone_context["performances_par_defaut"]["hybride"]["cout"]), 
-                        key="h_c")
-        vd_h = h2.slider("Dispo (H)", 1, 10, 
-                        value=st.session_state.get("h_d", zone_context["performances_par_defaut"]["hybride"]["disponibilite"]), 
-                        key="h_d")
-        va_h = h3.slider("Accès (H)", 1, 10, 
-                        value=st.session_state.get("h_a", zone_context["performances_par_defaut"]["hybride"]["accessibilite"]), 
-                        key="h_a")
-
-    scw = (weights[0]*vc_cw + weights[1]*vd_cw + weights[2]*va_cw) / 10
-    sf = (weights[0]*vc_f + weights[1]*vd_f + weights[2]*va_f) / 10
-    sh = (weights[0]*vc_h + weights[1]*vd_h + weights[2]*va_h) / 10
-    
-    # 2. VERDICT
-    st.header("2️⃣ Verdict de Performance")
-    r1, r2, r3 = st.columns(3)
-    r1.metric("CAMWATER", f"{scw:.2%}")
-    r2.metric("FORAGE", f"{sf:.2%}")
-    r3.metric("HYBRIDE", f"{sh:.2%}")
-    
-     
-    
-    # Petite explication
-    st.caption("⚠️ Note : Ces scores sont pondérés par les critères AHP. Voir ci-dessous pour l'analyse détaillée par critère.")
-
-        # 3. ANALYSE RADAR (VISUALISATION DES PERFORMANCES)
-    st.markdown("---")
-    st.markdown("<h3 style='color: #003366;'>📊 Analyse Radar des Performances</h3>", unsafe_allow_html=True)
-    
-    col_radar, col_table = st.columns([2, 1])
-    
-    with col_radar:
-        # Préparer les données pour le radar
-        camwater_radar = [vc_cw, vd_cw, va_cw]
-        forage_radar = [vc_f, vd_f, va_f]
-        hybride_radar = [vc_h, vd_h, va_h]
-        
-        # Créer le graphique radar
-        radar_fig = create_radar_chart(camwater_radar, forage_radar, hybride_radar)
-        st.plotly_chart(radar_fig, use_container_width=True)
-    
-    with col_table:
-        st.markdown("##### 📋 Scores détaillés (sur 10)")
-        
-        # Créer un DataFrame pour le tableau
-        import pandas as pd
-        
-        data = {
-            'Critère': ['Coût', 'Disponibilité', 'Accessibilité', '**Score total (pondéré)**'],
-            'CAMWATER': [vc_cw, vd_cw, va_cw, f"{scw*100:.1f}%"],
-            'FORAGE': [vc_f, vd_f, va_f, f"{sf*100:.1f}%"],
-            'HYBRIDE': [vc_h, vd_h, va_h, f"{sh*100:.1f}%"]
-        }
-        
-        df = pd.DataFrame(data)
-        
-        # Afficher le tableau stylisé
-        st.dataframe(
-            df,
-            column_config={
-                "Critère": st.column_config.TextColumn("Critère", width="medium"),
-                "CAMWATER": st.column_config.NumberColumn(
-                    "CAMWATER",
-                    help="Score CAMWATER (1-10)",
-                    format="%d",
-                ),
-                "FORAGE": st.column_config.NumberColumn(
-                    "FORAGE",
-                    help="Score FORAGE (1-10)",
-                    format="%d",
-                ),
-                "HYBRIDE": st.column_config.NumberColumn(
-                    "HYBRIDE",
-                    help="Score HYBRIDE (1-10)",
-                    format="%d",
-                ),
-            },
-            hide_index=True,
-            use_container_width=True
-        )
-        
-        # Indicateur de performance - LOGIQUE CORRIGÉE
-        st.markdown("##### 🎯 Synthèse par critère")
-        
-        # CORRECTION : Pour le coût, MAX = meilleur (car note haute = coût faible)
-        # Pour disponibilité et accessibilité, MAX = meilleur
-        best_cost = max([vc_cw, vc_f, vc_h])
-        best_dispo = max([vd_cw, vd_f, vd_h])
-        best_access = max([va_cw, va_f, va_h])
-        
-        # Détecter les égalités
-        cost_options = []
-        dispo_options = []
-        access_options = []
-        
-        if vc_cw == best_cost:
-            cost_options.append("CAMWATER")
-        if vc_f == best_cost:
-            cost_options.append("FORAGE")
-        if vc_h == best_cost:
-            cost_options.append("HYBRIDE")
-            
-        if vd_cw == best_dispo:
-            dispo_options.append("CAMWATER")
-        if vd_f == best_dispo:
-            dispo_options.append("FORAGE")
-        if vd_h == best_dispo:
-            dispo_options.append("HYBRIDE")
-            
-        if va_cw == best_access:
-            access_options.append("CAMWATER")
-        if va_f == best_access:
-            access_options.append("FORAGE")
-        if va_h == best_access:
-            access_options.append("HYBRIDE")
-        
-        # Afficher avec formatage
-        st.markdown(f"""
-        - **Meilleur coût** : {', '.join(cost_options) if cost_options else 'Aucun'}
-        - **Meilleure disponibilité** : {', '.join(dispo_options) if dispo_options else 'Aucun'}
-        - **Meilleure accessibilité** : {', '.join(access_options) if access_options else 'Aucun'}
-        """)
-        
-        # Explication des résultats
-        st.markdown("##### ℹ️ Comment interpréter")
-        st.markdown("""
-        - **Score total** = moyenne pondérée par l'AHP
-        - **Scores bruts** = évaluation directe (1-10)
-        - Le radar montre les performances brutes
-        - Le verdict final intègre les préférences (poids)
-        """)
-
-
-
+        weights_section(criteria)
 
-
-
-
-
-
-    # 3. FINANCE
-    st.markdown("---")
-    st.markdown("<h2 style='color: #1b5e20;'>📈 Rentabilité sur 10 ans</h2>", unsafe_allow_html=True)
-    
-    with st.expander("💰 Paramètres Financiers"):
-        col_f1, col_f2 = st.columns(2)
-        capex_cw = col_f1.number_input("CAPEX Camwater", value=150000)
-        opex_cw = col_f1.number_input("Facture réseau/mois", value=15000)
-        capex_f = col_f2.number_input("CAPEX Forage", value=2500000)
-        opex_f = col_f2.number_input("Maintenance forage/mois", value=5000)
-        
-        # Logique hybride : Somme des installs, OPEX partagé
-        capex_h = capex_cw + capex_f
-        opex_h = (opex_cw * 0.4) + (opex_f * 0.6)
-
-    annees = np.arange(0, 11)
-    costs_cw = [capex_cw + (opex_cw * 12 * a) for a in annees]
-    costs_f = [capex_f + (opex_f * 12 * a) for a in annees]
-    costs_h = [capex_h + (opex_h * 12 * a) for a in annees]
-
-    fig_fin = go.Figure()
-    fig_fin.add_trace(go.Scatter(x=annees, y=costs_cw, name="Camwater", line=dict(color="#003399", width=4)))
-    fig_fin.add_trace(go.Scatter(x=annees, y=costs_f, name="Forage", line=dict(color="#228B22", width=4)))
-    fig_fin.add_trace(go.Scatter(x=annees, y=costs_h, name="Hybride", line=dict(color="#FFA500", width=3, dash='dash')))
-    fig_fin.update_layout(template="plotly_white", xaxis_title="Années", yaxis_title="CFA")
-    st.plotly_chart(fig_fin, use_container_width=True)
-    
-    # EXPORT PDF
-    st.divider()
-    scores = {"CAMWATER": scw, "FORAGE": sf, "HYBRIDE": sh}
-    best_option = max(scores, key=scores.get)
-    
-    final_fin_data = {
-        'total_cw': costs_cw[-1],
-        'total_f': costs_f[-1],
-        'total_h': costs_h[-1]
-    }
-    
-    st.download_button(
-        label="📥 Télécharger le Rapport PDF Complet", 
-        data=generate_pdf(
-            score_cw=scw, 
-            score_f=sf, 
-            score_h=sh,
-            weights=weights, 
-            cr=cr, 
-            recommendation=best_option, 
-            fin_data=final_fin_data,
-            zone_context=zone_context,
-            project_name=project_name,
-            uploaded_images=site_photos,
-            gps_coords=(selected_lat, selected_lon)
-        ),
-        file_name=f"Rapport_HYDRO_{project_name}_{date.today().strftime('%Y%m%d')}.pdf",
-        use_container_width=True,
-        type="primary"
-    )
\ No newline at end of file
+    evaluation_section(zone_context, criteria)
+    radar_section(criteria)
+    finance_section()
+    export_section(zone_context, criteria)
+    
+    requested_at = st.session_state.pop("dashboard_requested_at", None)
+    if requested_at is not None:
+        # Entrée dans le tableau de bord : temps jusqu'à la fin du premier rendu
+        st.session_state.time_to_interactive = (time.perf_counter() - requested_at, warm_up_pending)
+    timings_section(warm_up)
+    if st.session_state.debug_panel:
+        with debug_slot.container():
+            instrumentation_section()
@@ -0,0 +1,49 @@
+"""
+Benchmark AHP : boucle Python sur compute_weights vs compute_weights_batch.
+
+Usage :
+    python -m benchmarks.bench_ahp
+"""
+import time
+
+import numpy as np
+
+from engine.ahp_logic import AHPEngine
+
+SAATY_SCALE = np.array([1/9, 1/7, 1/5, 1/3, 1, 3, 5, 7, 9])
+
+
+def random_reciprocal_matrices(k, n, seed=0):
+    """Génère k matrices réciproques aléatoires n×n sur l'échelle de Saaty."""
+    rng = np.random.default_rng(seed)
+    matrices = np.ones((k, n, n))
+    iu = np.triu_indices(n, 1)
+    values = rng.choice(SAATY_SCALE, size=(k, len(iu[0])))
+    matrices[:, iu[0], iu[1]] = values
+    matrices[:, iu[1], iu[0]] = 1 / values
+    return matrices
+
+
+def run(k=10000, sizes=(3, 5, 7)):
+    engine = AHPEngine()
+    print(f"{'n':>3} | {'boucle (s)':>11} | {'batch (s)':>10} | {'gain':>6}")
+    for n in sizes:
+        matrices = random_reciprocal_matrices(k, n)
+
+        t0 = time.perf_counter()
+        loop_results = [engine.compute_weights(m) for m in matrices]
+        t_loop = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        weights, cr = engine.compute_weights_batch(matrices)
+        t_batch = time.perf_counter() - t0
+
+        # Vérifie que les deux chemins donnent exactement le même résultat
+        assert np.array_equal(weights, np.array([w for w, _ in loop_results]))
+        assert np.array_equal(cr, np.array([c for _, c in loop_results]))
+
+        print(f"{n:>3} | {t_loop:>11.4f} | {t_batch:>10.4f} | {t_loop / t_batch:>5.1f}x")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,35 @@
+"""
+Benchmark de passage à l'échelle de l'AHP pour n = 3..15 critères.
+
+Compare la pondération par colonnes normalisées et par moyenne géométrique,
+pour une matrice seule et pour un lot.
+
+Usage :
+    python -m benchmarks.bench_ahp_scaling
+"""
+import timeit
+
+from benchmarks.bench_ahp import random_reciprocal_matrices
+from engine.ahp_logic import AHPEngine
+
+
+def run(sizes=range(3, 16), batch=2000, repeat=200):
+    methods = AHPEngine.WEIGHT_METHODS
+    print(f"{'n':>3} | " + " | ".join(f"{m + ' µs':>14}" for m in methods)
+          + " | " + " | ".join(f"{m + ' lot ms':>16}" for m in methods))
+    for n in sizes:
+        single = random_reciprocal_matrices(1, n, seed=n)[0]
+        stack = random_reciprocal_matrices(batch, n, seed=n)
+        single_times, batch_times = [], []
+        for method in methods:
+            engine = AHPEngine(lambda_method="auto", weight_method=method)
+            t = timeit.timeit(lambda: engine.compute_weights(single), number=repeat)
+            single_times.append(t / repeat * 1e6)
+            t = timeit.timeit(lambda: engine.compute_weights_batch(stack), number=5)
+            batch_times.append(t / 5 * 1e3)
+        print(f"{n:>3} | " + " | ".join(f"{t:>14.1f}" for t in single_times)
+              + " | " + " | ".join(f"{t:>16.2f}" for t in batch_times))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,67 @@
+"""
+Benchmark des graphiques du rapport PDF (engine.charts).
+
+Mesure :
+- le coût pour le rerun du tableau de bord : soumission des trois
+  graphiques au ChartRenderer (spec neuve, puis spec déjà rendue) ;
+- le rendu SVG de chaque graphique et son insertion dans le PDF ;
+- la construction du rapport avec les barres textuelles (avant) et avec
+  les graphiques (après), et la taille du PDF.
+
+Usage :
+    python -m benchmarks.bench_charts
+"""
+import io
+import time
+import timeit
+
+from fpdf import FPDF
+
+from benchmarks.bench_report_template import sample_reports
+from engine.charts import ChartRenderer, render_chart, report_chart_specs
+from engine.report import generate_pdf
+
+
+def best(fn, number, repeat=5):
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def run(n_sites=50):
+    reports = sample_reports(n_sites)
+    specs = [report_chart_specs([[5 + (i + j) % 5 for j in range(3)] for i in range(3)],
+                                r["criteria_names"], r["weights"], r["finance"]) for r in reports]
+
+    # Rerun : soumission des trois graphiques (le rendu se fait en arrière-plan)
+    renderer = ChartRenderer(max_entries=4 * n_sites)
+    t0 = time.perf_counter()
+    jobs = [renderer.submit_many(s) for s in specs]
+    cold = (time.perf_counter() - t0) / n_sites
+    for site_jobs in jobs:
+        for job in site_jobs.values():
+            job.result()
+    warm = best(lambda: [renderer.submit_many(s) for s in specs], 1) / n_sites
+    print(f"soumission (rerun)   : spec neuve {cold * 1e3:6.3f} ms, déjà rendue {warm * 1e3:6.3f} ms "
+          f"pour 3 graphiques  {renderer.stats}")
+
+    for slot, (kind, spec) in specs[0].items():
+        svg = render_chart(kind, spec)
+        render = best(lambda: render_chart(kind, spec), 200)
+
+        def embed():
+            pdf = FPDF()
+            pdf.add_page()
+            pdf.image(io.BytesIO(svg), x=20, w=170)
+            return pdf.output()
+        print(f"{slot:<8} ({kind:<6}) : rendu SVG {render * 1e3:6.3f} ms, {len(svg) / 1024:4.1f} Ko, "
+              f"insertion PDF {best(embed, 20) * 1e3:5.2f} ms")
+
+    for label, with_charts in [("avant (barres)", False), ("après (graphiques)", True)]:
+        inputs = [dict(r, charts={slot: render_chart(kind, spec) for slot, (kind, spec) in s.items()})
+                  if with_charts else r for r, s in zip(reports, specs)]
+        size = len(generate_pdf(**inputs[0]))
+        total = best(lambda: [generate_pdf(**r) for r in inputs], 1, repeat=3)
+        print(f"{label:<20} : {total / n_sites * 1e3:6.2f} ms par rapport, PDF de {size / 1024:5.1f} Ko")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,30 @@
+"""
+Benchmark de la correction de cohérence pour n = 3..10.
+
+Usage :
+    python -m benchmarks.bench_consistency
+"""
+import time
+
+import numpy as np
+
+from benchmarks.bench_ahp import random_reciprocal_matrices
+from engine.ahp_logic import AHPEngine
+from engine.consistency import repair_consistency
+
+
+def run(sizes=range(3, 11), trials=20):
+    engine = AHPEngine(lambda_method="auto")
+    print(f"{'n':>3} | {'ms/matrice':>10} | {'CR initial':>10} | {'CR final':>8} | {'changements':>11}")
+    for n in sizes:
+        matrices = random_reciprocal_matrices(trials, n, seed=n)
+        t0 = time.perf_counter()
+        results = [repair_consistency(m, engine=engine) for m in matrices]
+        elapsed = (time.perf_counter() - t0) / trials
+        print(f"{n:>3} | {elapsed * 1e3:>10.2f} | {np.mean([r['initial_cr'] for r in results]):>10.3f} | "
+              f"{np.mean([r['cr'] for r in results]):>8.3f} | "
+              f"{np.mean([len(r['changes']) for r in results]):>11.1f}")
+
+
+if __name__ == "__main__":
+    run()
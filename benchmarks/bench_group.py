@@ -0,0 +1,39 @@
+"""
+Benchmark de la décision de groupe : agrégation de 500 matrices d'experts.
+
+Usage :
+    python -m benchmarks.bench_group
+"""
+import timeit
+
+import numpy as np
+
+from benchmarks.bench_ahp import random_reciprocal_matrices
+from engine.ahp_logic import AHPEngine, reciprocal_matrices
+from engine.group import group_decision
+
+
+def survey(k, n, seed=0):
+    """Panel cohérent autour d'un consensus, plus quelques réponses aléatoires."""
+    rng = np.random.default_rng(seed)
+    consensus = rng.uniform(0.5, 2.0, size=n)
+    iu = np.triu_indices(n, 1)
+    base = np.log(consensus[iu[0]] / consensus[iu[1]])
+    matrices = reciprocal_matrices(np.exp(base + rng.normal(0, 0.2, size=(k, len(base)))))
+    noisy = max(1, k // 20)
+    matrices[:noisy] = random_reciprocal_matrices(noisy, n, seed=seed + 1)
+    return matrices
+
+
+def run(k=500, sizes=(3, 5, 7), repeat=50):
+    engine = AHPEngine(lambda_method="auto")
+    for n in sizes:
+        matrices = survey(k, n)
+        result = group_decision(matrices, engine=engine)
+        t = timeit.timeit(lambda: group_decision(matrices, engine=engine), number=repeat) / repeat
+        print(f"n={n} : {k} experts agrégés en {t * 1e3:.2f} ms — "
+              f"{len(result['inconsistent'])} incohérents, {len(result['outliers'])} atypiques")
+
+
+if __name__ == "__main__":
+    run()
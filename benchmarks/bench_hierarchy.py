@@ -0,0 +1,50 @@
+"""
+Benchmark de l'AHP hiérarchique : arbre à 4 niveaux et 40 feuilles.
+
+Mesure la compilation de l'arbre (poids locaux + priorités globales) et
+l'évaluation de dizaines d'alternatives.
+
+Usage :
+    python -m benchmarks.bench_hierarchy
+"""
+import timeit
+
+import numpy as np
+
+from benchmarks.bench_ahp import random_reciprocal_matrices
+from engine.ahp_logic import AHPEngine
+from engine.hierarchy import AHPHierarchy, HierarchyNode
+
+
+def build_tree(branching=(2, 4, 5), seed=0):
+    """Construit un arbre racine → 2 → 8 → 40 feuilles avec jugements aléatoires."""
+    rng = np.random.default_rng(seed)
+
+    def build(depth, prefix):
+        if depth == len(branching):
+            return HierarchyNode(prefix)
+        n = branching[depth]
+        children = [build(depth + 1, f"{prefix}.{i}") for i in range(n)]
+        matrix = random_reciprocal_matrices(1, n, seed=int(rng.integers(1 << 31)))[0]
+        return HierarchyNode(prefix, children, matrix)
+
+    return build(0, "R")
+
+
+def run(alternatives=48, repeat=200):
+    root = build_tree()
+    engine = AHPEngine(lambda_method="auto")
+    hierarchy = AHPHierarchy(root, engine)
+    performances = np.random.default_rng(1).integers(1, 11, size=(alternatives, len(hierarchy.leaves)))
+
+    assert np.isclose(hierarchy.global_weights.sum(), 1.0)
+    t_build = timeit.timeit(lambda: AHPHierarchy(root, engine), number=repeat) / repeat
+    t_eval = timeit.timeit(lambda: hierarchy.evaluate(performances), number=repeat) / repeat
+    print(f"Feuilles : {len(hierarchy.leaves)}, alternatives : {alternatives}")
+    print(f"Compilation de l'arbre : {t_build * 1e3:.3f} ms")
+    print(f"Évaluation des alternatives : {t_eval * 1e6:.1f} µs")
+    print(f"Total : {(t_build + t_eval) * 1e3:.3f} ms")
+
+
+if __name__ == "__main__":
+    run()
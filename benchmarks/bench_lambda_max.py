@@ -0,0 +1,49 @@
+"""
+Micro-benchmark des stratégies de calcul de lambda max (n = 3..15).
+
+Vérifie d'abord que chaque stratégie concorde avec np.linalg.eigvals,
+puis mesure le temps par appel (matrice seule) et par lot.
+
+Usage :
+    python -m benchmarks.bench_lambda_max
+"""
+import timeit
+
+import numpy as np
+
+from benchmarks.bench_ahp import random_reciprocal_matrices
+from engine.ahp_logic import AHPEngine
+
+
+def check_against_eigvals(engine, matrices, rtol=1e-9):
+    """Compare lambda max de la stratégie de l'engine à eigvals."""
+    reference = np.real(np.linalg.eigvals(matrices).max(axis=-1))
+    n = matrices.shape[-1]
+    weights = (matrices / matrices.sum(axis=1, keepdims=True)).mean(axis=2)
+    result = engine.lambda_max_batch(matrices, weights)
+    assert np.allclose(result, reference, rtol=rtol, atol=0), (
+        f"{engine.lambda_method} diverge de eigvals pour n={n}"
+    )
+
+
+def run(sizes=range(3, 16), batch=2000, repeat=200):
+    methods = ["eigvals", "power", "auto"]
+    print(f"{'n':>3} | " + " | ".join(f"{m + ' µs':>14}" for m in methods)
+          + " | " + " | ".join(f"{m + ' lot ms':>16}" for m in methods))
+    for n in sizes:
+        single = random_reciprocal_matrices(1, n, seed=n)[0]
+        stack = random_reciprocal_matrices(batch, n, seed=n)
+        single_times, batch_times = [], []
+        for method in methods:
+            engine = AHPEngine(lambda_method=method)
+            check_against_eigvals(engine, stack)
+            t = timeit.timeit(lambda: engine.compute_weights(single), number=repeat)
+            single_times.append(t / repeat * 1e6)
+            t = timeit.timeit(lambda: engine.compute_weights_batch(stack), number=5)
+            batch_times.append(t / 5 * 1e3)
+        print(f"{n:>3} | " + " | ".join(f"{t:>14.1f}" for t in single_times)
+              + " | " + " | ".join(f"{t:>16.2f}" for t in batch_times))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,98 @@
+"""
+Benchmark de la préparation des photos avant insertion dans le PDF.
+
+Compare la taille et le temps de construction des pages photos du rapport
+avec les fichiers bruts et avec les photos préparées par PhotoPipeline
+(orientation EXIF, métadonnées supprimées, 170 mm à 200 ppp, JPEG).
+
+Mesure aussi la galerie : décodage d'un lot de photos en vignettes et
+versions d'impression, séquentiel puis en pool de threads, puis au rerun
+(servi par le cache).
+
+Jeu de test : les échantillons temp_site_img_*.png du dépôt et des photos
+de téléphone simulées (4032 × 3024, JPEG qualité 95, EXIF d'orientation).
+
+Usage :
+    python -m benchmarks.bench_photos
+"""
+import glob
+import io
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+from fpdf import FPDF
+from PIL import Image
+
+from engine.photos import PhotoPipeline
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def phone_photo(source, seed=0, size=(4032, 3024)):
+    """Photo de téléphone simulée : agrandie, bruitée, avec EXIF d'orientation."""
+    rng = np.random.default_rng(seed)
+    with Image.open(source) as image:
+        pixels = np.asarray(image.convert("RGB").resize(size), dtype=np.int16)
+    pixels = np.clip(pixels + rng.normal(0, 6, pixels.shape), 0, 255).astype(np.uint8)
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Orientation : rotation de 90°
+    out = io.BytesIO()
+    Image.fromarray(pixels).save(out, format="JPEG", quality=95, exif=exif)
+    return out.getvalue()
+
+
+def photo_pages(photos, pipeline=None):
+    """Pages photos du rapport, comme dans generate_pdf."""
+    pdf = FPDF(orientation="P", unit="mm", format="A4")
+    pdf.set_margin(15)
+    for data in photos:
+        pdf.add_page()
+        if pipeline is not None:
+            data = pipeline.process(data)
+        pdf.image(io.BytesIO(data), x=20, w=170)
+    return bytes(pdf.output())
+
+
+def run(phone_photos=5):
+    samples = sorted(glob.glob(str(ROOT / "temp_site_img_*.png")))
+    photo_sets = {
+        "échantillons du dépôt": [Path(path).read_bytes() for path in samples],
+        "photos de téléphone": [phone_photo(samples[i % len(samples)], seed=i) for i in range(phone_photos)],
+    }
+    for name, photos in photo_sets.items():
+        raw_size = sum(len(p) for p in photos) / 1e6
+        print(f"{len(photos)} {name} ({raw_size:.1f} Mo en entrée)")
+        for label, pipeline in [("brut", None), ("préparé", PhotoPipeline()), ("préparé q70", PhotoPipeline(quality=70))]:
+            t0 = time.perf_counter()
+            pdf = photo_pages(photos, pipeline)
+            cold = time.perf_counter() - t0
+            line = f"  {label:<12} : PDF {len(pdf) / 1e6:6.2f} Mo en {cold * 1e3:7.1f} ms"
+            if pipeline is not None:
+                # Second rapport : photos servies par le cache
+                t0 = time.perf_counter()
+                photo_pages(photos, pipeline)
+                line += f" (avec cache : {(time.perf_counter() - t0) * 1e3:.1f} ms)"
+            print(line)
+
+
+def run_gallery(n_photos=20):
+    samples = sorted(glob.glob(str(ROOT / "temp_site_img_*.png")))
+    photos = [phone_photo(samples[i % len(samples)], seed=i) for i in range(n_photos)]
+    print(f"Galerie : {n_photos} photos de téléphone")
+    for workers in sorted({1, os.cpu_count() or 1, 4}):
+        pipeline = PhotoPipeline(workers=workers)
+        t0 = time.perf_counter()
+        pipeline.process_many(photos)
+        cold = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        pipeline.process_many(photos)
+        warm = time.perf_counter() - t0
+        print(f"  {workers} thread(s) : {cold * 1e3:7.1f} ms, rerun {warm * 1e3:6.1f} ms "
+              f"(cache {pipeline.stats['bytes'] / 1e6:.1f} Mo)")
+
+
+if __name__ == "__main__":
+    run()
+    run_gallery()
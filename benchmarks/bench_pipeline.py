@@ -0,0 +1,54 @@
+"""
+Benchmark de débit de l'évaluation en lot (engine.cli), en lignes/seconde.
+
+Génère un fichier de sites aléatoires (CSV et, si pyarrow est installé,
+Parquet) dans un dossier temporaire puis le traite par blocs.
+
+Usage :
+    python -m benchmarks.bench_pipeline
+"""
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from engine.ahp_logic import SAATY_SLIDER_SCALE
+from engine.cli import run_batch
+from engine.pipeline import DEFAULT_FINANCE, comparison_keys, performance_keys
+
+
+def random_sites(rows, seed=0):
+    """Sites candidats avec jugements, notes et paramètres financiers aléatoires."""
+    rng = np.random.default_rng(seed)
+    data = {"site": np.arange(rows)}
+    for key in comparison_keys():
+        data[key] = rng.choice(SAATY_SLIDER_SCALE, size=rows)
+    for keys in performance_keys():
+        for key in keys:
+            data[key] = rng.integers(1, 11, size=rows)
+    for key, default in DEFAULT_FINANCE.items():
+        data[key] = default * rng.uniform(0.5, 1.5, size=rows)
+    return pd.DataFrame(data)
+
+
+def run(rows=200_000, chunksize=50_000):
+    sites = random_sites(rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        formats = [("csv", sites.to_csv, {"index": False})]
+        try:
+            import pyarrow  # noqa: F401
+            formats.append(("parquet", sites.to_parquet, {"index": False}))
+        except ImportError:
+            print("pyarrow absent : benchmark Parquet ignoré")
+        for ext, writer, kwargs in formats:
+            source = tmp / f"sites.{ext}"
+            writer(source, **kwargs)
+            stats = run_batch(source, tmp / f"resultats.{ext}", chunksize)
+            print(f"{ext:>8} : {stats['rows']} lignes en {stats['seconds']:.2f} s "
+                  f"-> {stats['rows_per_second']:,.0f} lignes/s".replace(",", " "))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,182 @@
+"""
+Suite de non-régression des performances (hors ligne, sans Streamlit).
+
+Chemins mesurés :
+- AHPEngine.compute_weights (une matrice) et compute_weights_batch
+  (1000 matrices), n = 3 à 15, avec lambda_method="auto" comme le
+  tableau de bord et engine.cli ;
+- get_zone_context (toutes les zones) ;
+- projection des coûts sur 10 ans (project_options, 3 options) ;
+- create_radar_chart (figure Plotly du tableau de bord) ;
+- generate_pdf avec graphiques et 0, 5 ou 30 photos distinctes (tirées de
+  temp_site_img_*.png, bruitées, avec EXIF d'orientation) : « cache chaud »
+  resert les photos déjà préparées par le PhotoPipeline de la session,
+  « pipeline neuf » les prépare toutes à chaque appel (premier export
+  d'une session, rapports en lot).
+
+Tous les cas sont d'abord exécutés une fois (préchauffage : imports,
+caches, fréquence du processeur), puis chacun est mesuré par la médiane de
+plusieurs répétitions (durée par appel) et comparé à
+benchmarks/baselines.json. Le script échoue (code 1) si un cas reste plus
+lent que sa référence au-delà de la tolérance : le seuil relatif, mais au
+moins --slack en absolu, pour que le bruit d'une machine partagée ne fasse
+pas échouer les cas de quelques microsecondes. Un dépassement est remesuré
+avant d'être signalé. Les références dépendent de la machine : --update
+les réécrit.
+
+Usage :
+    python -m benchmarks.bench_regression
+    python -m benchmarks.bench_regression --threshold 0.5 --slack 0.0001 --only compute_weights
+    python -m benchmarks.bench_regression --update
+"""
+import argparse
+import glob
+import json
+import statistics
+import sys
+import timeit
+from pathlib import Path
+
+from benchmarks.bench_ahp import random_reciprocal_matrices
+from benchmarks.bench_photos import phone_photo
+from benchmarks.bench_report_template import sample_reports
+from engine.ahp_logic import AHPEngine
+from engine.charts import render_chart, report_chart_specs
+from engine.data_loader import get_available_zones, get_zone_context
+from engine.figures import create_radar_chart
+from engine.finance import project_options
+from engine.photos import PhotoPipeline
+from engine.pipeline import DEFAULT_FINANCE, OPTIONS, hybrid_costs
+from engine.report import generate_pdf
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINES = Path(__file__).resolve().parent / "baselines.json"
+THRESHOLD = 0.3
+# Tolérance absolue minimale (s) : en dessous, l'écart relève du bruit de mesure
+SLACK = 25e-6
+
+
+def ahp_cases(sizes=range(3, 16), batch=1000):
+    engine = AHPEngine(lambda_method="auto")
+    for n in sizes:
+        matrices = random_reciprocal_matrices(batch, n, seed=n)
+        yield f"compute_weights n={n}", lambda m=matrices[0]: engine.compute_weights(m)
+        yield f"compute_weights_batch n={n} ({batch} matrices)", lambda m=matrices: engine.compute_weights_batch(m)
+
+
+def zone_cases():
+    zones = get_available_zones()
+    yield f"get_zone_context ({len(zones)} zones)", lambda: [get_zone_context(zone) for zone in zones]
+
+
+def finance_cases():
+    capex_h, opex_h = hybrid_costs(DEFAULT_FINANCE["capex_cw"], DEFAULT_FINANCE["opex_cw"],
+                                   DEFAULT_FINANCE["capex_f"], DEFAULT_FINANCE["opex_f"])
+    capex = [DEFAULT_FINANCE["capex_cw"], DEFAULT_FINANCE["capex_f"], capex_h]
+    opex = [DEFAULT_FINANCE["opex_cw"], DEFAULT_FINANCE["opex_f"], opex_h]
+    labels = [label for *_, label in OPTIONS]
+    yield "project_options 10 ans", lambda: project_options(labels, capex, opex, years=10)
+
+
+def radar_cases():
+    yield "create_radar_chart", lambda: create_radar_chart([7, 5, 6], [6, 9, 7], [5, 8, 8])
+
+
+def report_cases(photo_counts=(0, 5, 30)):
+    inputs = sample_reports(1)[0]
+    specs = report_chart_specs([[7, 5, 6], [6, 9, 7], [5, 8, 8]], inputs["criteria_names"], inputs["weights"],
+                               inputs["finance"])
+    inputs["charts"] = {slot: render_chart(kind, spec) for slot, (kind, spec) in specs.items()}
+    samples = sorted(glob.glob(str(ROOT / "temp_site_img_*.png")))
+    # Photos toutes différentes : un pipeline neuf n'en sert aucune depuis son cache
+    gallery = [phone_photo(samples[i % len(samples)], seed=i, size=(1366, 768)) for i in range(max(photo_counts))]
+    warm = PhotoPipeline()
+    for count in photo_counts:
+        photos = gallery[:count]
+        warm.process_many(photos)
+        yield (f"generate_pdf {count} photos (cache chaud)",
+               lambda photos=photos: generate_pdf(**dict(inputs, uploaded_images=photos, photo_pipeline=warm)))
+        if count:
+            # Pipeline créé dans l'appel : décodage, redimensionnement et encodage de chaque photo mesurés
+            yield (f"generate_pdf {count} photos (pipeline neuf)",
+                   lambda photos=photos: generate_pdf(**dict(inputs, uploaded_images=photos,
+                                                             photo_pipeline=PhotoPipeline())))
+
+
+SUITES = [ahp_cases, zone_cases, finance_cases, radar_cases, report_cases]
+
+
+def measure(fn, repeat=5, min_seconds=0.05):
+    """Durée par appel (s) : médiane des répétitions, chacune d'au moins min_seconds."""
+    fn()  # premier appel (imports, caches) hors mesure
+    number = 1
+    while timeit.timeit(fn, number=number) < min_seconds:
+        number *= 2
+    return statistics.median(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def tolerance(baseline, threshold=THRESHOLD, slack=SLACK):
+    """Dépassement toléré (s) sur une référence : le seuil relatif, au moins slack."""
+    return max(baseline * threshold, slack)
+
+
+def _format(seconds):
+    return f"{seconds * 1e6:9.1f} µs" if seconds < 1e-3 else f"{seconds * 1e3:9.2f} ms"
+
+
+def run(threshold=THRESHOLD, only=None, update=False, json_path=None, repeat=5, retries=2, slack=SLACK):
+    baselines = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    cases = [(name, fn) for suite in SUITES for name, fn in suite()
+             if not only or any(pattern in name for pattern in only)]
+    # Préchauffage de tous les cas avant la première mesure : le premier cas n'est plus mesuré à froid
+    for _, fn in cases:
+        fn()
+
+    results, regressions = {}, []
+    for name, fn in cases:
+        seconds = measure(fn, repeat=repeat)
+        baseline = baselines.get(name)
+        # Dépassement remesuré avant d'être signalé : une machine chargée ralentit une mesure, pas trois
+        for _ in range(retries):
+            if baseline is None or seconds <= baseline + tolerance(baseline, threshold, slack):
+                break
+            seconds = min(seconds, measure(fn, repeat=repeat))
+        results[name] = seconds
+        if baseline is None:
+            status = "nouveau"
+        else:
+            ratio = seconds / baseline - 1
+            status = f"{ratio:+6.0%}"
+            if seconds > baseline + tolerance(baseline, threshold, slack):
+                status += "  RÉGRESSION"
+                regressions.append(f"{name} : {_format(seconds).strip()} au lieu de {_format(baseline).strip()} "
+                                   f"({ratio:+.0%} > {threshold:+.0%} et > {_format(slack).strip()})")
+        print(f"{name:<48} {_format(seconds)}  {status}")
+
+    if json_path:
+        Path(json_path).write_text(json.dumps({"threshold": threshold, "slack": slack, "seconds": results,
+                                               "baselines": baselines, "regressions": regressions},
+                                              indent=2, ensure_ascii=False))
+    if update:
+        BASELINES.write_text(json.dumps({**baselines, **results}, indent=2, ensure_ascii=False) + "\n")
+        print(f"Références mises à jour : {BASELINES.relative_to(ROOT)} ({len(results)} cas)")
+        return True
+    for message in regressions:
+        print(f"RÉGRESSION - {message}")
+    return not regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_regression",
+                                     description=__doc__.split("\n\n")[0])
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help=f"Ralentissement toléré par rapport à la référence (défaut : {THRESHOLD}, soit +{THRESHOLD * 100:.0f} %%)")
+    parser.add_argument("--slack", type=float, default=SLACK,
+                        help=f"Ralentissement absolu toujours toléré, en secondes (défaut : {SLACK})")
+    parser.add_argument("--only", action="append", metavar="MOTIF",
+                        help="Ne mesure que les cas dont le nom contient ce motif ; répétable")
+    parser.add_argument("--update", action="store_true", help="Réécrit les références avec les mesures")
+    parser.add_argument("--json", help="Écrit les mesures, références et régressions dans ce fichier")
+    parser.add_argument("--repeat", type=int, default=5, help="Répétitions par cas (minimum retenu)")
+    args = parser.parse_args()
+    sys.exit(0 if run(args.threshold, args.only, args.update, args.json, args.repeat, slack=args.slack) else 1)
@@ -0,0 +1,60 @@
+"""
+Benchmark du gabarit des rapports PDF (engine.report_template).
+
+Compare la latence d'un rapport et le débit (rapports/s) avec un FPDF
+ordinaire (avant : chaque cellule repasse par la mise en forme de fpdf2)
+et avec le gabarit du processus (après), rapport sans photo.
+
+Usage :
+    python -m benchmarks.bench_report_template
+"""
+import time
+import timeit
+
+from fpdf import FPDF
+
+from benchmarks.bench_pipeline import random_sites
+from engine.data_loader import get_zone_context
+from engine.pipeline import evaluate_sites
+from engine.report import build_report
+from engine.report_batch import site_report_inputs
+from engine.report_template import ReportTemplate
+
+
+class PlainTemplate(ReportTemplate):
+    """Sans gabarit : document FPDF ordinaire, comme avant."""
+
+    def new_document(self):
+        pdf = FPDF(orientation=self.orientation, unit="mm", format=self.format)
+        pdf.set_margin(self.margin)
+        return pdf
+
+
+def sample_reports(n_sites):
+    evaluated = evaluate_sites(random_sites(n_sites))
+    reports = []
+    for i, row in enumerate(evaluated.to_dict("records")):
+        _, inputs = site_report_inputs(row, index=i, charts=False)
+        inputs["zone_context"] = get_zone_context("Nkolbisson")
+        inputs["gps_coords"] = (3.8667, 11.5167)
+        reports.append(inputs)
+    return reports
+
+
+def run(n_sites=100, repeat=3):
+    reports = sample_reports(n_sites)
+    for label, make_template in [("avant (FPDF)", PlainTemplate), ("après (gabarit)", ReportTemplate)]:
+        # Premier rapport sur un gabarit neuf (textes fixes encore à mesurer)
+        template = make_template()
+        t0 = time.perf_counter()
+        bytes(build_report(**reports[0], template=template).output())
+        first = time.perf_counter() - t0
+
+        total = min(timeit.repeat(lambda: [bytes(build_report(**r, template=template).output()) for r in reports],
+                                  number=1, repeat=repeat))
+        print(f"{label:<16} : premier rapport {first * 1e3:6.1f} ms, ensuite {total / n_sites * 1e3:5.2f} ms "
+              f"par rapport ({n_sites / total:5.0f} rapports/s)")
+
+
+if __name__ == "__main__":
+    run()
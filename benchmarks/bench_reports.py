@@ -0,0 +1,42 @@
+"""
+Benchmark des rapports PDF en lot (engine.report_batch), en pages/seconde.
+
+Évalue des sites aléatoires, puis rend un rapport par site dans une
+archive ZIP (rendu local puis pool de processus) et, si pypdf est
+installé, dans un document fusionné avec sommaire.
+
+Usage :
+    python -m benchmarks.bench_reports
+"""
+import os
+import tempfile
+from pathlib import Path
+
+from benchmarks.bench_pipeline import random_sites
+from engine.pipeline import evaluate_sites
+from engine.report_batch import render_reports, site_report_inputs
+
+
+def run(n_sites=200):
+    evaluated = evaluate_sites(random_sites(n_sites))
+    sites = [site_report_inputs(row, index=i) for i, row in enumerate(evaluated.to_dict("records"))]
+    processes = os.cpu_count() or 1
+    runs = [("rapports.zip", None), ("rapports.zip", processes)]
+    try:
+        import pypdf  # noqa: F401
+        runs.append(("rapports.pdf", processes))
+    except ImportError:
+        print("pypdf absent : document fusionné non mesuré")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, workers in runs:
+            path = Path(tmp) / name
+            stats = render_reports(iter(sites), path, processes=workers)
+            mode = f"pool de {workers} processus" if workers else "local"
+            print(f"{n_sites} sites -> {name:<12} ({mode:<18}) : {stats['pages']} pages en "
+                  f"{stats['seconds']:.2f} s ({stats['pages_per_second']:.0f} pages/s, "
+                  f"{path.stat().st_size / 1e6:.1f} Mo)")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,27 @@
+"""
+Benchmark de l'analyse de sensibilité Monte Carlo (100k tirages).
+
+Usage :
+    python -m benchmarks.bench_sensitivity
+"""
+import time
+
+from engine.sensitivity import monte_carlo_sensitivity
+
+PERFORMANCES = [[7, 3, 4], [4, 9, 8], [3, 10, 5]]
+
+
+def run(n_samples=100_000):
+    for comparisons in [(1, 1, 1), (9, 5, 1 / 5)]:
+        t0 = time.perf_counter()
+        result = monte_carlo_sensitivity(comparisons, PERFORMANCES, ["CAMWATER", "FORAGE", "HYBRIDE"],
+                                         n_samples=n_samples, seed=42)
+        elapsed = time.perf_counter() - t0
+        print(f"Jugements {comparisons} : {n_samples} tirages en {elapsed * 1e3:.1f} ms")
+        print(f"  verdict : {result['base_winner']}, "
+              f"inversion : {result['rank_reversal_probability']:.1%}, "
+              f"victoires : { {k: round(v, 3) for k, v in result['win_probability'].items()} }")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,142 @@
+"""
+Profil de démarrage du tableau de bord.
+
+Lance app.py dans un processus neuf (python -X importtime, via
+streamlit.testing AppTest) et mesure phase par phase :
+- streamlit : import du framework (payé avant tout script) ;
+- accueil : premier rendu de la page d'accueil, imports de app.py compris ;
+- préchauffage : travaux de fond lancés par l'accueil (engine.warmup) ;
+- tableau de bord : premier rendu après le clic d'entrée.
+
+Pour chaque phase : durée et temps d'import par paquet de premier niveau.
+Avec --max-ms, le script échoue (code 1) si une phase dépasse son budget :
+une régression du démarrage (import lourd remonté dans l'accueil, par
+exemple) apparaît ainsi en intégration continue.
+
+Usage :
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --json startup.json --max-ms accueil=800 --max-ms "tableau de bord=500"
+"""
+import argparse
+import json
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+MARKER = "@@phase "
+# Phases mesurées par CHILD, dans l'ordre
+PHASES = ("streamlit", "accueil", "préchauffage", "tableau de bord")
+
+# Exécuté dans le processus neuf ; chaque début de phase est signalé sur stderr,
+# entre les lignes de -X importtime
+CHILD = f"""
+import sys, threading, time
+def phase(name):
+    sys.stderr.write({MARKER!r} + name + "\\n")
+    sys.stderr.flush()
+    return time.perf_counter()
+durations = {{}}
+start = phase("streamlit")
+from streamlit.testing.v1 import AppTest
+durations["streamlit"], start = time.perf_counter() - start, phase("accueil")
+at = AppTest.from_file({str(ROOT / "app.py")!r}, default_timeout=300)
+at.run()
+durations["accueil"], start = time.perf_counter() - start, phase("préchauffage")
+for thread in threading.enumerate():
+    if thread.name == "warm-up":
+        thread.join()
+durations["préchauffage"], start = time.perf_counter() - start, phase("tableau de bord")
+at.button(key="dashboard_access_pro").click().run()
+durations["tableau de bord"] = time.perf_counter() - start
+phase("fin")
+errors = [e.message for e in at.exception]
+print(__import__("json").dumps({{"durations": durations, "errors": errors}}))
+"""
+
+
+def parse_importtime(stderr):
+    """Temps d'import (s) par phase et par paquet de premier niveau."""
+    imports = defaultdict(lambda: defaultdict(float))
+    current = None
+    for line in stderr.splitlines():
+        if line.startswith(MARKER):
+            current = line[len(MARKER):]
+        elif line.startswith("import time:") and current is not None:
+            _, self_us, cumulative_us, name = (part for part in line.replace("import time:", "|", 1).split("|"))
+            if not cumulative_us.strip().isdigit():
+                continue  # ligne d'en-tête
+            # Seuls les imports de premier niveau (non indentés) : leur cumul inclut les sous-modules
+            if name.startswith(" ") and not name.startswith("  "):
+                imports[current][name.strip().split(".")[0]] += int(cumulative_us) / 1e6
+    return imports
+
+
+def profile_startup():
+    """
+    Démarre l'application dans un processus neuf.
+
+    Returns:
+        dict: Par phase, durée (s), temps d'import total (s) et par paquet
+    """
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", CHILD], cwd=ROOT,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"Échec du démarrage :\n{proc.stderr[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    if result["errors"]:
+        raise RuntimeError(f"Exceptions dans l'application : {result['errors']}")
+    imports = parse_importtime(proc.stderr)
+    return {
+        name: {"seconds": seconds, "import_seconds": sum(imports[name].values()),
+               "imports": dict(sorted(imports[name].items(), key=lambda item: -item[1]))}
+        for name, seconds in result["durations"].items()
+    }
+
+
+def _check_phases(names):
+    unknown = [name for name in names if name not in PHASES]
+    if unknown:
+        raise ValueError(f"Phase inconnue : {', '.join(unknown)} (phases : {', '.join(PHASES)})")
+
+
+def run(json_path=None, budgets=None, top=6):
+    # Budgets vérifiés avant le profil, qui prend plusieurs secondes
+    _check_phases(budgets or {})
+    phases = profile_startup()
+    for name, phase in phases.items():
+        heaviest = ", ".join(f"{package} {seconds * 1e3:.0f}" for package, seconds in
+                             list(phase["imports"].items())[:top])
+        print(f"{name:<16} : {phase['seconds'] * 1e3:7.0f} ms dont imports {phase['import_seconds'] * 1e3:6.0f} ms"
+              f"{'  (' + heaviest + ' ms)' if heaviest else ''}")
+    if json_path:
+        Path(json_path).write_text(json.dumps(phases, indent=2, ensure_ascii=False))
+
+    over = [f"{name} : {phases[name]['seconds'] * 1e3:.0f} ms > {limit:.0f} ms"
+            for name, limit in (budgets or {}).items() if phases[name]["seconds"] * 1e3 > limit]
+    for message in over:
+        print(f"BUDGET DÉPASSÉ - {message}")
+    return not over
+
+
+def _budget(text):
+    """PHASE=MS de --max-ms ; phase et durée validées dès la lecture des arguments."""
+    name, sep, limit = text.rpartition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"attendu PHASE=MS, reçu {text!r} (phases : {', '.join(PHASES)})")
+    try:
+        _check_phases([name])
+        return name, float(limit)
+    except ValueError as error:
+        message = str(error) if name not in PHASES else f"durée invalide : {limit!r}"
+        raise argparse.ArgumentTypeError(message) from None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_startup", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--json", help="Écrit le profil détaillé (phases, imports par paquet) dans ce fichier")
+    parser.add_argument("--max-ms", type=_budget, action="append", default=[], metavar="PHASE=MS",
+                        help=f"Budget d'une phase en ms ({', '.join(PHASES)}) ; répétable")
+    args = parser.parse_args()
+    sys.exit(0 if run(args.json, dict(args.max_ms)) else 1)
@@ -1,23 +1,262 @@
 #calculs mathematiques pour l'AHP (matrice de Saaty)
 
+from collections import OrderedDict
+from itertools import product
+
 import numpy as np
 
+# Valeurs proposées par les curseurs de comparaison du tableau de bord
+SAATY_SLIDER_SCALE = (1/9, 1/5, 1, 5, 9)
+
+# Indices de cohérence aléatoire de Saaty (n = 1 à 15)
+RANDOM_INDEX = {
+    1: 0.0, 2: 0.0, 3: 0.58, 4: 0.90, 5: 1.12, 6: 1.24, 7: 1.32, 8: 1.41,
+    9: 1.45, 10: 1.49, 11: 1.51, 12: 1.48, 13: 1.56, 14: 1.57, 15: 1.59,
+}
+
+
+def reciprocal_matrix(comparisons):
+    """
+    Construit la matrice réciproque à partir du triangle supérieur.
+
+    Args:
+        comparisons (sequence): Jugements a12, a13, ..., a1n, a23, ... lus
+            ligne par ligne (ex. (c_vs_d, c_vs_a, d_vs_a) pour n=3)
+
+    Returns:
+        array: Matrice de comparaison n×n
+    """
+    return reciprocal_matrices(np.asarray(comparisons, dtype=float)[np.newaxis])[0]
+
+
+def reciprocal_matrices(comparisons):
+    """
+    Version vectorisée de reciprocal_matrix.
+
+    Args:
+        comparisons (array): Jugements du triangle supérieur, forme (k, n(n-1)/2)
+
+    Returns:
+        array: Pile de matrices de comparaison, forme (k, n, n)
+    """
+    comparisons = np.asarray(comparisons, dtype=float)
+    m = comparisons.shape[-1]
+    # n(n-1)/2 jugements pour une matrice n×n
+    n = int(round((1 + np.sqrt(1 + 8 * m)) / 2))
+    if n * (n - 1) // 2 != m:
+        raise ValueError(f"{m} jugements ne forment pas une matrice carrée")
+    matrices = np.ones((comparisons.shape[0], n, n))
+    iu = np.triu_indices(n, 1)
+    matrices[:, iu[0], iu[1]] = comparisons
+    matrices[:, iu[1], iu[0]] = 1 / comparisons
+    return matrices
+
+
 class AHPEngine:
-    def __init__(self):
+    # Stratégies disponibles pour le calcul de lambda max
+    LAMBDA_METHODS = ("eigvals", "power", "closed_form", "auto")
+    # Méthodes de calcul des poids
+    WEIGHT_METHODS = ("column", "geometric")
+    # Seuils de la stratégie "auto" : en deçà, le surcoût de la boucle Python
+    # de l'itération de la puissance dépasse le gain sur eigvals
+    POWER_MIN_SIZE = 8
+    POWER_MIN_BATCH = 64
+
+    def __init__(self, lambda_method="eigvals", tol=1e-12, max_iter=100,
+                 weight_method="column"):
+        """
+        Args:
+            lambda_method (str): Calcul de lambda max pour le CR :
+                "eigvals" (décomposition complète), "power" (itération de la
+                puissance), "closed_form" (formule exacte, n=3 uniquement)
+                ou "auto" (formule exacte pour n=3, puissance pour les gros
+                lots de grandes matrices, eigvals sinon)
+            tol (float): Tolérance relative d'arrêt de l'itération de la puissance
+            max_iter (int): Nombre maximal d'itérations de la puissance
+            weight_method (str): "column" (moyenne des colonnes normalisées)
+                ou "geometric" (moyenne géométrique des lignes)
+        """
+        if lambda_method not in self.LAMBDA_METHODS:
+            raise ValueError(f"Méthode lambda max inconnue : {lambda_method}")
+        if weight_method not in self.WEIGHT_METHODS:
+            raise ValueError(f"Méthode de pondération inconnue : {weight_method}")
+        self.lambda_method = lambda_method
+        self.tol = tol
+        self.max_iter = max_iter
+        self.weight_method = weight_method
         # Indice de cohérence aléatoire (Saaty)
-        self.RI = {3: 0.58, 4: 0.90, 5: 1.12}
+        self.RI = RANDOM_INDEX
 
     def compute_weights(self, matrix):
         """Calcule les poids (vecteur propre) et le ratio de cohérence."""
-        n = matrix.shape[0]
-        # Normalisation
-        column_sums = matrix.sum(axis=0)
-        norm_matrix = matrix / column_sums
-        weights = norm_matrix.mean(axis=1)
-        
-        # Calcul de la cohérence (CR)
-        lambda_max = np.real(np.linalg.eigvals(matrix).max())
+        matrix = np.asarray(matrix, dtype=float)
+        weights, cr = self.compute_weights_batch(matrix[np.newaxis])
+        return weights[0], cr[0]
+
+    def compute_weights_batch(self, matrices):
+        """
+        Version vectorisée de compute_weights pour un lot de matrices.
+
+        Args:
+            matrices (array): Pile de matrices de comparaison, forme (k, n, n)
+
+        Returns:
+            tuple: poids de forme (k, n) et ratios de cohérence de forme (k,)
+        """
+        matrices = np.asarray(matrices, dtype=float)
+        if matrices.ndim != 3 or matrices.shape[1] != matrices.shape[2]:
+            raise ValueError("Les matrices doivent être de forme (k, n, n)")
+        n = matrices.shape[-1]
+        if n not in self.RI:
+            raise ValueError(f"Pas d'indice aléatoire de Saaty pour n={n} (max {max(self.RI)})")
+
+        if self.weight_method == "geometric":
+            # Moyenne géométrique de chaque ligne, puis normalisation
+            row_means = np.exp(np.log(matrices).mean(axis=2))
+            weights = row_means / row_means.sum(axis=1, keepdims=True)
+        else:
+            # Normalisation colonne par colonne, matrice par matrice
+            column_sums = matrices.sum(axis=1, keepdims=True)
+            norm_matrices = matrices / column_sums
+            weights = norm_matrices.mean(axis=2)
+
+        # Calcul de la cohérence (CR), nul par définition pour n <= 2
+        if self.RI[n] == 0:
+            return weights, np.zeros(matrices.shape[0])
+        lambda_max = self.lambda_max_batch(matrices, weights)
         ci = (lambda_max - n) / (n - 1)
-        cr = ci / self.RI.get(n, 1.0)
-        
-        return weights, cr
\ No newline at end of file
+        cr = ci / self.RI[n]
+
+        return weights, cr
+
+    def compute_criteria_weights(self, criteria, judgments):
+        """
+        Calcule les poids d'une liste de critères nommés.
+
+        Args:
+            criteria (list): Noms des critères, dans l'ordre voulu
+            judgments (dict): Jugements {(critère_a, critère_b): valeur} ; une
+                paire absente vaut l'inverse de la paire opposée, ou 1
+
+        Returns:
+            tuple: dict {critère: poids} et ratio de cohérence
+        """
+        n = len(criteria)
+        matrix = np.ones((n, n))
+        for i, j in zip(*np.triu_indices(n, 1)):
+            a, b = criteria[i], criteria[j]
+            if (a, b) in judgments:
+                value = judgments[(a, b)]
+            else:
+                value = 1 / judgments.get((b, a), 1)
+            matrix[i, j] = value
+            matrix[j, i] = 1 / value
+        weights, cr = self.compute_weights(matrix)
+        return {name: float(w) for name, w in zip(criteria, weights)}, float(cr)
+
+    def lambda_max_batch(self, matrices, weights=None):
+        """
+        Calcule la valeur propre maximale (racine de Perron) de chaque matrice.
+
+        Args:
+            matrices (array): Pile de matrices réciproques positives (k, n, n)
+            weights (array): Vecteurs de départ (k, n) pour l'itération de la
+                puissance, typiquement les poids par normalisation des colonnes
+
+        Returns:
+            array: lambda max de forme (k,)
+        """
+        n = matrices.shape[-1]
+        method = self.lambda_method
+        if method == "auto":
+            if n == 3:
+                method = "closed_form"
+            elif n >= self.POWER_MIN_SIZE and matrices.shape[0] >= self.POWER_MIN_BATCH:
+                method = "power"
+            else:
+                method = "eigvals"
+
+        if method == "closed_form":
+            return self._lambda_max_closed_form(matrices)
+        if method == "power":
+            if weights is None:
+                weights = np.full(matrices.shape[:2], 1.0 / n)
+            return self._lambda_max_power(matrices, weights)
+        # eigvals accepte directement une pile de matrices
+        return np.real(np.linalg.eigvals(matrices).max(axis=-1))
+
+    def _lambda_max_closed_form(self, matrices):
+        """Racine exacte de l'équation caractéristique d'une matrice réciproque 3×3."""
+        if matrices.shape[-1] != 3:
+            raise ValueError("La formule exacte de lambda max n'existe que pour n=3")
+        # Avec r = a12·a23/a13, det(A - λI) = 0 donne λ = 1 + r^(1/3) + r^(-1/3)
+        r = matrices[:, 0, 1] * matrices[:, 1, 2] / matrices[:, 0, 2]
+        r_cbrt = np.cbrt(r)
+        return 1.0 + r_cbrt + 1.0 / r_cbrt
+
+    def _lambda_max_power(self, matrices, weights):
+        """Itération de la puissance vectorisée, amorcée par les poids fournis."""
+        w = weights / weights.sum(axis=1, keepdims=True)
+        lambda_max = np.full(matrices.shape[0], np.inf)
+        for _ in range(self.max_iter):
+            aw = np.matmul(matrices, w[:, :, np.newaxis])[:, :, 0]
+            # w est normalisé (somme = 1), donc sum(Aw) estime lambda max
+            new_lambda = aw.sum(axis=1)
+            w = aw / new_lambda[:, np.newaxis]
+            converged = np.abs(new_lambda - lambda_max) <= self.tol * new_lambda
+            lambda_max = new_lambda
+            if converged.all():
+                break
+        return lambda_max
+
+
+class AHPLookup:
+    """
+    Cache LRU borné des résultats AHP, indexé par le tuple des jugements.
+
+    Le domaine des curseurs étant fini (125 matrices pour n=3), precompute()
+    permet de remplir toute la table en un seul appel vectorisé.
+    """
+
+    def __init__(self, engine=None, maxsize=512):
+        self.engine = engine or AHPEngine()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+
+    @staticmethod
+    def _key(comparisons):
+        # Arrondi pour que 1/9 calculé de deux façons donne la même clé
+        return tuple(round(float(v), 12) for v in comparisons)
+
+    def get(self, comparisons):
+        """Retourne (poids, CR) pour les jugements donnés, en les calculant si besoin."""
+        key = self._key(comparisons)
+        if key in self._cache:
+            self.hits += 1
+            self._cache.move_to_end(key)
+        else:
+            self.misses += 1
+            self._store(key, *self.engine.compute_weights(reciprocal_matrix(key)))
+        weights, cr = self._cache[key]
+        return weights.copy(), cr
+
+    def precompute(self, scale=SAATY_SLIDER_SCALE, n=3):
+        """Calcule en un seul lot toutes les combinaisons de jugements de l'échelle."""
+        combos = list(product(scale, repeat=n * (n - 1) // 2))
+        matrices = reciprocal_matrices(combos)
+        weights, cr = self.engine.compute_weights_batch(matrices)
+        for combo, w, c in zip(combos, weights, cr):
+            self._store(self._key(combo), w, c)
+
+    def _store(self, key, weights, cr):
+        self._cache[key] = (weights, float(cr))
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+    @property
+    def stats(self):
+        """Compteurs de succès/échecs et taille courante du cache."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._cache)}
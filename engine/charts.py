@@ -0,0 +1,377 @@
+# Graphiques du rapport PDF : rendu SVG hors écran, en arrière-plan et en cache
+"""
+Graphiques du tableau de bord redessinés pour le rapport PDF.
+
+Le radar des performances, l'anneau des poids et les courbes de coûts
+cumulés sont décrits par un type et un dictionnaire de données (la
+« spec » : catégories, séries, couleurs, bornes), construit par
+radar_spec, donut_spec et cost_curves_spec. La même spec donne la figure
+Plotly du tableau de bord (engine.figures) et le SVG du rapport (ici).
+
+Le SVG est écrit à la main plutôt qu'exporté depuis Plotly : l'export
+statique de Plotly passe par Kaleido et un navigateur headless, absents
+des dépendances, lents à démarrer (plusieurs secondes par processus de
+rendu des rapports en lot) et sans lesquels fpdf2 ne reçoit rien. fpdf2
+insère directement le SVG comme dessin vectoriel (net à toute échelle,
+quelques Ko), sans importer Plotly dans les processus de rendu.
+
+L'empreinte d'une spec sert de clé de cache. ChartRenderer rend les
+specs dans un thread de travail : la soumission est immédiate, le rerun
+du tableau de bord ne l'attend pas, et le rapport ne bloque que si le
+rendu n'est pas encore terminé au moment du téléchargement. Une spec déjà
+rendue est resservie telle quelle.
+"""
+
+import hashlib
+import json
+import math
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+# Couleurs des options, partagées par les figures du tableau de bord et le rapport
+OPTION_COLORS = {"CAMWATER": "#003399", "FORAGE": "#228B22", "HYBRIDE": "#FFA500"}
+# Palette par défaut de Plotly (secteurs de l'anneau des poids, options hors OPTION_COLORS)
+PALETTE = ["#636EFA", "#EF553B", "#00CC96", "#AB63FA", "#FFA15A",
+           "#19D3F3", "#FF6692", "#B6E880", "#FF97FF", "#FECB52"]
+# Échelle des notes (axe radial du radar)
+RADAR_RANGE = (0, 10)
+RADAR_TITLE = "Analyse Comparative des Performances"
+
+# Dimensions des SVG (unités du viewBox) ; insérés sur 170 mm de large
+CHART_WIDTH = 680
+FONT = 'font-family="Helvetica"'
+
+
+class ChartJob(namedtuple("ChartJob", ["kind", "digest", "future"])):
+    """Graphique soumis au rendu : type, empreinte de la spec et rendu en cours."""
+
+    __slots__ = ()
+
+    def result(self, timeout=None):
+        """SVG du graphique (bytes), après la fin du rendu."""
+        return self.future.result(timeout)
+
+
+def _svg(width, height, body):
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            f'viewBox="0 0 {width} {height}">{"".join(body)}</svg>').encode()
+
+
+def _text(x, y, text, size=12, anchor="start", color="#333333", weight="normal"):
+    return (f'<text x="{x:.1f}" y="{y:.1f}" {FONT} font-size="{size}" font-weight="{weight}" '
+            f'fill="{color}" text-anchor="{anchor}">{escape(str(text))}</text>')
+
+
+def _title(title, width):
+    return [_text(width / 2, 24, title, 16, "middle", "#003366", "bold")] if title else []
+
+
+def _legend(x, y, series, dashed=False):
+    """Légende verticale : trait (ou carré) de couleur et libellé."""
+    body = []
+    for i, item in enumerate(series):
+        yi = y + 20 * i
+        if dashed:
+            dash = ' stroke-dasharray="8,5"' if item.get("dash") else ""
+            body.append(f'<line x1="{x}" y1="{yi - 4}" x2="{x + 24}" y2="{yi - 4}" '
+                        f'stroke="{item["color"]}" stroke-width="3"{dash}/>')
+        else:
+            body.append(f'<rect x="{x}" y="{yi - 11}" width="12" height="12" fill="{item["color"]}"/>')
+        body.append(_text(x + (30 if dashed else 18), yi, item["label"], 12))
+    return body
+
+
+def radar_svg(categories, series, title=RADAR_TITLE, max_value=RADAR_RANGE[1]):
+    """
+    Radar des notes de chaque option sur les critères actifs.
+
+    Args:
+        categories (list): Noms des critères
+        series (list): Dictionnaires label, values (une note par critère), color
+        title (str): Titre du graphique
+        max_value (float): Note maximale (bord du radar)
+
+    Returns:
+        bytes: Document SVG
+    """
+    width, height = CHART_WIDTH, 400
+    cx, cy, radius = 260, 220, 135
+    n = len(categories)
+    # Comme Plotly : premier critère à droite, sens trigonométrique
+    angles = [-2 * math.pi * i / n for i in range(n)]
+
+    def point(value, angle):
+        r = radius * min(max(float(value), 0), max_value) / max_value
+        return cx + r * math.cos(angle), cy + r * math.sin(angle)
+
+    body = _title(title, width)
+    for step in range(1, 6):
+        r = radius * step / 5
+        body.append(f'<circle cx="{cx}" cy="{cy}" r="{r:.1f}" fill="none" stroke="#D3D3D3" stroke-width="1"/>')
+        body.append(_text(cx + 3, cy - r + 11, f"{max_value * step / 5:g}", 9, color="#666666"))
+    for angle, name in zip(angles, categories):
+        x, y = point(max_value, angle)
+        body.append(f'<line x1="{cx}" y1="{cy}" x2="{x:.1f}" y2="{y:.1f}" stroke="#D3D3D3" stroke-width="1"/>')
+        cos, sin = math.cos(angle), math.sin(angle)
+        anchor = "start" if cos > 0.3 else "end" if cos < -0.3 else "middle"
+        body.append(_text(cx + (radius + 12) * cos, cy + (radius + 12) * sin + 4 + 6 * sin, name, 12, anchor))
+    for item in series:
+        points = " ".join("%.1f,%.1f" % point(v, a) for v, a in zip(item["values"], angles))
+        body.append(f'<polygon points="{points}" fill="{item["color"]}" fill-opacity="0.2" '
+                    f'stroke="{item["color"]}" stroke-width="2"/>')
+    body += _legend(500, 80, series)
+    return _svg(width, height, body)
+
+
+def donut_svg(labels, values, title="Poids des Critères", colors=None):
+    """
+    Anneau des poids des critères, secteurs triés par poids décroissant.
+
+    Returns:
+        bytes: Document SVG
+    """
+    width, height = CHART_WIDTH, 300
+    cx, cy, outer, inner = 220, 165, 120, 60
+    colors = colors or [PALETTE[i % len(PALETTE)] for i in range(len(labels))]
+    total = float(sum(values)) or 1.0
+
+    body = _title(title, width)
+    # Comme Plotly : départ à midi, sens trigonométrique
+    start = -math.pi / 2
+    for i in sorted(range(len(values)), key=lambda i: -values[i]):
+        share = float(values[i]) / total
+        if share <= 0:
+            continue
+        # Un arc ne peut pas se refermer sur lui-même : un secteur plein est à peine ouvert
+        sweep = -2 * math.pi * min(share, 0.9999)
+        end = start + sweep
+        large = 1 if abs(sweep) > math.pi else 0
+        x0, y0 = cx + outer * math.cos(start), cy + outer * math.sin(start)
+        x1, y1 = cx + outer * math.cos(end), cy + outer * math.sin(end)
+        x2, y2 = cx + inner * math.cos(end), cy + inner * math.sin(end)
+        x3, y3 = cx + inner * math.cos(start), cy + inner * math.sin(start)
+        body.append(f'<path d="M {x0:.2f} {y0:.2f} A {outer} {outer} 0 {large} 0 {x1:.2f} {y1:.2f} '
+                    f'L {x2:.2f} {y2:.2f} A {inner} {inner} 0 {large} 1 {x3:.2f} {y3:.2f} Z" '
+                    f'fill="{colors[i]}" stroke="#FFFFFF" stroke-width="1.5"/>')
+        if share >= 0.04:
+            middle = start + sweep / 2
+            r = (outer + inner) / 2
+            body.append(_text(cx + r * math.cos(middle), cy + r * math.sin(middle) + 4,
+                              f"{share:.1%}", 11, "middle", "#FFFFFF", "bold"))
+        start = end
+    body += _legend(400, 80, [{"label": label, "color": color} for label, color in zip(labels, colors)])
+    return _svg(width, height, body)
+
+
+def _nice_ticks(high, count=5):
+    """Graduations régulières (pas de 1, 2 ou 5 × 10^k) de 0 à au moins high."""
+    high = float(high) if high > 0 else 1.0
+    raw = high / count
+    magnitude = 10 ** math.floor(math.log10(raw))
+    step = next(m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= raw)
+    return [step * i for i in range(int(math.ceil(high / step - 1e-9)) + 1)]
+
+
+def _format_amount(value):
+    if value >= 1e9:
+        return f"{value / 1e9:g} Md"
+    if value >= 1e6:
+        return f"{value / 1e6:g} M"
+    if value >= 1e3:
+        return f"{value / 1e3:g} k"
+    return f"{value:g}"
+
+
+def cost_curves_svg(years, series, title="Coûts cumulés", x_title="Années", y_title="FCFA"):
+    """
+    Courbes de coûts cumulés de chaque option.
+
+    Args:
+        years (list): Abscisses (années)
+        series (list): Dictionnaires label, values, color et dash (trait pointillé)
+
+    Returns:
+        bytes: Document SVG
+    """
+    width, height = CHART_WIDTH, 340
+    left, right, top, bottom = 70, 530, 45, 295
+    years = [float(y) for y in years]
+    x_low, x_high = min(years), max(years)
+    x_span = (x_high - x_low) or 1.0
+    y_ticks = _nice_ticks(max((max(item["values"]) for item in series), default=0))
+    y_high = y_ticks[-1]
+
+    def x_of(year):
+        return left + (right - left) * (year - x_low) / x_span
+
+    def y_of(value):
+        return bottom - (bottom - top) * float(value) / y_high
+
+    body = _title(title, width)
+    for tick in y_ticks:
+        y = y_of(tick)
+        body.append(f'<line x1="{left}" y1="{y:.1f}" x2="{right}" y2="{y:.1f}" stroke="#E5E5E5" stroke-width="1"/>')
+        body.append(_text(left - 6, y + 4, _format_amount(tick), 10, "end", "#666666"))
+    for tick in _nice_ticks(x_span, 10):
+        x = x_of(x_low + tick)
+        body.append(_text(x, bottom + 16, f"{x_low + tick:g}", 10, "middle", "#666666"))
+    body.append(f'<line x1="{left}" y1="{bottom}" x2="{right}" y2="{bottom}" stroke="#999999" stroke-width="1"/>')
+    body.append(_text((left + right) / 2, bottom + 36, x_title, 12, "middle"))
+    body.append(_text(left, top - 10, y_title, 11, "end", "#666666"))
+
+    for item in series:
+        points = " ".join(f"{x_of(x):.1f},{y_of(v):.1f}" for x, v in zip(years, item["values"]))
+        dash = ' stroke-dasharray="8,5"' if item.get("dash") else ""
+        body.append(f'<polyline points="{points}" fill="none" stroke="{item["color"]}" '
+                    f'stroke-width="{3 if item.get("dash") else 4}"{dash}/>')
+    body += _legend(550, 70, series, dashed=True)
+    return _svg(width, height, body)
+
+
+# Moteur de rendu de chaque type de graphique
+RENDERERS = {"radar": radar_svg, "donut": donut_svg, "costs": cost_curves_svg}
+
+
+def _plain(value):
+    # Tableaux et scalaires numpy dans la spec : valeurs Python équivalentes
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    raise TypeError(f"Valeur non sérialisable dans une spec de graphique : {type(value).__name__}")
+
+
+def chart_digest(kind, spec):
+    """Empreinte d'un graphique (type et données), clé du cache de rendu."""
+    payload = json.dumps([kind, spec], sort_keys=True, default=_plain, ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def render_chart(kind, spec):
+    """Rendu SVG d'un graphique (bytes)."""
+    return RENDERERS[kind](**spec)
+
+
+def option_colors(options):
+    """Couleur de chaque option (OPTION_COLORS, sinon PALETTE dans l'ordre)."""
+    return [OPTION_COLORS.get(label, PALETTE[j % len(PALETTE)]) for j, label in enumerate(options)]
+
+
+def radar_spec(categories, options, performances):
+    """
+    Spec du radar des performances.
+
+    Args:
+        categories (list): Noms des critères actifs
+        options (list): Noms des options
+        performances (list): Notes de chaque option, une par critère
+    """
+    return {
+        "categories": list(categories),
+        "series": [{"label": label, "values": [float(v) for v in values], "color": color}
+                   for label, values, color in zip(options, performances, option_colors(options))],
+        "title": RADAR_TITLE,
+        "max_value": RADAR_RANGE[1],
+    }
+
+
+def donut_spec(labels, weights):
+    """Spec de l'anneau des poids des critères."""
+    return {"labels": list(labels), "values": [float(w) for w in weights],
+            "colors": [PALETTE[i % len(PALETTE)] for i in range(len(labels))]}
+
+
+def cost_curves_spec(options, years, cumulative):
+    """
+    Spec des courbes de coûts cumulés (la dernière option en pointillés).
+
+    Args:
+        options (list): Noms des options
+        years (array): Années 0..horizon
+        cumulative (array): Coûts cumulés de chaque option, forme (options, années)
+    """
+    years = np.asarray(years)
+    return {
+        "years": years.tolist(),
+        "series": [{"label": label, "values": np.asarray(values).tolist(), "color": color,
+                    "dash": j == len(options) - 1}
+                   for j, (label, values, color) in enumerate(zip(options, cumulative, option_colors(options)))],
+        "title": f"Coûts cumulés sur {int(years[-1])} ans",
+    }
+
+
+def report_chart_specs(performances, criteria_names, weights, finance):
+    """
+    Specs des graphiques du rapport, tirées des entrées du tableau de bord.
+
+    Args:
+        performances (list): Notes de chaque option (ordre de finance.options)
+        criteria_names (list): Noms des critères actifs
+        weights (array): Poids AHP des critères
+        finance (FinancialResult): Projection financière des options
+
+    Returns:
+        dict: (type, spec) par emplacement du rapport : radar, weights, costs
+    """
+    return {
+        "radar": ("radar", radar_spec(criteria_names, finance.options, performances)),
+        "weights": ("donut", donut_spec(criteria_names, weights)),
+        "costs": ("costs", cost_curves_spec(finance.options, finance.years, finance.cumulative)),
+    }
+
+
+class ChartRenderer:
+    """
+    Rendu des graphiques dans un thread de travail, en cache LRU borné et
+    indexé par empreinte de la spec. Utilisable depuis plusieurs threads.
+
+    Usage :
+        renderer = ChartRenderer()
+        job = renderer.submit("radar", spec)   # immédiat
+        svg = job.result()                     # attend la fin du rendu
+    """
+
+    def __init__(self, max_entries=64, workers=1):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="charts")
+
+    def __repr__(self):
+        return f"ChartRenderer(max_entries={self.max_entries})"
+
+    def submit(self, kind, spec):
+        """
+        Soumet un graphique au rendu, sauf s'il est déjà rendu ou en cours.
+
+        Returns:
+            ChartJob: Type, empreinte et rendu (job.result() renvoie le SVG)
+        """
+        digest = chart_digest(kind, spec)
+        with self._lock:
+            future = self._cache.get(digest)
+            # Un rendu en échec est retenté à la soumission suivante
+            if future is not None and not (future.done() and future.exception() is not None):
+                self.hits += 1
+                self._cache.move_to_end(digest)
+                return ChartJob(kind, digest, future)
+            self.misses += 1
+            future = self._executor.submit(render_chart, kind, spec)
+            self._cache[digest] = future
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return ChartJob(kind, digest, future)
+
+    def submit_many(self, specs):
+        """Soumet un dictionnaire {emplacement: (type, spec)} ; renvoie {emplacement: ChartJob}."""
+        return {slot: self.submit(kind, spec) for slot, (kind, spec) in specs.items()}
+
+    @property
+    def stats(self):
+        """Compteurs de succès/échecs et nombre de graphiques en cache."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._cache)}
@@ -0,0 +1,172 @@
+# Évaluation en lot, sans interface : python -m engine.cli sites.csv -o resultats.csv
+"""
+Évalue des milliers de sites candidats à partir d'un fichier CSV ou Parquet.
+
+Le fichier est lu par blocs (jamais chargé en entier), chaque bloc est
+évalué de façon vectorisée par engine.pipeline.evaluate_sites, puis ajouté
+au fichier de sortie.
+
+Avec --reports, un rapport PDF par site est aussi rendu (pool de processus
+avec --processes) et écrit dans une archive ZIP ou un document fusionné.
+
+Les coûts suivent la projection mensuelle du tableau de bord ; ses
+hypothèses (actualisation, inflation, hausse des tarifs, remplacement de
+pompe, part réseau de l'hybride) sont des options communes à tous les sites.
+
+Exemple :
+    python -m engine.cli sites.parquet -o resultats.parquet --chunksize 50000
+    python -m engine.cli sites.csv -o resultats.csv --reports rapports.zip --processes 4
+    python -m engine.cli sites.csv -o resultats.csv --discount-rate 8 --tariff-escalation 5
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from engine.ahp_logic import AHPEngine
+from engine.pipeline import BASE_CRITERIA_KEYS, DEFAULT_PROJECTION, HORIZON_YEARS, evaluate_sites
+
+
+def _is_parquet(path):
+    return Path(path).suffix.lower() in (".parquet", ".pq")
+
+
+def read_chunks(path, chunksize):
+    """Itère sur le fichier d'entrée par blocs de DataFrame."""
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        import pandas as pd
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+class ChunkWriter:
+    """Écrit les blocs de résultats au fil de l'eau (CSV ou Parquet)."""
+
+    def __init__(self, path):
+        self.path = path
+        self._parquet_writer = None
+        self._first = True
+
+    def write(self, frame):
+        if _is_parquet(self.path):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            frame.to_csv(self.path, mode="w" if self._first else "a", header=self._first, index=False)
+        self._first = False
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def run_batch(input_path, output_path, chunksize=50000, criteria_keys=BASE_CRITERIA_KEYS,
+              years=HORIZON_YEARS, reports_path=None, processes=None, charts=True, projection=None):
+    """
+    Évalue tout le fichier d'entrée et écrit les résultats.
+
+    Args:
+        reports_path (str): Archive .zip ou document .pdf des rapports par
+            site (aucun rapport si None)
+        processes (int): Processus de rendu des rapports
+        charts (bool): Graphiques (radar, poids, coûts) dans les rapports
+        projection (dict): Hypothèses financières (voir DEFAULT_PROJECTION),
+            appliquées aux résultats comme aux rapports
+
+    Returns:
+        dict: Nombre de lignes traitées, durée (s) et débit (lignes/s), et
+            statistiques des rapports (clé "reports") si demandés
+    """
+    engine = AHPEngine(lambda_method="auto")
+    projection = projection or {}
+    writer = ChunkWriter(output_path)
+    rows = 0
+    start = time.perf_counter()
+
+    def evaluated_chunks():
+        nonlocal rows
+        for chunk in read_chunks(input_path, chunksize):
+            result = evaluate_sites(chunk, criteria_keys, years, engine, **projection)
+            writer.write(result)
+            rows += len(chunk)
+            yield result
+
+    stats = {}
+    try:
+        if reports_path:
+            from engine.report_batch import render_reports, site_report_inputs
+            # Les rapports sont rendus au fil de l'évaluation, bloc par bloc
+            sites = (site_report_inputs(row, criteria_keys, years, index, charts, projection)
+                     for chunk in evaluated_chunks()
+                     for index, row in enumerate(chunk.to_dict("records"), start=rows - len(chunk)))
+            stats["reports"] = render_reports(sites, reports_path, processes)
+        else:
+            for _ in evaluated_chunks():
+                pass
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - start
+    return {"rows": rows, "seconds": elapsed, "rows_per_second": rows / elapsed if elapsed else float("inf"),
+            **stats}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m engine.cli",
+        description="Évaluation AHP et financière en lot de sites candidats (CSV ou Parquet)."
+    )
+    parser.add_argument("input", help="Fichier d'entrée (.csv, .parquet)")
+    parser.add_argument("-o", "--output", required=True, help="Fichier de sortie (.csv, .parquet)")
+    parser.add_argument("--chunksize", type=int, default=50000, help="Lignes par bloc (défaut : 50000)")
+    parser.add_argument("--criteria", default=",".join(BASE_CRITERIA_KEYS),
+                        help="Clés courtes des critères, séparées par des virgules (défaut : c,d,a)")
+    parser.add_argument("--years", type=int, default=HORIZON_YEARS, help="Horizon financier en années")
+    parser.add_argument("--reports", help="Rapports PDF par site : archive .zip ou document fusionné .pdf")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="Processus de rendu des rapports (défaut : rendu local)")
+    parser.add_argument("--no-charts", action="store_true",
+                        help="Rapports sans graphiques (rendu environ trois fois plus rapide)")
+    rates = parser.add_argument_group("hypothèses financières (comme au tableau de bord)")
+    rates.add_argument("--discount-rate", type=float, default=0.0, metavar="%",
+                       help="Taux d'actualisation (%%/an)")
+    rates.add_argument("--inflation", type=float, default=0.0, metavar="%",
+                       help="Inflation (%%/an) : OPEX du forage et remplacements de pompe")
+    rates.add_argument("--tariff-escalation", type=float, default=0.0, metavar="%",
+                       help="Hausse des tarifs CAMWATER (%%/an)")
+    rates.add_argument("--pump-cost", type=float, default=DEFAULT_PROJECTION["pump_cost"], metavar="FCFA",
+                       help="Coût d'un remplacement de pompe")
+    rates.add_argument("--pump-cycle", type=int, default=DEFAULT_PROJECTION["pump_cycle"], metavar="ANS",
+                       help="Cycle de remplacement de la pompe (0 = aucun)")
+    rates.add_argument("--network-share", type=float, default=DEFAULT_PROJECTION["network_share"],
+                       help=f"Part du réseau dans l'OPEX hybride (défaut : {DEFAULT_PROJECTION['network_share']})")
+    args = parser.parse_args(argv)
+
+    projection = {
+        "discount_rate": args.discount_rate / 100,
+        "inflation": args.inflation / 100,
+        "tariff_escalation": args.tariff_escalation / 100,
+        "pump_cost": args.pump_cost,
+        "pump_cycle": args.pump_cycle,
+        "network_share": args.network_share,
+    }
+    stats = run_batch(args.input, args.output, args.chunksize, tuple(args.criteria.split(",")), args.years,
+                      args.reports, args.processes, not args.no_charts, projection)
+    throughput = f"{stats['rows_per_second']:,.0f}".replace(",", " ")
+    print(f"{stats['rows']} sites évalués en {stats['seconds']:.2f} s ({throughput} lignes/s) -> {args.output}")
+    if "reports" in stats:
+        reports = stats["reports"]
+        print(f"{reports['reports']} rapports, {reports['pages']} pages en {reports['seconds']:.2f} s "
+              f"({reports['pages_per_second']:.1f} pages/s) -> {args.reports}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
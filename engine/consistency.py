@@ -0,0 +1,110 @@
+# Diagnostic et correction des matrices incohérentes (CR >= 0.1)
+"""
+Suggestions de correction des jugements AHP.
+
+La contribution de chaque jugement à l'incohérence est mesurée par l'erreur
+de Saaty e_ij = a_ij · w_j / w_i (égale à 1 pour une matrice parfaitement
+cohérente). La correction est une recherche gloutonne : à chaque étape, seuls
+les jugements les plus fautifs sont essayés sur toutes les valeurs de
+l'échelle, et toutes ces variantes sont évaluées en un seul appel à
+compute_weights_batch. Le coût reste donc proportionnel à
+(candidats × valeurs de l'échelle) par étape, quel que soit n.
+"""
+
+import numpy as np
+
+from engine.ahp_logic import AHPEngine, SAATY_SLIDER_SCALE
+
+
+def format_judgment(value):
+    """Affiche un jugement sous forme de fraction de Saaty (ex. 1/5)."""
+    if value < 1:
+        return f"1/{1 / value:.0f}"
+    return f"{value:.0f}"
+
+
+def inconsistency_contributions(matrix, weights):
+    """
+    Classe les jugements du triangle supérieur par contribution à l'incohérence.
+
+    Args:
+        matrix (array): Matrice de comparaison (n, n)
+        weights (array): Poids issus de cette matrice (n,)
+
+    Returns:
+        list: (i, j, |log e_ij|) triés du plus au moins fautif
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    errors = np.abs(np.log(matrix * weights[np.newaxis, :] / weights[:, np.newaxis]))
+    iu = np.triu_indices(matrix.shape[0], 1)
+    order = np.argsort(-errors[iu], kind="stable")
+    return [(int(iu[0][k]), int(iu[1][k]), float(errors[iu][k])) for k in order]
+
+
+def repair_consistency(matrix, scale=SAATY_SLIDER_SCALE, threshold=0.1, engine=None,
+                       candidates=3, max_changes=None):
+    """
+    Propose une matrice cohérente proche, en restant sur l'échelle autorisée.
+
+    Args:
+        matrix (array): Matrice de comparaison incohérente (n, n)
+        scale (sequence): Valeurs autorisées pour un jugement
+        threshold (float): CR visé
+        engine (AHPEngine): Moteur utilisé pour les poids
+        candidates (int): Nombre de jugements les plus fautifs essayés par étape
+        max_changes (int): Nombre maximal de jugements modifiés (tous par défaut)
+
+    Returns:
+        dict: Matrice proposée, poids, CR initial et final, et liste des
+            changements (i, j, ancienne valeur, nouvelle valeur)
+    """
+    engine = engine or AHPEngine(lambda_method="auto")
+    matrix = np.array(matrix, dtype=float)
+    n = matrix.shape[0]
+    scale = np.asarray(scale, dtype=float)
+    max_changes = n * (n - 1) // 2 if max_changes is None else max_changes
+
+    weights, cr = engine.compute_weights(matrix)
+    initial_cr = float(cr)
+    changes = []
+    changed_cells = set()
+
+    while cr >= threshold and len(changes) < max_changes:
+        # Jugements les plus fautifs, sans revenir sur ceux déjà corrigés
+        cells = [(i, j) for i, j, _ in inconsistency_contributions(matrix, weights)
+                 if (i, j) not in changed_cells][:candidates]
+        if not cells:
+            break
+
+        # Toutes les variantes (cellule, valeur de l'échelle) en un seul lot
+        variants = np.repeat(matrix[np.newaxis], len(cells) * len(scale), axis=0)
+        moves = [(i, j, v) for i, j in cells for v in scale]
+        for k, (i, j, v) in enumerate(moves):
+            variants[k, i, j] = v
+            variants[k, j, i] = 1 / v
+        variant_weights, variant_cr = engine.compute_weights_batch(variants)
+
+        # Si une variante passe sous le seuil, retenir la plus proche ; sinon la
+        # plus cohérente (à CR égal, le plus petit déplacement sur l'échelle)
+        shifts = np.array([abs(np.log(v / matrix[i, j])) for i, j, v in moves])
+        below = variant_cr < threshold
+        if below.any():
+            best = int(np.argmin(np.where(below, shifts, np.inf)))
+        else:
+            best = int(np.lexsort((shifts, np.round(variant_cr, 10)))[0])
+        if variant_cr[best] >= cr:
+            break
+
+        i, j, v = moves[best]
+        changes.append({"i": i, "j": j, "old": float(matrix[i, j]), "new": float(v)})
+        changed_cells.add((i, j))
+        matrix = variants[best]
+        weights, cr = variant_weights[best], variant_cr[best]
+
+    return {
+        "matrix": matrix,
+        "weights": weights,
+        "initial_cr": initial_cr,
+        "cr": float(cr),
+        "changes": changes,
+    }
@@ -3,144 +3,216 @@
 Base de données des zones d'étude pour le SIAD Hydraulique.
 """
 
-def get_zone_context(zone_name="Nkolbisson"):
-    """
-    Retourne le contexte spécifique d'une zone d'étude.
-    
-    Args:
-        zone_name (str): Nom de la zone/quartier
-        
-    Returns:
-        dict: Contexte avec critères, performances et coordonnées
-    """
-    
-    # Base de données des zones
-    ZONES_DATABASE = {
-        "Nkolbisson": {
-            "quartier": "Nkolbisson",
-            "ville": "Yaoundé",
-            "secteur": "Yaoundé VII",
-            "description": "Quartier périphérique de Yaoundé avec un relief accidenté et un accès limité au réseau d'eau.",
-            "coordonnees": {
-                "latitude": 3.8712,
-                "longitude": 11.4538,
-                "zoom": 14
-            },
-            
-            # Définition des critères
-            "criteres": {
-                "Coût": {
-                    "definition": "Somme des dépenses d'investissement (CAPEX) et d'exploitation (OPEX).",
-                    "details": "Pour Camwater: Frais de branchement + facturation au m3. Pour le Forage: Coût de réalisation + pompe + électricité."
-                },
-                "Disponibilité": {
-                    "definition": "Capacité du système à fournir de l'eau de manière continue.",
-                    "details": "Mesuré par le nombre d'heures de service par jour et la fréquence des coupures."
-                },
-                "Accessibilité": {
-                    "definition": "Facilité d'obtention de l'eau selon la distance et la configuration du terrain.",
-                    "details": "Distance au réseau existant ou profondeur de la nappe phréatique."
-                }
-            },
+# Catalogue des critères : clé courte (curseurs), clé de performance
+# (performances_par_defaut) et libellé court (graphiques)
+CRITERIA_CATALOG = {
+    "Coût": {"cle": "c", "performance": "cout", "libelle": "Coût"},
+    "Disponibilité": {"cle": "d", "performance": "disponibilite", "libelle": "Dispo"},
+    "Accessibilité": {"cle": "a", "performance": "accessibilite", "libelle": "Accès"},
+    "Qualité de l'eau": {"cle": "q", "performance": "qualite", "libelle": "Qualité"},
+    "Dépendance énergétique": {"cle": "e", "performance": "energie", "libelle": "Énergie"},
+    "Compétences de maintenance": {"cle": "m", "performance": "maintenance", "libelle": "Maint."},
+    "Risque réglementaire": {"cle": "r", "performance": "reglementaire", "libelle": "Régl."},
+}
 
-            # Valeurs par défaut pour cette zone
-            "performances_par_defaut": {
-                "camwater": {
-                    "nom": "Réseau CAMWATER",
-                    "cout": 7,
-                    "disponibilite": 3,
-                    "accessibilite": 4
-                },
-                "forage": {
-                    "nom": "Alimentation Autonome",
-                    "cout": 4,
-                    "disponibilite": 9,
-                    "accessibilite": 8
-                },
-                "hybride": {
-                    "nom": "Système Hybride",
-                    "cout": 3,
-                    "disponibilite": 10,
-                    "accessibilite": 5
-                }
-            }
+# Définitions génériques des critères de base
+CRITERES_PAR_DEFAUT = {
+    "Coût": {
+        "definition": "Investissement et coûts opérationnels.",
+        "details": "À adapter selon le contexte local."
+    },
+    "Disponibilité": {
+        "definition": "Continuité du service d'eau.",
+        "details": "Évaluez la fiabilité du réseau local."
+    },
+    "Accessibilité": {
+        "definition": "Facilité d'accès à l'eau.",
+        "details": "Considérez la topographie et l'infrastructure."
+    }
+}
+
+# Critères optionnels pouvant compléter ceux de la zone
+CRITERES_ADDITIONNELS = {
+    "Qualité de l'eau": {
+        "definition": "Potabilité de l'eau fournie sans traitement complémentaire.",
+        "details": "Turbidité, contamination bactériologique, teneur en fer et nitrates."
+    },
+    "Dépendance énergétique": {
+        "definition": "Sensibilité du système aux coupures et au prix de l'électricité.",
+        "details": "Une note élevée signifie une faible dépendance (pompage solaire, gravitaire)."
+    },
+    "Compétences de maintenance": {
+        "definition": "Disponibilité locale des compétences et des pièces de rechange.",
+        "details": "Une note élevée signifie une maintenance facile à assurer localement."
+    },
+    "Risque réglementaire": {
+        "definition": "Exposition aux autorisations, redevances et contrôles administratifs.",
+        "details": "Une note élevée signifie un risque réglementaire faible."
+    }
+}
+
+# Note par défaut d'une option sur un critère sans valeur dans la zone
+PERFORMANCE_NEUTRE = 5
+
+# Base de données des zones (construite une fois, à l'import ; ne pas modifier)
+ZONES_DATABASE = {
+    "Nkolbisson": {
+        "quartier": "Nkolbisson",
+        "ville": "Yaoundé",
+        "secteur": "Yaoundé VII",
+        "description": "Quartier périphérique de Yaoundé avec un relief accidenté et un accès limité au réseau d'eau.",
+        "coordonnees": {
+            "latitude": 3.8712,
+            "longitude": 11.4538,
+            "zoom": 14
         },
         
-        "Biyem-Assi": {
-            "quartier": "Biyem-Assi",
-            "ville": "Yaoundé",
-            "secteur": "Yaoundé III",
-            "description": "Quartier urbain dense avec un réseau d'eau partiellement développé.",
-            "coordonnees": {
-                "latitude": 3.8589,
-                "longitude": 11.4934,
-                "zoom": 14
+        # Définition des critères
+        "criteres": {
+            "Coût": {
+                "definition": "Somme des dépenses d'investissement (CAPEX) et d'exploitation (OPEX).",
+                "details": "Pour Camwater: Frais de branchement + facturation au m3. Pour le Forage: Coût de réalisation + pompe + électricité."
             },
-            "criteres": { ... },  # Tu peux copier et adapter les critères
-            "performances_par_defaut": {
-                "camwater": {"cout": 6, "disponibilite": 5, "accessibilite": 7},
-                "forage": {"cout": 5, "disponibilite": 8, "accessibilite": 6},
-                "hybride": {"cout": 4, "disponibilite": 9, "accessibilite": 5}
-            }
-        },
-        
-        "Mvog-Betsi": {
-            "quartier": "Mvog-Betsi",
-            "ville": "Yaoundé",
-            "secteur": "Yaoundé I",
-            "description": "Zone résidentielle moyenne avec accès variable au réseau.",
-            "coordonnees": {
-                "latitude": 3.8856,
-                "longitude": 11.5117,
-                "zoom": 14
+            "Disponibilité": {
+                "definition": "Capacité du système à fournir de l'eau de manière continue.",
+                "details": "Mesuré par le nombre d'heures de service par jour et la fréquence des coupures."
             },
-            "criteres": { ... },
-            "performances_par_defaut": {
-                "camwater": {"cout": 5, "disponibilite": 4, "accessibilite": 6},
-                "forage": {"cout": 6, "disponibilite": 9, "accessibilite": 7},
-                "hybride": {"cout": 4, "disponibilite": 8, "accessibilite": 6}
+            "Accessibilité": {
+                "definition": "Facilité d'obtention de l'eau selon la distance et la configuration du terrain.",
+                "details": "Distance au réseau existant ou profondeur de la nappe phréatique."
             }
         },
-        
-        "Autre": {
-            "quartier": "Nouvelle Zone",
-            "ville": "Ville à définir",
-            "secteur": "Secteur à définir",
-            "description": "Zone personnalisée - ajustez les paramètres ci-dessous.",
-            "coordonnees": {
-                "latitude": 3.8667,
-                "longitude": 11.5167,
-                "zoom": 12
+
+        # Valeurs par défaut pour cette zone
+        "performances_par_defaut": {
+            "camwater": {
+                "nom": "Réseau CAMWATER",
+                "cout": 7,
+                "disponibilite": 3,
+                "accessibilite": 4
             },
-            "criteres": {
-                "Coût": {
-                    "definition": "Investissement et coûts opérationnels.",
-                    "details": "À adapter selon le contexte local."
-                },
-                "Disponibilité": {
-                    "definition": "Continuité du service d'eau.",
-                    "details": "Évaluez la fiabilité du réseau local."
-                },
-                "Accessibilité": {
-                    "definition": "Facilité d'accès à l'eau.",
-                    "details": "Considérez la topographie et l'infrastructure."
-                }
+            "forage": {
+                "nom": "Alimentation Autonome",
+                "cout": 4,
+                "disponibilite": 9,
+                "accessibilite": 8
             },
-            "performances_par_defaut": {
-                "camwater": {"cout": 5, "disponibilite": 5, "accessibilite": 5},
-                "forage": {"cout": 5, "disponibilite": 5, "accessibilite": 5},
-                "hybride": {"cout": 5, "disponibilite": 5, "accessibilite": 5}
+            "hybride": {
+                "nom": "Système Hybride",
+                "cout": 3,
+                "disponibilite": 10,
+                "accessibilite": 5
             }
         }
+    },
+    
+    "Biyem-Assi": {
+        "quartier": "Biyem-Assi",
+        "ville": "Yaoundé",
+        "secteur": "Yaoundé III",
+        "description": "Quartier urbain dense avec un réseau d'eau partiellement développé.",
+        "coordonnees": {
+            "latitude": 3.8589,
+            "longitude": 11.4934,
+            "zoom": 14
+        },
+        "criteres": CRITERES_PAR_DEFAUT,
+        "performances_par_defaut": {
+            "camwater": {"cout": 6, "disponibilite": 5, "accessibilite": 7},
+            "forage": {"cout": 5, "disponibilite": 8, "accessibilite": 6},
+            "hybride": {"cout": 4, "disponibilite": 9, "accessibilite": 5}
+        }
+    },
+    
+    "Mvog-Betsi": {
+        "quartier": "Mvog-Betsi",
+        "ville": "Yaoundé",
+        "secteur": "Yaoundé I",
+        "description": "Zone résidentielle moyenne avec accès variable au réseau.",
+        "coordonnees": {
+            "latitude": 3.8856,
+            "longitude": 11.5117,
+            "zoom": 14
+        },
+        "criteres": CRITERES_PAR_DEFAUT,
+        "performances_par_defaut": {
+            "camwater": {"cout": 5, "disponibilite": 4, "accessibilite": 6},
+            "forage": {"cout": 6, "disponibilite": 9, "accessibilite": 7},
+            "hybride": {"cout": 4, "disponibilite": 8, "accessibilite": 6}
+        }
+    },
+    
+    "Autre": {
+        "quartier": "Nouvelle Zone",
+        "ville": "Ville à définir",
+        "secteur": "Secteur à définir",
+        "description": "Zone personnalisée - ajustez les paramètres ci-dessous.",
+        "coordonnees": {
+            "latitude": 3.8667,
+            "longitude": 11.5167,
+            "zoom": 12
+        },
+        "criteres": CRITERES_PAR_DEFAUT,
+        "performances_par_defaut": {
+            "camwater": {"cout": 5, "disponibilite": 5, "accessibilite": 5},
+            "forage": {"cout": 5, "disponibilite": 5, "accessibilite": 5},
+            "hybride": {"cout": 5, "disponibilite": 5, "accessibilite": 5}
+        }
     }
+}
+
+
+def get_zone_context(zone_name="Nkolbisson"):
+    """
+    Retourne le contexte spécifique d'une zone d'étude.
     
+    Args:
+        zone_name (str): Nom de la zone/quartier
+        
+    Returns:
+        dict: Contexte avec critères, performances et coordonnées ; copie
+            propre à l'appelant, qui peut la modifier sans toucher la base
+    """
     # Retourne la zone demandée ou Nkolbisson par défaut
-    return ZONES_DATABASE.get(zone_name, ZONES_DATABASE["Nkolbisson"])
+    return _copy_entry(ZONES_DATABASE.get(zone_name, ZONES_DATABASE["Nkolbisson"]))
+
+
+def _copy_entry(value):
+    """Copie profonde d'une entrée de ZONES_DATABASE (dicts imbriqués de scalaires), sans deepcopy."""
+    return {key: _copy_entry(item) for key, item in value.items()} if isinstance(value, dict) else value
+
+
+def get_zone_criteria(zone_context, extra_criteria=()):
+    """
+    Retourne la liste ordonnée des critères actifs pour une zone.
+
+    Args:
+        zone_context (dict): Contexte retourné par get_zone_context
+        extra_criteria (iterable): Noms de critères de CRITERES_ADDITIONNELS à ajouter
+
+    Returns:
+        list: Un dict par critère avec nom, cle, performance, libelle,
+            definition et details
+    """
+    definitions = dict(zone_context["criteres"])
+    for name in extra_criteria:
+        definitions.setdefault(name, CRITERES_ADDITIONNELS[name])
+
+    criteria = []
+    for name, definition in definitions.items():
+        criteria.append({"nom": name, **CRITERIA_CATALOG[name], **definition})
+    return criteria
+
+
+def get_default_performance(zone_context, option, criterion):
+    """Note par défaut (1-10) d'une option sur un critère, neutre si non renseignée."""
+    performances = zone_context["performances_par_defaut"][option]
+    return performances.get(criterion["performance"], PERFORMANCE_NEUTRE)
 
 
 def get_available_zones():
     """Retourne la liste des zones disponibles"""
-    return ["Nkolbisson", "Biyem-Assi", "Mvog-Betsi", "Autre"]
+    return list(ZONES_DATABASE)
 
 
 def save_custom_zone(zone_data):
@@ -0,0 +1,116 @@
+# Figures Plotly du tableau de bord
+"""
+Figures Plotly du tableau de bord.
+
+Séparées de app.py pour être construites hors de Streamlit (benchmarks,
+scripts) ; le tableau de bord les met en cache (voir build_radar_chart).
+Chaque figure est tracée depuis la spec de engine.charts qui sert aussi au
+SVG du rapport PDF : catégories, couleurs et bornes sont les mêmes.
+"""
+
+import plotly.graph_objects as go
+
+from engine.charts import cost_curves_spec, donut_spec, radar_spec
+
+# Critères et options par défaut du radar
+DEFAULT_CATEGORIES = ['Coût', 'Disponibilité', 'Accessibilité']
+DEFAULT_OPTIONS = ['CAMWATER', 'FORAGE', 'HYBRIDE']
+
+
+def _rgba(color, alpha):
+    """Couleur hexadécimale (#RRGGBB) en rgba() transparente."""
+    r, g, b = (int(color[i:i + 2], 16) for i in (1, 3, 5))
+    return f'rgba({r}, {g}, {b}, {alpha})'
+
+
+def radar_figure(spec):
+    """Radar des performances depuis une spec de radar_spec."""
+    fig = go.Figure()
+    for item in spec["series"]:
+        fig.add_trace(go.Scatterpolar(
+            r=item["values"],
+            theta=spec["categories"],
+            fill='toself',
+            name=item["label"],
+            line_color=item["color"],
+            fillcolor=_rgba(item["color"], 0.2)
+        ))
+
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, spec["max_value"]],
+                tickfont=dict(size=10),
+                gridcolor='lightgray'
+            ),
+            angularaxis=dict(
+                tickfont=dict(size=12),
+                gridcolor='lightgray'
+            ),
+            bgcolor='white'
+        ),
+        showlegend=True,
+        legend=dict(
+            yanchor="top",
+            y=0.99,
+            xanchor="left",
+            x=1.05,
+            bgcolor='rgba(255, 255, 255, 0.8)',
+            bordercolor='gray',
+            borderwidth=1
+        ),
+        title={
+            'text': spec["title"],
+            'y':0.95,
+            'x':0.5,
+            'xanchor': 'center',
+            'yanchor': 'top',
+            'font': dict(size=16, color='#003366')
+        },
+        paper_bgcolor='white',
+        plot_bgcolor='white',
+        height=500,
+        margin=dict(l=80, r=80, t=80, b=80)
+    )
+
+    return fig
+
+
+def donut_figure(spec):
+    """Anneau des poids des critères depuis une spec de donut_spec (secteurs triés par poids)."""
+    return go.Figure(go.Pie(labels=spec["labels"], values=spec["values"], hole=0.5,
+                            marker=dict(colors=spec["colors"]), sort=True, direction='counterclockwise'))
+
+
+def cost_curves_figure(spec):
+    """Courbes de coûts cumulés depuis une spec de cost_curves_spec."""
+    fig = go.Figure()
+    for item in spec["series"]:
+        line = dict(color=item["color"], width=3, dash='dash') if item["dash"] else dict(color=item["color"], width=4)
+        fig.add_trace(go.Scatter(x=spec["years"], y=item["values"], name=item["label"], line=line))
+    fig.update_layout(template="plotly_white", title=spec["title"], xaxis_title="Années", yaxis_title="FCFA")
+    return fig
+
+
+# Figure Plotly de chaque type de graphique (voir engine.charts.RENDERERS pour le SVG)
+FIGURES = {"radar": radar_figure, "donut": donut_figure, "costs": cost_curves_figure}
+
+
+def create_radar_chart(camwater_scores, forage_scores, hybride_scores, categories=None):
+    """
+    Crée un graphique radar pour comparer les performances des options
+    sur les critères actifs (par défaut : Coût, Disponibilité, Accessibilité)
+    """
+    categories = categories or DEFAULT_CATEGORIES
+    return radar_figure(radar_spec(categories, DEFAULT_OPTIONS, [camwater_scores, forage_scores, hybride_scores]))
+
+
+def create_weights_donut(weights, labels):
+    """Anneau des poids des critères"""
+    return donut_figure(donut_spec(labels, weights))
+
+
+def create_cost_curves(years, cumulative, options=DEFAULT_OPTIONS):
+    """Courbes de coûts cumulés des options (la dernière, l'hybride, en pointillés)"""
+    return cost_curves_figure(cost_curves_spec(options, years, cumulative))
@@ -0,0 +1,261 @@
+# Projection financière vectorisée : actualisation, inflation, tarifs, renouvellements
+"""
+Flux de coûts mensuels des options d'approvisionnement et indicateurs
+financiers (VAN des coûts, TRI, délai de récupération).
+
+Tous les paramètres sont des scalaires ou des tableaux diffusables vers la
+forme (..., options) : un appel projette d'un coup des milliers de
+scénarios × options sur n'importe quel horizon (résolution mensuelle).
+Les TRI et délais de récupération sont calculés par rapport à une option
+de référence (par défaut la première, CAMWATER) : le flux incrémental
+d'une option est l'économie qu'elle procure face à la référence.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+def monthly_cash_flows(capex, opex_monthly, months, opex_escalation=0.0, inflation=0.0,
+                       replacement_cost=0.0, replacement_cycle_months=0):
+    """
+    Coûts de chaque mois, du mois 0 (investissement) au mois months inclus.
+
+    Args:
+        capex: Investissement initial, payé au mois 0
+        opex_monthly: Coût d'exploitation mensuel de la première année
+        months (int): Horizon en mois
+        opex_escalation: Hausse annuelle de l'OPEX (ex. hausse des tarifs CAMWATER)
+        inflation: Inflation annuelle appliquée aux renouvellements d'équipement
+        replacement_cost: Coût d'un renouvellement (ex. pompe), aux prix du mois 0
+        replacement_cycle_months: Période des renouvellements en mois (0 = aucun)
+
+    Returns:
+        array: Flux de forme (..., months + 1)
+    """
+    # Chaque paramètre garde sa propre forme : les puissances ne sont calculées
+    # que sur les combinaisons distinctes, la diffusion se fait à la fin
+    capex, opex_monthly, opex_escalation, inflation, replacement_cost, cycle = (
+        np.asarray(v, dtype=float)[..., np.newaxis]
+        for v in (capex, opex_monthly, opex_escalation, inflation,
+                  replacement_cost, replacement_cycle_months)
+    )
+    m = np.arange(months + 1)
+
+    # L'OPEX du mois m appartient à l'année (m - 1) // 12 ; les tarifs changent chaque année
+    year_index = np.maximum(m - 1, 0) // 12
+    escalation = np.where(m > 0, (1 + opex_escalation) ** year_index, 0.0)
+    flows = opex_monthly * escalation + capex * (m == 0)
+
+    # Renouvellements périodiques, revalorisés par l'inflation
+    safe_cycle = np.where(cycle > 0, cycle, 1)
+    due = (cycle > 0) & (m > 0) & (m % safe_cycle == 0)
+    return flows + replacement_cost * np.where(due, (1 + inflation) ** (m / 12), 0.0)
+
+
+def discount_factors(discount_rate, months):
+    """Facteurs d'actualisation mensuels (1 + r)^(-m/12), forme (..., months + 1)."""
+    discount_rate = np.asarray(discount_rate, dtype=float)[..., np.newaxis]
+    return (1 + discount_rate) ** (-np.arange(months + 1) / 12)
+
+
+def internal_rate_of_return(flows, low=-0.05, high=0.2, guess=0.01, iterations=30, tol=1e-10):
+    """
+    TRI annuel de flux mensuels, par méthode de Newton vectorisée et bornée.
+
+    Chaque pas de Newton sortant de l'intervalle [low, high] encore valide
+    est remplacé par une dichotomie, ce qui garantit la convergence.
+
+    Args:
+        flows (array): Flux de forme (..., mois + 1), négatifs puis positifs
+        low, high (float): Bornes du taux mensuel recherché
+        guess (float): Taux mensuel de départ (1 % ≈ 12.7 % par an)
+        iterations (int): Nombre maximal d'itérations
+        tol (float): Tolérance sur le taux mensuel
+
+    Returns:
+        array: TRI annuel (...,), NaN si la VAN ne change pas de signe
+    """
+    flows = np.asarray(flows, dtype=float)
+    m = np.arange(flows.shape[-1], dtype=float)
+
+    def npv_and_derivative(rate):
+        discounted = flows * np.exp(np.multiply.outer(-np.log1p(rate), m))
+        return discounted.sum(axis=-1), -(discounted @ m) / (1 + rate)
+
+    lo = np.full(flows.shape[:-1], low)
+    hi = np.full(flows.shape[:-1], high)
+    npv_lo, _ = npv_and_derivative(lo)
+    npv_hi, _ = npv_and_derivative(hi)
+    valid = np.sign(npv_lo) * np.sign(npv_hi) < 0
+
+    rate = np.full(flows.shape[:-1], float(np.clip(guess, low, high)))
+    for _ in range(iterations):
+        npv, derivative = npv_and_derivative(rate)
+        # Resserre l'intervalle autour de la racine
+        same_sign = np.sign(npv) == np.sign(npv_lo)
+        lo = np.where(same_sign, rate, lo)
+        npv_lo = np.where(same_sign, npv, npv_lo)
+        hi = np.where(same_sign, hi, rate)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = rate - npv / derivative
+        inside = np.isfinite(newton) & (newton >= lo) & (newton <= hi)
+        new_rate = np.where(inside, newton, (lo + hi) / 2)
+        done = np.abs(new_rate - rate) <= tol
+        # Un taux convergé n'est plus déplacé
+        rate = np.where(done, rate, new_rate)
+        if done[valid].all():
+            break
+    return np.where(valid, (1 + rate) ** 12 - 1, np.nan)
+
+
+def _projection_horizon(years, inflation, opex_escalation, replacement_cycle_years):
+    """Horizon, hausse de l'OPEX et cycle de renouvellement en mois."""
+    if opex_escalation is None:
+        opex_escalation = inflation
+    cycle_months = np.round(np.asarray(replacement_cycle_years, dtype=float) * 12)
+    return int(round(years * 12)), opex_escalation, cycle_months
+
+
+def financial_projection(capex, opex_monthly, years=10, discount_rate=0.0, inflation=0.0,
+                         opex_escalation=None, replacement_cost=0.0, replacement_cycle_years=0,
+                         baseline=0):
+    """
+    Projette les coûts de toutes les options et scénarios en un seul appel.
+
+    Args:
+        capex, opex_monthly: Forme (..., options)
+        years (int): Horizon en années (résolution mensuelle)
+        discount_rate: Taux d'actualisation annuel, scalaire ou un par scénario (...,)
+        inflation: Inflation annuelle (renouvellements, et OPEX si
+            opex_escalation n'est pas fourni)
+        opex_escalation: Hausse annuelle de l'OPEX de chaque option
+        replacement_cost, replacement_cycle_years: Renouvellements d'équipement
+        baseline (int): Index de l'option de référence pour le TRI et le
+            délai de récupération
+
+    Returns:
+        dict: Flux mensuels, coûts cumulés (bruts et actualisés), VAN des
+            coûts, TRI et délai de récupération (mois et années) de chaque option
+    """
+    months, opex_escalation, cycle_months = _projection_horizon(years, inflation, opex_escalation,
+                                                                replacement_cycle_years)
+    flows = monthly_cash_flows(capex, opex_monthly, months, opex_escalation, inflation,
+                               replacement_cost, cycle_months)
+    discount_rate = np.asarray(discount_rate, dtype=float)
+    if discount_rate.ndim:
+        # Un taux par scénario : diffusé sur l'axe des options
+        discount_rate = discount_rate[..., np.newaxis]
+    discounted = flows * discount_factors(discount_rate, months)
+    cumulative = flows.cumsum(axis=-1)
+    discounted_cumulative = discounted.cumsum(axis=-1)
+
+    # Économies de chaque option face à la référence
+    savings = discounted_cumulative[..., [baseline], :] - discounted_cumulative
+    recovered = savings >= 0
+    payback_month = np.where(recovered.any(axis=-1), recovered.argmax(axis=-1), np.nan)
+    payback_month[..., baseline] = np.nan
+    # TRI des flux incrémentaux, hors option de référence
+    others = [o for o in range(flows.shape[-2]) if o != baseline]
+    irr = np.full(flows.shape[:-1], np.nan)
+    irr[..., others] = internal_rate_of_return(flows[..., [baseline], :] - flows[..., others, :])
+
+    return {
+        "months": np.arange(months + 1),
+        "flows": flows,
+        "cumulative": cumulative,
+        "discounted_cumulative": discounted_cumulative,
+        "npv": discounted_cumulative[..., -1],
+        "irr": irr,
+        "payback_month": payback_month,
+        "payback_year": payback_month / 12,
+    }
+
+
+def projected_costs(capex, opex_monthly, years=10, discount_rate=0.0, inflation=0.0, opex_escalation=None,
+                    replacement_cost=0.0, replacement_cycle_years=0):
+    """
+    Coûts cumulés à l'horizon et VAN des coûts, sans TRI ni délai de récupération.
+
+    Mêmes flux et mêmes paramètres que financial_projection, pour les lots
+    de milliers de sites où seuls les totaux sont utiles. Les flux étant
+    linéaires en capex, OPEX et coût de renouvellement, leurs coefficients
+    mensuels ne sont calculés qu'une fois par jeu de taux : la mémoire ne
+    dépend pas de l'horizon. Le taux d'actualisation est un scalaire.
+
+    Returns:
+        tuple: Coûts cumulés et VAN des coûts, forme (..., options)
+    """
+    months, opex_escalation, cycle_months = _projection_horizon(years, inflation, opex_escalation,
+                                                                replacement_cycle_years)
+    opex_flows = monthly_cash_flows(0.0, 1.0, months, opex_escalation, inflation, 0.0, cycle_months)
+    replacement_flows = monthly_cash_flows(0.0, 0.0, months, opex_escalation, inflation, 1.0, cycle_months)
+    factors = discount_factors(discount_rate, months)
+    capex, opex_monthly, replacement_cost = (np.asarray(v, dtype=float)
+                                             for v in (capex, opex_monthly, replacement_cost))
+    totals = capex + opex_monthly * opex_flows.sum(axis=-1) + replacement_cost * replacement_flows.sum(axis=-1)
+    npv = capex + opex_monthly * (opex_flows @ factors) + replacement_cost * (replacement_flows @ factors)
+    return totals, npv
+
+
+@dataclass(frozen=True)
+class FinancialResult:
+    """
+    Synthèse financière d'un site, calculée une fois et partagée par le
+    graphique, les indicateurs et le rapport PDF.
+
+    Les séries sont des tableaux numpy indexés par option (ordre de options).
+    """
+    options: tuple              # Noms des options
+    capex: np.ndarray           # Investissement initial (options,)
+    opex_monthly: np.ndarray    # OPEX mensuel de la première année (options,)
+    years: np.ndarray           # Années 0..horizon (années + 1,)
+    cumulative: np.ndarray      # Coûts cumulés en fin d'année (options, années + 1)
+    npv: np.ndarray             # VAN des coûts (options,)
+    irr: np.ndarray             # TRI face à l'option de référence (options,), NaN sinon
+    payback_year: np.ndarray    # Délai de récupération en années (options,), NaN sinon
+
+    @property
+    def horizon(self):
+        return int(self.years[-1])
+
+    @property
+    def totals(self):
+        """Coûts cumulés à l'horizon (options,)."""
+        return self.cumulative[:, -1]
+
+    @property
+    def cheapest(self):
+        """Option dont la VAN des coûts est la plus faible."""
+        return self.options[int(np.argmin(self.npv))]
+
+    def index(self, option):
+        return self.options.index(option)
+
+
+def project_options(options, capex, opex_monthly, years=10, **projection):
+    """
+    Projette un site et résume le résultat en FinancialResult.
+
+    Args:
+        options (sequence): Noms des options, dans l'ordre de capex
+        capex, opex_monthly (sequence): Une valeur par option
+        years (int): Horizon en années
+        **projection: Paramètres supplémentaires de financial_projection
+
+    Returns:
+        FinancialResult: Séries annuelles et indicateurs de chaque option
+    """
+    capex = np.asarray(capex, dtype=float)
+    opex_monthly = np.asarray(opex_monthly, dtype=float)
+    result = financial_projection(capex, opex_monthly, years=years, **projection)
+    return FinancialResult(
+        options=tuple(options),
+        capex=capex,
+        opex_monthly=opex_monthly,
+        years=np.arange(years + 1),
+        cumulative=result["cumulative"][..., ::12],
+        npv=result["npv"],
+        irr=result["irr"],
+        payback_year=result["payback_year"],
+    )
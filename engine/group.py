@@ -0,0 +1,129 @@
+# Décision de groupe : agrégation des jugements de plusieurs experts
+"""
+Agrégation AHP pour un comité (ingénieurs, CAMWATER, riverains...).
+
+Deux approches classiques sont proposées :
+- AIJ (agrégation des jugements individuels) : moyenne géométrique
+  pondérée, élément par élément, des matrices des experts ;
+- AIP (agrégation des priorités individuelles) : moyenne des vecteurs de
+  poids calculés pour chaque expert.
+
+Les experts incohérents (CR >= 0.1) et ceux dont les jugements s'écartent
+du consensus (indice de compatibilité de Saaty) sont signalés.
+"""
+
+import numpy as np
+
+from engine.ahp_logic import AHPEngine
+
+
+def _normalized_expert_weights(k, expert_weights):
+    if expert_weights is None:
+        return np.full(k, 1.0 / k)
+    expert_weights = np.asarray(expert_weights, dtype=float)
+    if expert_weights.shape != (k,):
+        raise ValueError(f"{expert_weights.size} poids d'experts pour {k} matrices")
+    return expert_weights / expert_weights.sum()
+
+
+def aggregate_judgments(matrices, expert_weights=None, engine=None):
+    """
+    Agrège les matrices des experts par moyenne géométrique pondérée (AIJ).
+
+    Args:
+        matrices (array): Matrices des experts, forme (k, n, n)
+        expert_weights (array): Poids de chaque expert (égaux par défaut)
+        engine (AHPEngine): Moteur utilisé pour les poids
+
+    Returns:
+        tuple: matrice de groupe (n, n), poids (n,) et CR de la matrice de groupe
+    """
+    engine = engine or AHPEngine(lambda_method="auto")
+    matrices = np.asarray(matrices, dtype=float)
+    alpha = _normalized_expert_weights(matrices.shape[0], expert_weights)
+    # La moyenne géométrique conserve la réciprocité de la matrice
+    group_matrix = np.exp(np.tensordot(alpha, np.log(matrices), axes=1))
+    weights, cr = engine.compute_weights(group_matrix)
+    return group_matrix, weights, cr
+
+
+def aggregate_priorities(expert_priorities, expert_weights=None, method="geometric"):
+    """
+    Agrège les vecteurs de poids des experts (AIP).
+
+    Args:
+        expert_priorities (array): Poids de chaque expert, forme (k, n)
+        expert_weights (array): Poids de chaque expert (égaux par défaut)
+        method (str): "geometric" (moyenne géométrique pondérée) ou "arithmetic"
+
+    Returns:
+        array: Poids de groupe normalisés (n,)
+    """
+    expert_priorities = np.asarray(expert_priorities, dtype=float)
+    alpha = _normalized_expert_weights(expert_priorities.shape[0], expert_weights)
+    if method == "geometric":
+        group = np.exp(alpha @ np.log(expert_priorities))
+    elif method == "arithmetic":
+        group = alpha @ expert_priorities
+    else:
+        raise ValueError(f"Méthode d'agrégation inconnue : {method}")
+    return group / group.sum()
+
+
+def compatibility_index(matrices, weights):
+    """
+    Indice de compatibilité de Saaty entre chaque matrice et un vecteur de poids.
+
+    S = (1/n²) Σ a_ij · w_j / w_i vaut 1 pour une compatibilité parfaite ;
+    au-delà de 1.1, les jugements sont considérés incompatibles.
+
+    Args:
+        matrices (array): Matrices des experts, forme (k, n, n)
+        weights (array): Poids de référence, forme (n,)
+
+    Returns:
+        array: Indice de chaque expert, forme (k,)
+    """
+    matrices = np.asarray(matrices, dtype=float)
+    n = matrices.shape[-1]
+    ratios = weights[np.newaxis, :] / weights[:, np.newaxis]
+    return (matrices * ratios).sum(axis=(1, 2)) / n ** 2
+
+
+def group_decision(matrices, expert_weights=None, engine=None,
+                   cr_threshold=0.1, compatibility_threshold=1.1):
+    """
+    Agrège un panel d'experts et signale les jugements problématiques.
+
+    Args:
+        matrices (array): Matrices des experts, forme (k, n, n)
+        expert_weights (array): Poids de chaque expert (égaux par défaut)
+        engine (AHPEngine): Moteur utilisé pour les poids
+        cr_threshold (float): Seuil de cohérence individuelle
+        compatibility_threshold (float): Seuil de l'indice de compatibilité
+
+    Returns:
+        dict: Résultats AIJ et AIP, poids et CR de chaque expert, indices de
+            compatibilité et indices des experts incohérents ou atypiques
+    """
+    engine = engine or AHPEngine(lambda_method="auto")
+    matrices = np.asarray(matrices, dtype=float)
+    if matrices.ndim != 3:
+        raise ValueError("Les matrices doivent être de forme (k, n, n)")
+
+    expert_priorities, expert_cr = engine.compute_weights_batch(matrices)
+    group_matrix, aij_weights, aij_cr = aggregate_judgments(matrices, expert_weights, engine)
+    aip_weights = aggregate_priorities(expert_priorities, expert_weights)
+    compatibility = compatibility_index(matrices, aij_weights)
+
+    return {
+        "group_matrix": group_matrix,
+        "aij_weights": aij_weights,
+        "aij_cr": float(aij_cr),
+        "aip_weights": aip_weights,
+        "expert_weights": expert_priorities,
+        "expert_cr": expert_cr,
+        "compatibility": compatibility,
+        "inconsistent": np.flatnonzero(expert_cr >= cr_threshold),
+        "outliers": np.flatnonzero(compatibility > compatibility_threshold),
+    }
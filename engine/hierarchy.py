@@ -0,0 +1,157 @@
+# AHP hiérarchique : critères, sous-critères et agrégation des priorités globales
+"""
+Modèle d'arbre de critères pour l'AHP multi-niveaux.
+
+Chaque nœud interne porte la matrice de comparaison de ses enfants. Les poids
+locaux sont calculés par AHPEngine (en lot, par taille de matrice), puis les
+priorités globales des feuilles sont obtenues par produits matriciels niveau
+par niveau. L'évaluation des alternatives se réduit ensuite à un seul produit.
+"""
+
+import numpy as np
+
+from engine.ahp_logic import AHPEngine, reciprocal_matrix
+
+
+class HierarchyNode:
+    def __init__(self, name, children=None, judgments=None):
+        """
+        Args:
+            name (str): Nom du critère ou sous-critère
+            children (list): Nœuds enfants (aucun pour une feuille)
+            judgments: Matrice de comparaison des enfants (n×n) ou jugements
+                du triangle supérieur lus ligne par ligne ; None = poids égaux
+        """
+        self.name = name
+        self.children = list(children or [])
+        self.judgments = judgments
+
+    @property
+    def is_leaf(self):
+        return not self.children
+
+    def comparison_matrix(self):
+        """Retourne la matrice de comparaison des enfants."""
+        n = len(self.children)
+        if self.judgments is None:
+            return np.ones((n, n))
+        judgments = np.asarray(self.judgments, dtype=float)
+        if judgments.ndim == 2:
+            matrix = judgments
+        else:
+            matrix = reciprocal_matrix(judgments) if judgments.size else np.ones((1, 1))
+        if matrix.shape != (n, n):
+            raise ValueError(f"Le nœud '{self.name}' a {n} enfants mais une matrice {matrix.shape}")
+        return matrix
+
+
+class AHPHierarchy:
+    """
+    Arbre AHP compilé : poids locaux, priorités globales des feuilles et CR.
+
+    Exemple :
+        root = HierarchyNode("Objectif", [
+            HierarchyNode("Coût", [HierarchyNode("CAPEX"), HierarchyNode("OPEX")], [3]),
+            HierarchyNode("Disponibilité"),
+        ], [1/5])
+        hierarchy = AHPHierarchy(root)
+        scores = hierarchy.evaluate(performances)  # (alternatives, feuilles)
+
+    Les noms des nœuds doivent être uniques dans l'arbre : ils indexent
+    self.consistency et leaf_weights().
+    """
+
+    def __init__(self, root, engine=None):
+        self._check_unique_names(root)
+        self.root = root
+        self.engine = engine or AHPEngine()
+        self.local_weights = {}
+        self.consistency = {}
+        self._compute_local_weights()
+        self.leaves, self.global_weights = self._aggregate()
+
+    @staticmethod
+    def _check_unique_names(root):
+        """Refuse un arbre dont deux nœuds portent le même nom."""
+        seen, duplicates, stack = set(), set(), [root]
+        while stack:
+            node = stack.pop()
+            if node.name in seen:
+                duplicates.add(node.name)
+            seen.add(node.name)
+            stack.extend(node.children)
+        if duplicates:
+            raise ValueError(f"Noms de nœuds en double dans la hiérarchie : {', '.join(sorted(map(str, duplicates)))}")
+
+    def _internal_nodes(self):
+        nodes, stack = [], [self.root]
+        while stack:
+            node = stack.pop()
+            if not node.is_leaf:
+                nodes.append(node)
+                stack.extend(node.children)
+        return nodes
+
+    def _compute_local_weights(self):
+        """Calcule les poids locaux de tous les nœuds, un appel en lot par taille."""
+        by_size = {}
+        for node in self._internal_nodes():
+            by_size.setdefault(len(node.children), []).append(node)
+        for nodes in by_size.values():
+            matrices = np.stack([node.comparison_matrix() for node in nodes])
+            weights, cr = self.engine.compute_weights_batch(matrices)
+            for node, w, c in zip(nodes, weights, cr):
+                self.local_weights[id(node)] = w
+                self.consistency[node.name] = float(c)
+
+    def _aggregate(self):
+        """
+        Propage les priorités de la racine vers les feuilles.
+
+        À chaque niveau, une matrice de transition (nœuds du niveau suivant ×
+        nœuds du niveau courant) porte les poids locaux ; une feuille atteinte
+        avant le dernier niveau est recopiée telle quelle (poids 1).
+        """
+        level = [self.root]
+        priorities = np.ones(1)
+        while any(not node.is_leaf for node in level):
+            next_level, rows, cols, values = [], [], [], []
+            for j, node in enumerate(level):
+                if node.is_leaf:
+                    children, weights = [node], [1.0]
+                else:
+                    children, weights = node.children, self.local_weights[id(node)]
+                for child, w in zip(children, weights):
+                    rows.append(len(next_level))
+                    cols.append(j)
+                    values.append(w)
+                    next_level.append(child)
+            transition = np.zeros((len(next_level), len(level)))
+            transition[rows, cols] = values
+            priorities = transition @ priorities
+            level = next_level
+        return [node.name for node in level], priorities
+
+    def leaf_weights(self):
+        """Retourne les priorités globales des feuilles sous forme de dict."""
+        return {name: float(w) for name, w in zip(self.leaves, self.global_weights)}
+
+    def evaluate(self, performances):
+        """
+        Calcule les scores globaux des alternatives.
+
+        Args:
+            performances (array): Notes des alternatives sur les feuilles, de
+                forme (..., nombre de feuilles), dans l'ordre de self.leaves
+
+        Returns:
+            array: Scores de forme (...,)
+        """
+        performances = np.asarray(performances, dtype=float)
+        if performances.shape[-1] != len(self.leaves):
+            raise ValueError(f"{performances.shape[-1]} notes pour {len(self.leaves)} feuilles")
+        return performances @ self.global_weights
+
+    def is_consistent(self, threshold=0.1):
+        """Vrai si tous les nœuds ont un CR inférieur au seuil."""
+        return all(cr < threshold for cr in self.consistency.values())
@@ -0,0 +1,163 @@
+# Instrumentation des reruns du tableau de bord : durées et mémoire par étape, percentiles glissants
+"""
+Instrumentation des reruns du tableau de bord.
+
+Chaque rerun (complet ou partiel) d'une session est un RerunProfile : ses
+étapes (fragments, calcul des poids, radar, carte, tableau, projection,
+PDF...) sont chronométrées, avec la variation de la mémoire résidente du
+processus. Les profils terminés alimentent une Instrumentation partagée
+par le processus : fenêtre glissante par étape (p50/p90/p99, toutes
+sessions confondues), derniers reruns, export JSON et journal JSON Lines.
+
+La mémoire est lue dans /proc/self/statm : quelques microsecondes par
+lecture, là où tracemalloc ralentit le rendu du tableau de bord d'un
+facteur 3 à 4 et fausserait les durées mesurées. C'est la mémoire du
+processus entier (toutes sessions) ; sans /proc (Windows, macOS), les
+variations valent None.
+
+Le module n'importe pas Streamlit.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 90, 99)
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = None
+
+
+def resident_memory():
+    """Mémoire résidente du processus en octets (None si /proc n'est pas disponible)."""
+    if _PAGE_SIZE is None:
+        return None
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            return int(statm.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        return None
+
+
+class RerunProfile:
+    """
+    Étapes chronométrées d'un rerun d'une session.
+
+    Les étapes peuvent s'imbriquer (fragment > calcul) : elles sont notées
+    dans l'ordre d'entrée avec leur profondeur.
+
+    Usage :
+        profile = RerunProfile("a1b2c3", scope=("finance", "export"))
+        with profile.stage("project_options"):
+            finance = project_options(...)
+    """
+
+    def __init__(self, session, scope=None):
+        self.session = session
+        self.scope = scope
+        self.started_at = time.time()
+        self.stages = []
+        self._depth = 0
+
+    def __repr__(self):
+        return f"RerunProfile({self.session}, {len(self.stages)} étapes)"
+
+    @contextmanager
+    def stage(self, name):
+        """Chronomètre une étape (durée en ms, variation de mémoire en Kio)."""
+        entry = {"stage": name, "depth": self._depth}
+        self.stages.append(entry)
+        self._depth += 1
+        memory = resident_memory()
+        start = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            entry["ms"] = (time.perf_counter() - start) * 1e3
+            after = resident_memory()
+            entry["memory_kib"] = None if memory is None or after is None else (after - memory) / 1024
+            self._depth -= 1
+
+    def as_dict(self):
+        """Rerun sérialisable en JSON (durée totale : étapes de premier niveau)."""
+        return {
+            "time": datetime.fromtimestamp(self.started_at).isoformat(timespec="milliseconds"),
+            "session": self.session,
+            "scope": list(self.scope) if self.scope is not None else "complet",
+            "ms": sum(stage["ms"] for stage in self.stages if stage["depth"] == 0 and "ms" in stage),
+            "stages": [stage for stage in self.stages if "ms" in stage],
+        }
+
+
+class Instrumentation:
+    """
+    Mesures d'un processus, partagées par ses sessions (thread-safe).
+
+    Args:
+        window (int): Nombre de mesures conservées par étape pour les percentiles
+        history (int): Nombre de reruns conservés pour l'export
+        log_path (str): Journal JSON Lines (un rerun par ligne), optionnel
+    """
+
+    def __init__(self, window=1000, history=200, log_path=None):
+        self.window = window
+        self.log_path = log_path
+        self.reruns = deque(maxlen=history)
+        self._durations = defaultdict(lambda: deque(maxlen=window))
+        self._memory = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"Instrumentation({len(self._durations)} étapes, {len(self.reruns)} reruns)"
+
+    def record(self, profile):
+        """Ajoute un rerun terminé aux fenêtres glissantes et au journal ; renvoie son dict."""
+        record = profile.as_dict()
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            for stage in record["stages"]:
+                self._durations[stage["stage"]].append(stage["ms"])
+                if stage["memory_kib"] is not None:
+                    self._memory[stage["stage"]].append(stage["memory_kib"])
+            self.reruns.append(record)
+            if self.log_path:
+                with open(self.log_path, "a", encoding="utf-8") as log:
+                    log.write(line + "\n")
+        logger.debug(line)
+        return record
+
+    def percentiles(self):
+        """
+        Percentiles glissants par étape, toutes sessions confondues.
+
+        Returns:
+            dict: Par étape, nombre de mesures, p50/p90/p99 (ms) et plus forte
+                  variation de mémoire (Kio, None sans /proc)
+        """
+        with self._lock:
+            durations = {name: np.array(values) for name, values in self._durations.items()}
+            memory = {name: max(values) for name, values in self._memory.items() if values}
+        stats = {}
+        for name, values in durations.items():
+            stats[name] = {"n": len(values),
+                           **{f"p{q}": float(p) for q, p in zip(PERCENTILES, np.percentile(values, PERCENTILES))},
+                           "memory_kib_max": memory.get(name)}
+        return stats
+
+    def export(self):
+        """Percentiles et derniers reruns, sérialisables en JSON."""
+        with self._lock:
+            reruns = list(self.reruns)
+        return {"window": self.window, "sessions": len({r["session"] for r in reruns}),
+                "percentiles": self.percentiles(), "reruns": reruns}
@@ -0,0 +1,239 @@
+# Préparation des photos de terrain avant leur insertion dans le rapport PDF
+"""
+Photos de terrain ramenées à la résolution d'impression.
+
+Une photo de téléphone (4 à 12 Mo, 4000 px de large) est insérée dans le
+rapport sur 170 mm de large : au-delà de ~200 ppp, les pixels
+supplémentaires n'alourdissent que le PDF. Chaque photo est donc :
+- orientée d'après son EXIF, puis débarrassée de ses métadonnées (EXIF,
+  GPS du téléphone, profils) ;
+- réduite à la largeur d'impression (jamais agrandie) ;
+- recompressée en JPEG à la qualité choisie.
+
+Le même décodage produit aussi la vignette de la galerie du tableau de
+bord. L'image décodée et la vignette sont mises en cache par empreinte du
+contenu, la version d'impression par empreinte et qualité JPEG (LRU bornés
+en octets) : une même photo n'est décodée qu'une fois, quels que soient le
+nombre de reruns, de rapports générés ou de qualités essayées.
+process_many() traite un lot de photos dans un pool de threads (Pillow
+libère le GIL pendant le décodage, le redimensionnement et l'encodage).
+"""
+
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageOps
+
+# Largeur des photos dans le rapport (mm) et résolution d'impression visée
+PRINT_WIDTH_MM = 170
+PRINT_DPI = 200
+JPEG_QUALITY = 85
+
+# Vignettes de la galerie (plus grand côté, en pixels)
+THUMBNAIL_PX = 320
+THUMBNAIL_QUALITY = 80
+
+# Versions d'une photo : empreinte, vignette et version d'impression (JPEG)
+ProcessedPhoto = namedtuple("ProcessedPhoto", ["digest", "thumbnail", "print_jpeg"])
+
+
+def photo_digest(data):
+    """Empreinte du contenu d'une photo (clé de cache)."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def print_width_px(width_mm=PRINT_WIDTH_MM, dpi=PRINT_DPI):
+    """Largeur en pixels nécessaire pour imprimer width_mm à dpi."""
+    return round(width_mm / 25.4 * dpi)
+
+
+def _print_image(data, width_px):
+    """Image RGB orientée, réduite à width_px de large (jamais agrandie)."""
+    with Image.open(io.BytesIO(data)) as image:
+        # JPEG : décodage direct à une échelle réduite (1/2, 1/4, 1/8), sans
+        # descendre sous la largeur visée quelle que soit l'orientation
+        image.draft("RGB", (width_px, width_px))
+        image = ImageOps.exif_transpose(image)
+        if image.width > width_px:
+            height = max(1, round(image.height * width_px / image.width))
+            image = image.resize((width_px, height), Image.LANCZOS, reducing_gap=3.0)
+        if image.mode in ("RGBA", "LA", "P"):
+            # Transparence aplatie sur fond blanc (le JPEG n'a pas de canal alpha)
+            image = image.convert("RGBA")
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+        elif image.mode != "RGB":
+            image = image.convert("RGB")
+        return image
+
+
+def _encode_jpeg(image, quality):
+    # Aucune métadonnée n'est recopiée : ni EXIF, ni profil ICC
+    out = io.BytesIO()
+    image.save(out, format="JPEG", quality=quality, optimize=True)
+    return out.getvalue()
+
+
+def prepare_photo(data, width_px=None, quality=JPEG_QUALITY):
+    """
+    Oriente, nettoie, réduit et recompresse une photo.
+
+    Args:
+        data (bytes): Contenu du fichier (JPEG, PNG...)
+        width_px (int): Largeur maximale (par défaut celle de l'impression)
+        quality (int): Qualité JPEG (1-95)
+
+    Returns:
+        bytes: Photo JPEG sans métadonnées
+    """
+    return _encode_jpeg(_print_image(data, width_px or print_width_px()), quality)
+
+
+def _thumbnail_jpeg(image, thumbnail_px):
+    # Copie : l'image décodée reste en cache pour les versions d'impression
+    thumbnail = image.copy()
+    thumbnail.thumbnail((thumbnail_px, thumbnail_px), Image.BILINEAR)
+    return _encode_jpeg(thumbnail, THUMBNAIL_QUALITY)
+
+
+def process_photo(data, width_px=None, quality=JPEG_QUALITY, thumbnail_px=THUMBNAIL_PX, digest=None):
+    """
+    Décode une photo une seule fois et en tire la vignette et la version d'impression.
+
+    Returns:
+        ProcessedPhoto: Empreinte, vignette JPEG et version d'impression JPEG
+    """
+    image = _print_image(data, width_px or print_width_px())
+    return ProcessedPhoto(digest or photo_digest(data), _thumbnail_jpeg(image, thumbnail_px),
+                          _encode_jpeg(image, quality))
+
+
+class _ByteLRU(OrderedDict):
+    """Cache LRU borné en octets (l'appelant le protège par un verrou)."""
+
+    def __init__(self, max_bytes):
+        super().__init__()
+        self.max_bytes = max_bytes
+        self.bytes = 0
+
+    def get(self, key):
+        entry = super().get(key)
+        if entry is None:
+            return None
+        self.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value, size):
+        if key not in self:
+            self[key] = (value, size)
+            self.bytes += size
+        # Au moins une entrée est gardée, même plus grosse que le budget
+        while self.bytes > self.max_bytes and len(self) > 1:
+            _, (_, evicted) = self.popitem(last=False)
+            self.bytes -= evicted
+
+
+class PhotoPipeline:
+    """
+    Vignettes et photos prêtes à imprimer, partagées par le processus et
+    utilisables depuis plusieurs threads.
+
+    Deux caches LRU bornés en octets : l'image décodée (réduite à la
+    largeur d'impression) et la vignette, indexées par empreinte du contenu ;
+    les versions d'impression, indexées par empreinte et qualité JPEG.
+    Changer de qualité ne fait que réencoder les images déjà décodées.
+
+    Usage :
+        pipeline = PhotoPipeline()
+        photos = pipeline.process_many([f.getvalue() for f in uploaded_files])
+        jpeg = pipeline.process(uploaded_file.getvalue(), quality=70)
+    """
+
+    def __init__(self, width_mm=PRINT_WIDTH_MM, dpi=PRINT_DPI, quality=JPEG_QUALITY,
+                 thumbnail_px=THUMBNAIL_PX, max_bytes=64 * 2**20, max_image_bytes=128 * 2**20, workers=None):
+        self.width_px = print_width_px(width_mm, dpi)
+        self.quality = quality
+        self.thumbnail_px = thumbnail_px
+        self.workers = workers or os.cpu_count() or 1
+        self.hits = 0
+        self.misses = 0
+        self.decodes = 0
+        self._images = _ByteLRU(max_image_bytes)
+        self._encoded = _ByteLRU(max_bytes)
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"PhotoPipeline(width_px={self.width_px}, quality={self.quality})"
+
+    def _image(self, data, digest):
+        """Image décodée et réduite (RGB), décodée au premier appel pour ce contenu."""
+        with self._lock:
+            image = self._images.get(digest)
+        if image is None:
+            # Décodage hors verrou : les photos d'un lot sont traitées en parallèle
+            image = _print_image(data, self.width_px)
+            image.load()
+            with self._lock:
+                self.decodes += 1
+                self._images.put(digest, image, image.width * image.height * len(image.getbands()))
+        return image
+
+    def _encoded_version(self, key, data, digest, encode):
+        with self._lock:
+            version = self._encoded.get(key)
+            if version is not None:
+                self.hits += 1
+                return version
+            self.misses += 1
+        version = encode(self._image(data, digest))
+        with self._lock:
+            self._encoded.put(key, version, len(version))
+        return version
+
+    def _thumbnail(self, data, digest):
+        return self._encoded_version(digest, data, digest, lambda image: _thumbnail_jpeg(image, self.thumbnail_px))
+
+    def _print(self, data, digest, quality=None):
+        quality = quality or self.quality
+        return self._encoded_version((digest, quality), data, digest, lambda image: _encode_jpeg(image, quality))
+
+    def _get(self, data, quality=None):
+        digest = photo_digest(data)
+        return ProcessedPhoto(digest, self._thumbnail(data, digest), self._print(data, digest, quality))
+
+    def process(self, data, quality=None):
+        """Photo préparée pour l'impression (bytes JPEG), à la qualité du pipeline par défaut."""
+        return self._print(data, photo_digest(data), quality)
+
+    def thumbnail(self, data):
+        """Vignette de la galerie (bytes JPEG), indépendante de la qualité d'impression."""
+        return self._thumbnail(data, photo_digest(data))
+
+    def process_many(self, photos, quality=None):
+        """
+        Traite un lot de photos dans un pool de threads.
+
+        Args:
+            photos (list): Contenus des fichiers (bytes)
+            quality (int): Qualité JPEG des versions d'impression (par défaut celle du pipeline)
+
+        Returns:
+            list: ProcessedPhoto dans l'ordre des entrées
+        """
+        if len(photos) <= 1 or self.workers <= 1:
+            return [self._get(data, quality) for data in photos]
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(photos))) as pool:
+            return list(pool.map(lambda data: self._get(data, quality), photos))
+
+    @property
+    def stats(self):
+        """Compteurs de succès/échecs et de décodages, tailles courantes des caches (entrées et octets)."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "decodes": self.decodes,
+                    "size": len(self._encoded), "bytes": self._encoded.bytes,
+                    "images": len(self._images), "image_bytes": self._images.bytes}
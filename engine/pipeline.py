@@ -0,0 +1,179 @@
+# Chaîne de décision réutilisable : scores AHP, verdict et coûts cumulés
+"""
+Logique de décision du tableau de bord, utilisable hors de Streamlit.
+
+Les mêmes fonctions servent au tableau de bord (un site à la fois) et à
+l'évaluation en lot (evaluate_sites), qui traite des milliers de sites par
+bloc vectorisé. Les coûts des options suivent la même projection mensuelle
+(engine.finance) au tableau de bord, dans les rapports PDF et en lot.
+"""
+
+import numpy as np
+
+from engine.ahp_logic import AHPEngine, reciprocal_matrices
+from engine.finance import projected_costs
+
+# Options comparées : clé de zone, préfixe des curseurs, suffixe des libellés, nom affiché
+OPTIONS = [
+    ("camwater", "cw", "CW", "CAMWATER"),
+    ("forage", "f", "F", "FORAGE"),
+    ("hybride", "h", "H", "HYBRIDE"),
+]
+
+# Clés courtes des critères de base, dans l'ordre des curseurs
+BASE_CRITERIA_KEYS = ("c", "d", "a")
+
+# Paramètres financiers par défaut (FCFA)
+DEFAULT_FINANCE = {
+    "capex_cw": 150000,
+    "opex_cw": 15000,
+    "capex_f": 2500000,
+    "opex_f": 5000,
+}
+
+# Part de l'OPEX de l'option hybride servie par le réseau (le reste par le forage)
+HYBRID_NETWORK_SHARE = 0.4
+
+# Horizon de la projection financière (années)
+HORIZON_YEARS = 10
+
+# Hypothèses de la projection par défaut (part, taux annuels, FCFA, années) :
+# aucune actualisation, inflation, hausse de tarif ni remplacement de pompe
+DEFAULT_PROJECTION = {
+    "network_share": HYBRID_NETWORK_SHARE,
+    "discount_rate": 0.0,
+    "inflation": 0.0,
+    "tariff_escalation": 0.0,
+    "pump_cost": 0.0,
+    "pump_cycle": 0,
+}
+
+
+def comparison_keys(criteria_keys=BASE_CRITERIA_KEYS):
+    """Noms des curseurs de comparaison, lus ligne par ligne (c_vs_d, c_vs_a, d_vs_a)."""
+    return [f"{a}_vs_{b}" for i, a in enumerate(criteria_keys) for b in criteria_keys[i + 1:]]
+
+
+def performance_keys(criteria_keys=BASE_CRITERIA_KEYS):
+    """Noms des curseurs de performance, option par option (cw_c, cw_d, ..., h_a)."""
+    return [[f"{prefix}_{key}" for key in criteria_keys] for _, prefix, _, _ in OPTIONS]
+
+
+def score_options(weights, performances):
+    """
+    Scores pondérés des options, entre 0 et 1.
+
+    Args:
+        weights (array): Poids des critères, forme (..., critères)
+        performances (array): Notes 1-10, forme (..., options, critères)
+
+    Returns:
+        array: Scores de forme (..., options)
+    """
+    weights = np.asarray(weights, dtype=float)
+    performances = np.asarray(performances, dtype=float)
+    return np.einsum("...oc,...c->...o", performances, weights) / 10
+
+
+def recommend(scores):
+    """Nom de l'option la mieux notée (tableau de noms pour un lot de scores)."""
+    labels = np.array([label for *_, label in OPTIONS])
+    best = labels[np.argmax(scores, axis=-1)]
+    return str(best) if best.ndim == 0 else best
+
+
+def hybrid_costs(capex_cw, opex_cw, capex_f, opex_f, network_share=HYBRID_NETWORK_SHARE):
+    """
+    CAPEX et OPEX de l'option hybride : somme des installations, OPEX partagé.
+
+    Args:
+        network_share (float): Part de la consommation servie par le réseau
+            (le reste par le forage)
+    """
+    capex_h = capex_cw + capex_f
+    opex_h = opex_cw * network_share + opex_f * (1 - network_share)
+    return capex_h, opex_h
+
+
+def option_projection(capex_cw, opex_cw, capex_f, opex_f, network_share=HYBRID_NETWORK_SHARE, discount_rate=0.0,
+                      inflation=0.0, tariff_escalation=0.0, pump_cost=0.0, pump_cycle=0):
+    """
+    Entrées de la projection financière des options, dans l'ordre de OPTIONS.
+
+    L'OPEX CAMWATER suit la hausse des tarifs, celui du forage l'inflation et
+    celui de l'hybride les deux au prorata de sa part réseau ; la pompe du
+    forage et de l'hybride est remplacée tous les pump_cycle ans.
+
+    Args:
+        capex_cw, opex_cw, capex_f, opex_f: Scalaires ou tableaux (sites,)
+        discount_rate, inflation, tariff_escalation: Taux annuels (0.05 = 5 %)
+
+    Returns:
+        tuple: capex et OPEX mensuel de forme (..., options), et paramètres
+            de engine.finance.project_options / financial_projection
+    """
+    capex_h, opex_h = hybrid_costs(capex_cw, opex_cw, capex_f, opex_f, network_share)
+    capex = np.stack(np.broadcast_arrays(capex_cw, capex_f, capex_h), axis=-1).astype(float)
+    opex = np.stack(np.broadcast_arrays(opex_cw, opex_f, opex_h), axis=-1).astype(float)
+    return capex, opex, {
+        "discount_rate": discount_rate,
+        "inflation": inflation,
+        "opex_escalation": [tariff_escalation, inflation,
+                            network_share * tariff_escalation + (1 - network_share) * inflation],
+        "replacement_cost": [0, pump_cost, pump_cost],
+        "replacement_cycle_years": [0, pump_cycle, pump_cycle],
+    }
+
+
+def evaluate_sites(frame, criteria_keys=BASE_CRITERIA_KEYS, years=HORIZON_YEARS, engine=None, **projection):
+    """
+    Évalue un bloc de sites : poids AHP, scores, verdict et coûts projetés.
+
+    Args:
+        frame (DataFrame): Une ligne par site avec les jugements (c_vs_d, ...)
+            et les notes (cw_c, ...) ; les colonnes financières absentes
+            prennent les valeurs de DEFAULT_FINANCE, les jugements absents 1
+        criteria_keys (sequence): Clés courtes des critères
+        years (int): Horizon de la projection financière
+        engine (AHPEngine): Moteur utilisé pour les poids
+        **projection: Hypothèses de DEFAULT_PROJECTION, communes à tous les sites
+
+    Returns:
+        DataFrame: Les colonnes d'entrée suivies des résultats ; total_* est
+            le coût cumulé à l'horizon et van_* la VAN des coûts, qui désigne
+            l'option économique comme au tableau de bord
+    """
+    engine = engine or AHPEngine(lambda_method="auto")
+    k = len(frame)
+
+    judgments = np.column_stack([
+        frame[key].to_numpy(dtype=float) if key in frame else np.ones(k)
+        for key in comparison_keys(criteria_keys)
+    ]) if len(criteria_keys) > 1 else np.empty((k, 0))
+    weights, cr = engine.compute_weights_batch(reciprocal_matrices(judgments))
+
+    missing = [key for keys in performance_keys(criteria_keys) for key in keys if key not in frame]
+    if missing:
+        raise KeyError(f"Colonnes de performance manquantes : {', '.join(missing)}")
+    performances = np.stack([frame[keys].to_numpy(dtype=float) for keys in performance_keys(criteria_keys)],
+                            axis=1)
+    scores = score_options(weights, performances)
+
+    finance = {key: frame[key].to_numpy(dtype=float) if key in frame else np.full(k, float(default))
+               for key, default in DEFAULT_FINANCE.items()}
+    capex, opex, params = option_projection(**finance, **{**DEFAULT_PROJECTION, **projection})
+    totals, npv = projected_costs(capex, opex, years, **params)
+
+    result = frame.copy()
+    for j, key in enumerate(criteria_keys):
+        result[f"poids_{key}"] = weights[:, j]
+    result["cr"] = cr
+    for j, (_, prefix, _, _) in enumerate(OPTIONS):
+        result[f"score_{prefix}"] = scores[:, j]
+    result["recommandation"] = recommend(scores)
+    for j, (_, prefix, _, _) in enumerate(OPTIONS):
+        result[f"total_{prefix}"] = totals[:, j]
+    for j, (_, prefix, _, _) in enumerate(OPTIONS):
+        result[f"van_{prefix}"] = npv[:, j]
+    result["option_economique"] = np.array([label for *_, label in OPTIONS])[npv.argmin(axis=1)]
+    return result
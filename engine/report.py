@@ -0,0 +1,429 @@
+# Rapport PDF d'un site (3 options), utilisable hors de Streamlit
+"""
+Rapport PDF complet d'un site : contexte, analyse AHP, comparaison des
+options, synthèse financière, recommandation et photos.
+
+build_report() renvoie le document FPDF (nombre de pages, fusion...),
+generate_pdf() ses octets. Le module n'importe pas Streamlit : il sert au
+tableau de bord comme aux rapports en lot (engine.report_batch).
+
+Les rapports sont construits sur le gabarit du processus
+(get_report_template) : les textes fixes ne sont mesurés et mis en page
+qu'une fois. Les graphiques (radar, poids, coûts cumulés) sont des SVG
+rendus par engine.charts, insérés comme dessins vectoriels.
+"""
+
+import io
+import logging
+import re
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+from fpdf.enums import XPos, YPos
+
+from engine.report_template import ReportTemplate
+
+logger = logging.getLogger(__name__)
+
+# Justification de chaque recommandation
+JUSTIFICATIONS = {
+    "CAMWATER": "Cette option offre le meilleur compromis coût/performance pour les zones proches du réseau existant avec une demande modérée.",
+    "FORAGE": "Recommandé pour assurer une autonomie complète et une disponibilité permanente, malgré l'investissement initial plus élevé.",
+    "HYBRIDE": "Solution optimale combinant la fiabilité du forage avec la flexibilité du réseau, idéale pour les besoins élevés et variables.",
+}
+
+ADVANTAGES = {
+    "CAMWATER": ["- Coût initial réduit", "- Maintenance externalisée", "- Pas de gestion d'infrastructure"],
+    "FORAGE": ["- Indépendance totale", "- Disponibilité 24h/24", "- Coût à long terme maîtrisé"],
+    "HYBRIDE": ["- Redondance et sécurité", "- Flexibilité d'approvisionnement", "- Optimisation des coûts"]
+}
+
+
+# Largeur des graphiques dans le rapport (mm)
+CHART_WIDTH_MM = 170
+
+
+@lru_cache(maxsize=None)
+def get_report_template():
+    """Gabarit partagé par tous les rapports du processus, justifications déjà mises en page."""
+    template = ReportTemplate()
+    template.prepare(("Helvetica", "", 11, 0, 6, text) for text in JUSTIFICATIONS.values())
+    return template
+
+
+def _draw_chart(pdf, chart, width=CHART_WIDTH_MM):
+    """
+    Insère un graphique SVG (bytes, ou rendu en cours avec .result()) sur la
+    largeur du corps de page. Renvoie False si le graphique est indisponible.
+    """
+    try:
+        svg = chart.result() if hasattr(chart, "result") else chart
+    except Exception:
+        # Rendu en arrière-plan (ChartRenderer) en échec : le rapport sort sans ce graphique
+        logger.exception("Rendu du graphique impossible : graphique omis du rapport")
+        return False
+    size = re.search(rb'viewBox="0 0 ([\d.]+) ([\d.]+)"', svg or b"")
+    if size is None:
+        logger.warning("Graphique sans viewBox SVG : omis du rapport")
+        return False
+    height = width * float(size[2]) / float(size[1])
+    if pdf.will_page_break(height):
+        pdf.add_page()
+    pdf.image(io.BytesIO(svg), x=(pdf.w - width) / 2, y=pdf.get_y(), w=width, h=height)
+    pdf.set_y(pdf.get_y() + height)
+    return True
+
+
+def build_report(score_cw, score_f, score_h, weights, cr, recommendation, 
+                 finance, zone_context=None, project_name="", 
+                 uploaded_images=[], gps_coords=None, criteria_names=None,
+                 repair_suggestions=None, photo_pipeline=None, photo_quality=None, template=None, charts=None):
+    """
+    Génère un rapport PDF complet avec :
+    - Contexte de l'étude
+    - Analyse AHP
+    - Comparaison des options
+    - Synthèse financière (finance : FinancialResult du tableau de bord)
+    - Recommandation finale
+    - Documentation photographique (photos préparées par photo_pipeline si fourni, à
+      la qualité JPEG photo_quality ou à celle du pipeline)
+    
+    Les photos sont des fichiers téléversés, des octets ou des chemins.
+    template (ReportTemplate) remplace le gabarit du processus.
+    charts (dict) : graphiques SVG par emplacement (radar, weights, costs),
+    en octets ou en cours de rendu (voir engine.charts.ChartRenderer) ;
+    sans radar, la comparaison est illustrée par des barres.
+    
+    Returns:
+        FPDF: Document complet, prêt à être écrit
+    """
+    
+    pdf = (template or get_report_template()).new_document()
+    pdf.add_page()
+    
+    # ============================================
+    # EN-TÊTE PROFESSIONNELLE
+    # ============================================
+    pdf.set_fill_color(0, 51, 102)  # Bleu marine
+    pdf.rect(0, 0, 210, 45, "F")
+    pdf.set_y(15)
+    
+    # Logo/Titre principal
+    pdf.set_font("Helvetica", "B", 24)
+    pdf.set_text_color(255, 255, 255)
+    pdf.cell(0, 12, "HYDRO-DECISIO SIAD", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
+    
+    # Sous-titre
+    pdf.set_font("Helvetica", "I", 11)
+    pdf.cell(0, 8, "Système d'Aide à la Décision Hydraulique", 
+             new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
+    
+    # Date
+    pdf.set_font("Helvetica", "", 10)
+    pdf.cell(0, 8, f"Rapport généré le {date.today().strftime('%d/%m/%Y')}", 
+             new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
+    
+    pdf.set_y(55)
+    pdf.set_text_color(0, 0, 0)
+    
+    # ============================================
+    # SECTION 1 : CONTEXTE DE L'ÉTUDE
+    # ============================================
+    pdf.set_font("Helvetica", "B", 16)
+    pdf.set_draw_color(0, 102, 204)
+    pdf.set_line_width(0.5)
+    pdf.cell(0, 12, "1. CONTEXTE DE L'ÉTUDE", "B", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.ln(2)
+    
+    # Informations du projet
+    pdf.set_font("Helvetica", "B", 12)
+    pdf.cell(40, 8, "Projet :", 0, 0)
+    pdf.set_font("Helvetica", "", 12)
+    pdf.cell(0, 8, project_name or "Non spécifié", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    
+    # Informations de la zone si disponibles
+    if zone_context:
+        pdf.set_font("Helvetica", "B", 12)
+        pdf.cell(40, 8, "Quartier :", 0, 0)
+        pdf.set_font("Helvetica", "", 12)
+        pdf.cell(0, 8, zone_context.get('quartier', 'N/A'), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        
+        pdf.set_font("Helvetica", "B", 12)
+        pdf.cell(40, 8, "Secteur :", 0, 0)
+        pdf.set_font("Helvetica", "", 12)
+        pdf.cell(0, 8, zone_context.get('secteur', 'N/A'), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        
+        pdf.set_font("Helvetica", "B", 12)
+        pdf.cell(40, 8, "Description :", 0, 0)
+        pdf.set_font("Helvetica", "", 10)
+        # Gestion du texte long avec multi_cell
+        pdf.multi_cell(0, 5, zone_context.get('description', 'Aucune description disponible'))
+        pdf.ln(3)
+    
+    # Coordonnées GPS avec lien Google Maps
+    if gps_coords:
+        lat, lon = gps_coords
+        pdf.set_font("Helvetica", "B", 12)
+        pdf.cell(45, 8, "Coordonnées GPS :", 0, 0)
+        pdf.set_font("Helvetica", "", 11)
+        pdf.cell(0, 8, f"{lat:.6f}°N, {lon:.6f}°E", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        
+        # Lien Google Maps
+        google_maps_url = f"https://maps.google.com/?q={lat},{lon}"
+        pdf.set_font("Helvetica", "I", 10)
+        pdf.set_text_color(0, 102, 204)
+        pdf.cell(0, 8, f"Lien Google Maps : {google_maps_url}", 
+                 new_x=XPos.LMARGIN, new_y=YPos.NEXT, link=google_maps_url)
+        pdf.set_text_color(0, 0, 0)
+    
+    pdf.ln(5)
+    
+    # ============================================
+    # SECTION 2 : MÉTHODOLOGIE AHP
+    # ============================================
+    pdf.set_font("Helvetica", "B", 16)
+    pdf.cell(0, 12, "2. MÉTHODOLOGIE AHP", "B", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.ln(3)
+    
+    # Pondération des critères
+    pdf.set_font("Helvetica", "B", 14)
+    pdf.cell(0, 10, "2.1 Pondération des Critères", 0, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    
+    pdf.set_font("Helvetica", "", 11)
+    # Tableau des poids
+    pdf.set_fill_color(240, 248, 255)
+    pdf.cell(60, 10, "Critère", border=1, fill=True, align="C")
+    pdf.cell(40, 10, "Poids", border=1, fill=True, align="C")
+    pdf.cell(40, 10, "Valeur", border=1, fill=True, align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    
+    criteria_names = criteria_names or ["Coût", "Disponibilité", "Accessibilité"]
+    for i, (name, weight) in enumerate(zip(criteria_names, weights)):
+        pdf.cell(60, 10, name, border=1)
+        pdf.cell(40, 10, f"{weight:.2%}", border=1, align="C")
+        pdf.cell(40, 10, f"{weight:.4f}", border=1, align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    
+    charts = charts or {}
+    if "weights" in charts:
+        pdf.ln(3)
+        _draw_chart(pdf, charts["weights"])
+    
+    # Indice de cohérence
+    pdf.ln(3)
+    pdf.set_font("Helvetica", "B", 11)
+    pdf.cell(0, 8, f"Indice de Cohérence (CR) : {cr:.4f}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    if cr < 0.1:
+        pdf.set_text_color(0, 128, 0)
+        pdf.cell(0, 8, "[OK] L'analyse est coherente (CR < 0.1)", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    else:
+        pdf.set_text_color(255, 0, 0)
+        pdf.cell(0, 8, "[ATTENTION] CR eleve, revoir les comparaisons", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        # Corrections proposées par le moteur pour retrouver un CR < 0.1
+        if repair_suggestions:
+            pdf.set_text_color(0, 0, 0)
+            pdf.set_font("Helvetica", "", 10)
+            pdf.cell(0, 6, "Corrections suggérées :", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            for suggestion in repair_suggestions:
+                pdf.cell(10, 6, "")
+                pdf.cell(0, 6, f"- {suggestion}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        
+    pdf.set_text_color(0, 0, 0)
+    pdf.ln(5)
+    
+    # ============================================
+    # SECTION 3 : ANALYSE COMPARATIVE
+    # ============================================
+    pdf.set_font("Helvetica", "B", 16)
+    pdf.cell(0, 12, "3. ANALYSE COMPARATIVE DES OPTIONS", "B", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.ln(3)
+    
+    # Tableau comparatif
+    pdf.set_font("Helvetica", "B", 12)
+    pdf.set_fill_color(240, 248, 255)
+    pdf.cell(70, 10, "Option", border=1, fill=True, align="C")
+    pdf.cell(40, 10, "Score", border=1, fill=True, align="C")
+    pdf.cell(40, 10, "Performance", border=1, fill=True, align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    
+    options = [
+        ("CAMWATER (Réseau)", score_cw),
+        ("FORAGE (Autonome)", score_f),
+        ("HYBRIDE (Mixte)", score_h)
+    ]
+    
+    for option_name, score in options:
+        pdf.set_font("Helvetica", "", 11)
+        pdf.cell(70, 10, f" {option_name}", border=1)
+        pdf.cell(40, 10, f"{score:.2%}", border=1, align="C")
+        pdf.cell(40, 10, f"{score*10:.1f}/10", border=1, align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    
+    pdf.ln(5)
+    
+    # Radar des performances, ou graphique en barres textuel à défaut
+    pdf.set_font("Helvetica", "B", 12)
+    pdf.cell(0, 10, "Visualisation comparative :", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    
+    if not ("radar" in charts and _draw_chart(pdf, charts["radar"])):
+        max_score = max(score_cw, score_f, score_h)
+        for option_name, score in options:
+            bar_width = (score / max_score) * 100 if max_score > 0 else 0
+            pdf.set_font("Helvetica", "", 10)
+            pdf.cell(40, 8, f"{option_name[:15]} :", 0, 0)
+            pdf.set_fill_color(200, 220, 255)
+            pdf.cell(bar_width, 8, "", border=0, fill=True)
+            pdf.cell(5, 8, f" {score:.1%}", 0, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    
+    pdf.ln(5)
+    
+    # ============================================
+    # SECTION 4 : SYNTHÈSE FINANCIÈRE
+    # ============================================
+    pdf.set_font("Helvetica", "B", 16)
+    pdf.cell(0, 12, f"4. SYNTHÈSE FINANCIÈRE ({finance.horizon} ans)", "B", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.ln(3)
+    
+    pdf.set_font("Helvetica", "B", 12)
+    pdf.cell(0, 10, f"Coûts cumulés sur {finance.horizon} ans :", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    
+    pdf.set_font("Helvetica", "", 11)
+    # Tableau des coûts
+    pdf.set_fill_color(245, 245, 245)
+    pdf.cell(36, 10, "Option", border=1, fill=True, align="C")
+    pdf.cell(36, 10, "CAPEX", border=1, fill=True, align="C")
+    pdf.cell(36, 10, "OPEX / mois", border=1, fill=True, align="C")
+    pdf.cell(36, 10, f"Total {finance.horizon} ans", border=1, fill=True, align="C")
+    pdf.cell(36, 10, "VAN des coûts", border=1, fill=True, align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    
+    # Meilleure option financière (VAN des coûts la plus faible)
+    best_financial = finance.cheapest
+    
+    for j, option in enumerate(finance.options):
+        pdf.set_font("Helvetica", "", 10)
+        pdf.set_text_color(0, 0, 0)
+        pdf.cell(36, 10, f" {option}", border=1)
+        pdf.cell(36, 10, f"{int(finance.capex[j]):,} FCFA".replace(',', ' '), border=1, align="C")
+        pdf.cell(36, 10, f"{int(finance.opex_monthly[j]):,} FCFA".replace(',', ' '), border=1, align="C")
+        
+        if option == best_financial:
+            pdf.set_text_color(0, 128, 0)
+            pdf.set_font("Helvetica", "B", 10)
+        
+        pdf.cell(36, 10, f"{int(finance.totals[j]):,} FCFA".replace(',', ' '), border=1, align="C")
+        pdf.cell(36, 10, f"{int(finance.npv[j]):,} FCFA".replace(',', ' '), border=1, align="C",
+                 new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    
+    pdf.set_text_color(0, 0, 0)
+    pdf.ln(3)
+    pdf.set_font("Helvetica", "I", 10)
+    pdf.cell(0, 8, f"* Option la plus économique : {best_financial}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    for j, option in enumerate(finance.options):
+        irr, payback = finance.irr[j], finance.payback_year[j]
+        if j == 0:
+            continue
+        irr_text = "-" if np.isnan(irr) else f"{irr:.1%}"
+        payback_text = "au-delà de l'horizon" if np.isnan(payback) else f"{payback:.1f} ans"
+        pdf.cell(0, 6, f"* {option} face à {finance.options[0]} : TRI {irr_text}, "
+                 f"retour sur investissement {payback_text}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    
+    if "costs" in charts:
+        pdf.ln(5)
+        _draw_chart(pdf, charts["costs"])
+    
+    # ============================================
+    # SECTION 5 : RECOMMANDATION FINALE
+    # ============================================
+    pdf.add_page()
+    pdf.set_font("Helvetica", "B", 16)
+    pdf.cell(0, 12, "5. RECOMMANDATION FINALE", "B", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.ln(10)
+    
+    # Encadré de recommandation
+    if recommendation == "CAMWATER":
+        fill_color = (0, 102, 204)  # Bleu
+        border_color = (0, 51, 102)
+    elif recommendation == "FORAGE":
+        fill_color = (0, 153, 0)    # Vert
+        border_color = (0, 102, 0)
+    else:  # Hybride
+        fill_color = (255, 153, 0)  # Orange
+        border_color = (204, 102, 0)
+    
+    pdf.set_fill_color(*fill_color)
+    pdf.set_draw_color(*border_color)
+    pdf.set_line_width(1)
+    pdf.rect(15, pdf.get_y(), 180, 25, "F")
+    
+    pdf.set_y(pdf.get_y() + 5)
+    pdf.set_font("Helvetica", "B", 20)
+    pdf.set_text_color(255, 255, 255)
+    pdf.cell(0, 10, "DÉCISION PRÉCONISÉE", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
+    
+    pdf.set_font("Helvetica", "B", 28)
+    pdf.cell(0, 15, recommendation, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
+    
+    pdf.set_y(pdf.get_y() + 10)
+    pdf.set_text_color(0, 0, 0)
+    
+    # Justification
+    pdf.set_font("Helvetica", "B", 14)
+    pdf.cell(0, 10, "Justification :", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.set_font("Helvetica", "", 11)
+    
+    # Option inconnue : justification de l'hybride, comme auparavant
+    pdf.multi_cell(0, 6, JUSTIFICATIONS.get(recommendation, JUSTIFICATIONS["HYBRIDE"]))
+    
+    # Synthèse
+    pdf.ln(5)
+    pdf.set_font("Helvetica", "B", 12)
+    pdf.cell(0, 10, "Synthèse des avantages :", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    
+    pdf.set_font("Helvetica", "", 10)
+    for advantage in ADVANTAGES.get(recommendation, []):
+        pdf.cell(10, 6, "")
+        pdf.cell(0, 6, advantage, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    
+    # ============================================
+    # SECTION 6 : DOCUMENTATION PHOTOGRAPHIQUE
+    # ============================================
+    if uploaded_images:
+        for i, img in enumerate(uploaded_images):
+            pdf.add_page()
+            pdf.set_font("Helvetica", "B", 14)
+            pdf.set_draw_color(200, 200, 200)
+            pdf.cell(0, 10, f"Documentation - Vue {i+1}/{len(uploaded_images)}", "B", 
+                     new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            pdf.ln(5)
+            
+            try:
+                if isinstance(img, bytes):
+                    img = io.BytesIO(img)
+                if photo_pipeline is not None:
+                    data = img.getvalue() if hasattr(img, "getvalue") else Path(img).read_bytes()
+                    img = io.BytesIO(photo_pipeline.process(data, photo_quality))
+                pdf.image(img, x=20, w=170)
+                pdf.set_font("Helvetica", "I", 9)
+                pdf.cell(0, 10, f"Photo {i+1} - Site de {project_name}", 
+                         new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
+            except:
+                pdf.set_text_color(255, 0, 0)
+                pdf.cell(0, 10, f"Impossible de charger l'image {i+1}", 
+                         new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
+                pdf.set_text_color(0, 0, 0)
+    
+    # ============================================
+    # PIED DE PAGE
+    # ============================================
+    pdf.set_y(-20)
+    pdf.set_font("Helvetica", "I", 8)
+    pdf.set_text_color(100, 100, 100)
+    pdf.cell(0, 10, "Document généré par HYDRO-DECISIO SIAD - Système d'Aide à la Décision Hydraulique", 
+             new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
+    pdf.cell(0, 5, "Confidentialité : Ce rapport est destiné à l'usage exclusif du client", 
+             new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
+    
+    return pdf
+
+
+def generate_pdf(*args, **kwargs):
+    """Rapport PDF d'un site, en octets (mêmes paramètres que build_report)."""
+    return bytes(build_report(*args, **kwargs).output())
@@ -0,0 +1,340 @@
+# Rapports PDF en lot : un rapport par site, rendus dans un pool de processus
+"""
+Rapports de revue à l'échelle d'un arrondissement (200 sites et plus).
+
+Les rapports sont rendus en parallèle dans des processus séparés, puis
+écrits au fil de l'eau, dans l'ordre des sites :
+- dans une archive ZIP (un PDF par site), sans jamais garder plus d'une
+  fenêtre de rapports en mémoire ;
+- ou dans un document unique avec sommaire et signets : les objets de
+  chaque rapport sont renumérotés et recopiés dans le document dès son
+  rendu (lus avec pypdf), l'arbre des pages, le sommaire et les signets
+  n'étant écrits qu'à la fin. La mémoire ne dépend pas du nombre de sites.
+
+Les entrées sont les lignes produites par engine.pipeline.evaluate_sites
+(voir site_report_inputs), ou directement des paramètres de generate_pdf.
+Les graphiques y sont décrits par leurs specs (chart_specs) et rendus en
+SVG dans le processus qui rend le rapport : le processus principal ne fait
+que préparer les entrées.
+"""
+
+import io
+import math
+import re
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from engine.charts import render_chart, report_chart_specs
+from engine.data_loader import CRITERIA_CATALOG, get_zone_context
+from engine.finance import project_options
+from engine.photos import PhotoPipeline
+from engine.pipeline import (BASE_CRITERIA_KEYS, DEFAULT_FINANCE, DEFAULT_PROJECTION, HORIZON_YEARS, OPTIONS,
+                             option_projection, performance_keys)
+from engine.report import build_report
+
+# Entrées du sommaire par page du document fusionné
+TOC_ENTRIES_PER_PAGE = 40
+
+# Formats de sortie de render_reports
+REPORT_FORMATS = (".zip", ".pdf")
+
+# Noms complets des critères, par clé courte
+_CRITERIA_NAMES = {info["cle"]: name for name, info in CRITERIA_CATALOG.items()}
+
+# Cache des photos propre à chaque processus de rendu
+_photo_pipeline = None
+
+
+def site_report_inputs(row, criteria_keys=BASE_CRITERIA_KEYS, years=HORIZON_YEARS, index=0, charts=True,
+                       projection=None):
+    """
+    Paramètres de generate_pdf pour une ligne évaluée par evaluate_sites.
+
+    Colonnes facultatives : site (nom du projet), quartier, latitude,
+    longitude, photos (chemins séparés par des ';') et les colonnes
+    financières de DEFAULT_FINANCE. Les graphiques du rapport (radar,
+    poids, coûts cumulés) sont décrits par leurs specs, sous chart_specs,
+    et rendus par le processus de rendu (voir render_reports), sauf si
+    charts est faux : leur insertion triple environ le temps de rendu d'un
+    rapport. projection reprend les hypothèses passées à evaluate_sites
+    (DEFAULT_PROJECTION si None).
+
+    Returns:
+        tuple: (nom du site, paramètres de generate_pdf, plus chart_specs
+            avec les graphiques)
+    """
+    def value(key, default=None):
+        v = row.get(key, default)
+        return default if v is None or v != v else v  # NaN de pandas : valeur absente
+
+    name = str(value("site", f"Site {index + 1}"))
+    finance = {key: float(value(key, default)) for key, default in DEFAULT_FINANCE.items()}
+    capex, opex, params = option_projection(**finance, **{**DEFAULT_PROJECTION, **(projection or {})})
+    latitude, longitude = value("latitude"), value("longitude")
+    photos = value("photos")
+    weights = [float(row[f"poids_{key}"]) for key in criteria_keys]
+    criteria_names = [_CRITERIA_NAMES.get(key, key) for key in criteria_keys]
+    result = project_options([label for *_, label in OPTIONS], capex, opex, years=years, **params)
+
+    inputs = {
+        "score_cw": float(row["score_cw"]),
+        "score_f": float(row["score_f"]),
+        "score_h": float(row["score_h"]),
+        "weights": weights,
+        "cr": float(row["cr"]),
+        "recommendation": str(row["recommandation"]),
+        "finance": result,
+        "zone_context": get_zone_context(value("quartier")) if value("quartier") else None,
+        "project_name": name,
+        "uploaded_images": [p.strip() for p in str(photos).split(";") if p.strip()] if photos else [],
+        "gps_coords": (float(latitude), float(longitude)) if latitude is not None and longitude is not None else None,
+        "criteria_names": criteria_names,
+    }
+    if charts:
+        inputs["chart_specs"] = report_chart_specs(
+            [[float(row[key]) for key in keys] for keys in performance_keys(criteria_keys)],
+            criteria_names, weights, result)
+    return name, inputs
+
+
+def _render_site(name, inputs):
+    """Rendu d'un rapport (graphiques compris) dans un processus de travail : (nom, octets, pages)."""
+    global _photo_pipeline
+    inputs = dict(inputs)
+    specs = inputs.pop("chart_specs", None)
+    if specs:
+        inputs["charts"] = {slot: render_chart(kind, spec) for slot, (kind, spec) in specs.items()}
+    if inputs.get("uploaded_images") and _photo_pipeline is None:
+        _photo_pipeline = PhotoPipeline(workers=1)
+    pdf = build_report(**inputs, photo_pipeline=_photo_pipeline)
+    return name, bytes(pdf.output()), pdf.pages_count
+
+
+def _ordered_results(sites, processes, window):
+    """Rapports rendus dans l'ordre des sites, au plus window en attente."""
+    if not processes or processes <= 1:
+        for name, inputs in sites:
+            yield _render_site(name, inputs)
+        return
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        pending = deque()
+        for name, inputs in sites:
+            pending.append(pool.submit(_render_site, name, inputs))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _file_name(index, name):
+    slug = re.sub(r"[^\w-]+", "_", name).strip("_") or "site"
+    return f"{index + 1:04d}_{slug}.pdf"
+
+
+def _toc_pdf(entries):
+    """Sommaire du document fusionné (octets) : nom du site et page de début."""
+    from fpdf import FPDF
+    from fpdf.enums import XPos, YPos
+
+    pdf = FPDF(orientation="P", unit="mm", format="A4")
+    pdf.set_margin(15)
+    for start in range(0, len(entries), TOC_ENTRIES_PER_PAGE):
+        pdf.add_page()
+        pdf.set_font("Helvetica", "B", 16)
+        pdf.cell(0, 12, "SOMMAIRE", "B", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.ln(3)
+        pdf.set_font("Helvetica", "", 10)
+        for name, page in entries[start:start + TOC_ENTRIES_PER_PAGE]:
+            pdf.cell(160, 6, name[:80], new_x=XPos.RIGHT, new_y=YPos.TOP)
+            pdf.cell(0, 6, str(page), align="R", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    return bytes(pdf.output())
+
+
+class _MergedPdf:
+    """
+    Document PDF écrit au fil de l'eau à partir de PDF complets.
+
+    Les pages de chaque document ajouté et les objets qu'elles référencent
+    (contenus, ressources, polices, images) sont renumérotés puis écrits
+    aussitôt : seuls les positions des objets, les pages et les signets
+    restent en mémoire. close() écrit l'arbre des pages (dans l'ordre
+    demandé, indépendant de l'ordre d'écriture), les signets, le catalogue
+    et la table des références.
+
+    Usage :
+        with open("revue.pdf", "wb") as stream:
+            merged = _MergedPdf(stream)
+            rapport = merged.add(octets, "Site 1")
+            sommaire = merged.add(octets_sommaire, "Sommaire")
+            merged.close([sommaire, rapport])
+    """
+
+    # Objets réservés, écrits par close()
+    _CATALOG, _PAGES, _OUTLINES = 1, 2, 3
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.offsets = {}
+        self.next_id = self._OUTLINES + 1
+        stream.write(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+
+    def _new_id(self):
+        self.next_id += 1
+        return self.next_id - 1
+
+    def _write(self, idnum, obj):
+        self.offsets[idnum] = self.stream.tell()
+        self.stream.write(f"{idnum} 0 obj\n".encode())
+        obj.write_to_stream(self.stream)
+        self.stream.write(b"\nendobj\n")
+
+    def add(self, data, title):
+        """Recopie les pages d'un PDF ; renvoie (titre, identifiants des pages)."""
+        from pypdf import PdfReader
+        from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, NameObject
+
+        reader = PdfReader(io.BytesIO(data))
+        mapping, pending, remapped = {}, deque(), set()
+
+        def reference(indirect):
+            if indirect.idnum not in mapping:
+                mapping[indirect.idnum] = self._new_id()
+                pending.append(indirect)
+            return IndirectObject(mapping[indirect.idnum], 0, None)
+
+        def remap(obj):
+            # Références réécrites sur place, une seule fois par conteneur (les attributs
+            # hérités partagent le même dictionnaire entre pages)
+            if isinstance(obj, IndirectObject):
+                return reference(obj)
+            if id(obj) in remapped:
+                return obj
+            if isinstance(obj, (DictionaryObject, ArrayObject)):
+                remapped.add(id(obj))
+            if isinstance(obj, DictionaryObject):
+                for key, value in list(dict.items(obj)):
+                    obj[key] = remap(value)
+            elif isinstance(obj, ArrayObject):
+                for i, value in enumerate(obj):
+                    obj[i] = remap(value)
+            return obj
+
+        # Pages aplaties par pypdf : les attributs hérités (MediaBox, Resources) y sont recopiés
+        pages = {page.indirect_reference.idnum: page for page in reader.pages}
+        page_ids = [reference(page.indirect_reference).idnum for page in reader.pages]
+        while pending:
+            indirect = pending.popleft()
+            page = pages.get(indirect.idnum)
+            if page is None:
+                obj = remap(indirect.get_object())
+            else:
+                # Rattachée à l'arbre des pages du document fusionné, pas à celui du rapport
+                del page["/Parent"]
+                obj = remap(page)
+                obj[NameObject("/Parent")] = IndirectObject(self._PAGES, 0, None)
+            self._write(mapping[indirect.idnum], obj)
+        return title, page_ids
+
+    def close(self, documents):
+        """Écrit l'arbre des pages et un signet par document, dans l'ordre de documents."""
+        from pypdf.generic import (ArrayObject, DictionaryObject, IndirectObject, NameObject, NumberObject,
+                                   create_string_object)
+
+        def ref(idnum):
+            return IndirectObject(idnum, 0, None)
+
+        kids = [ref(idnum) for _, page_ids in documents for idnum in page_ids]
+        self._write(self._PAGES, DictionaryObject({
+            NameObject("/Type"): NameObject("/Pages"),
+            NameObject("/Kids"): ArrayObject(kids),
+            NameObject("/Count"): NumberObject(len(kids)),
+        }))
+        items = [self._new_id() for _ in documents]
+        for i, (idnum, (title, page_ids)) in enumerate(zip(items, documents)):
+            item = DictionaryObject({
+                NameObject("/Title"): create_string_object(title),
+                NameObject("/Parent"): ref(self._OUTLINES),
+                NameObject("/Dest"): ArrayObject([ref(page_ids[0]), NameObject("/Fit")]),
+            })
+            if i > 0:
+                item[NameObject("/Prev")] = ref(items[i - 1])
+            if i < len(items) - 1:
+                item[NameObject("/Next")] = ref(items[i + 1])
+            self._write(idnum, item)
+        outlines = DictionaryObject({NameObject("/Type"): NameObject("/Outlines"),
+                                     NameObject("/Count"): NumberObject(len(items))})
+        if items:
+            outlines[NameObject("/First")] = ref(items[0])
+            outlines[NameObject("/Last")] = ref(items[-1])
+        self._write(self._OUTLINES, outlines)
+        self._write(self._CATALOG, DictionaryObject({
+            NameObject("/Type"): NameObject("/Catalog"),
+            NameObject("/Pages"): ref(self._PAGES),
+            NameObject("/Outlines"): ref(self._OUTLINES),
+            NameObject("/PageMode"): NameObject("/UseOutlines"),
+        }))
+
+        xref = self.stream.tell()
+        lines = [f"xref\n0 {self.next_id}\n", "0000000000 65535 f \n"]
+        lines += [f"{self.offsets[idnum]:010d} 00000 n \n" for idnum in range(1, self.next_id)]
+        lines.append(f"trailer\n<< /Size {self.next_id} /Root {self._CATALOG} 0 R >>\n"
+                     f"startxref\n{xref}\n%%EOF\n")
+        self.stream.write("".join(lines).encode())
+
+
+def render_reports(sites, output, processes=None, window=None):
+    """
+    Rend un rapport par site et les écrit dans output, au fil de l'eau.
+
+    Args:
+        sites (iterable): (nom, paramètres de generate_pdf, avec chart_specs
+            facultatif), par exemple produits par site_report_inputs ;
+            consommé au fil du rendu
+        output (str): Archive .zip (un PDF par site) ou document .pdf fusionné
+            avec sommaire et signets
+        processes (int): Taille du pool de processus (None = rendu local)
+        window (int): Rapports en cours au plus (par défaut 2 par processus)
+
+    Returns:
+        dict: Nombre de rapports et de pages, durée (s) et débit (pages/s)
+    """
+    output = Path(output)
+    suffix = output.suffix.lower()
+    if suffix not in REPORT_FORMATS:
+        raise ValueError(f"Format de sortie non pris en charge : {output.suffix} (attendu .zip ou .pdf)")
+    window = window or 2 * (processes or 1)
+    reports = pages = 0
+    start = time.perf_counter()
+
+    if suffix == ".zip":
+        # Les PDF sont déjà compressés : stockage simple dans l'archive
+        with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_STORED) as archive:
+            for name, data, count in _ordered_results(sites, processes, window):
+                archive.writestr(_file_name(reports, name), data)
+                reports += 1
+                pages += count
+    else:
+        with open(output, "wb") as stream:
+            merged = _MergedPdf(stream)
+            documents, counts = [], []
+            for name, data, count in _ordered_results(sites, processes, window):
+                documents.append(merged.add(data, name))
+                counts.append(count)
+                reports += 1
+                pages += count
+
+            # Le sommaire précède les rapports : les numéros de page en tiennent compte
+            toc_pages = max(1, math.ceil(len(documents) / TOC_ENTRIES_PER_PAGE))
+            entries, first_page = [], toc_pages + 1
+            for (name, _), count in zip(documents, counts):
+                entries.append((name, first_page))
+                first_page += count
+            merged.close([merged.add(_toc_pdf(entries), "Sommaire"), *documents])
+            pages += toc_pages
+
+    elapsed = time.perf_counter() - start
+    return {"reports": reports, "pages": pages, "seconds": elapsed,
+            "pages_per_second": pages / elapsed if elapsed else float("inf")}
@@ -0,0 +1,208 @@
+# Gabarit des rapports PDF : mesures et mises en page calculées une fois par processus
+"""
+Couche de gabarit des rapports PDF.
+
+Avec fpdf2, chaque cell() repasse par toute la chaîne de mise en forme
+(fragments stylés, mesure du texte, état graphique) et chaque multi_cell()
+relance la césure du paragraphe : c'est l'essentiel du coût d'un rapport,
+alors que l'en-tête, les titres de section, les en-têtes de tableaux, les
+justifications et le pied de page sont identiques d'un rapport à l'autre.
+
+ReportTemplate garde, pour tout le processus :
+- la largeur de chaque texte déjà mesuré, par police et taille ;
+- la mise en page des paragraphes (lignes et position de chaque mot en
+  texte justifié), calculée au premier rendu, ou dès la création du
+  gabarit pour les textes fixes passés à prepare().
+
+ReportDocument est un FPDF dont cell() et multi_cell() utilisent ces
+mesures et écrivent le texte directement (FPDF.text), sans repasser par la
+mise en forme. Les appels qui utilisent d'autres options (markdown,
+soulignement, centrage...) sont transmis tels quels à FPDF.
+
+ReportDocument s'appuie sur des éléments internes de fpdf2 (saut de page
+_perform_page_break_if_need_be, _record_text_quad_points) : la version de
+fpdf2 est figée dans requirements.txt, et tests/test_report_template.py
+vérifie que le texte est placé comme par un FPDF ordinaire.
+"""
+
+from collections import OrderedDict
+
+from fpdf import FPDF
+from fpdf.enums import Align, MethodReturnValue, XPos, YPos
+
+# Positions après une cellule gérées par le chemin rapide
+_FAST_NEW_X = (XPos.RIGHT, XPos.LMARGIN, XPos.LEFT)
+_FAST_NEW_Y = (YPos.TOP, YPos.NEXT)
+# Équivalents de l'ancien paramètre ln
+_LN_POSITIONS = {0: (XPos.RIGHT, YPos.TOP), 1: (XPos.LMARGIN, YPos.NEXT), 2: (XPos.LEFT, YPos.NEXT)}
+
+
+class _BoundedCache(OrderedDict):
+    """Dictionnaire LRU de taille bornée."""
+
+    def __init__(self, maxsize):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def put(self, key, value):
+        self[key] = value
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+        return value
+
+
+class ReportTemplate:
+    """
+    Mesures de texte et mises en page partagées par tous les rapports d'un
+    processus (voir get_report_template dans engine.report).
+    """
+
+    def __init__(self, orientation="P", format="A4", margin=15, max_widths=8192, max_layouts=256):
+        self.orientation = orientation
+        self.format = format
+        self.margin = margin
+        self._widths = _BoundedCache(max_widths)
+        self._layouts = _BoundedCache(max_layouts)
+        self.hits = 0
+        self.misses = 0
+
+    def new_document(self):
+        """Document vierge qui utilise ce gabarit."""
+        pdf = ReportDocument(self, orientation=self.orientation, unit="mm", format=self.format)
+        pdf.set_margin(self.margin)
+        return pdf
+
+    def prepare(self, paragraphs):
+        """
+        Calcule d'avance la mise en page de paragraphes fixes.
+
+        Args:
+            paragraphs (iterable): (police, style, taille, largeur, hauteur de ligne, texte)
+        """
+        pdf = self.new_document()
+        pdf.add_page()
+        for family, style, size, width, line_height, text in paragraphs:
+            pdf.set_font(family, style, size)
+            self.layout(pdf, text, width or pdf.epw, line_height)
+
+    def text_width(self, pdf, text):
+        """Largeur de text dans la police courante de pdf (mm)."""
+        key = (pdf.current_font.fontkey, pdf.font_size_pt, text)
+        width = self._widths.get(key)
+        if width is None:
+            self.misses += 1
+            return self._widths.put(key, pdf.get_string_width(text))
+        self.hits += 1
+        return width
+
+    def layout(self, pdf, text, width, line_height):
+        """
+        Mise en page d'un texte justifié : pour chaque ligne, la liste des
+        (décalage horizontal, mot) à écrire. Comme FPDF.multi_cell, la
+        dernière ligne de chaque paragraphe (fin du texte ou \n) reste
+        alignée à gauche.
+        """
+        key = (pdf.current_font.fontkey, pdf.font_size_pt, width, line_height, text)
+        lines = self._layouts.get(key)
+        if lines is not None:
+            self.hits += 1
+            return lines
+        self.misses += 1
+        raw_lines = []
+        for paragraph in text.split("\n"):
+            split = FPDF.multi_cell(pdf, width, line_height, paragraph, dry_run=True, output=MethodReturnValue.LINES)
+            raw_lines.extend((line, i == len(split) - 1) for i, line in enumerate(split))
+        inner = width - 2 * pdf.c_margin
+        space = pdf.get_string_width(" ")
+        lines = []
+        for line, last in raw_lines:
+            line = line.rstrip(" ")
+            words = line.split(" ")
+            if last or len(words) == 1:
+                # Dernière ligne du paragraphe : alignée à gauche
+                lines.append(((pdf.c_margin, line),) if line else ())
+                continue
+            widths = [self.text_width(pdf, word) for word in words]
+            gap = space + (inner - sum(widths) - space * (len(words) - 1)) / (len(words) - 1)
+            x, placed = pdf.c_margin, []
+            for word, w in zip(words, widths):
+                placed.append((x, word))
+                x += w + gap
+            lines.append(tuple(placed))
+        return self._layouts.put(key, tuple(lines))
+
+    @property
+    def stats(self):
+        """Compteurs de succès/échecs et tailles des caches."""
+        return {"hits": self.hits, "misses": self.misses,
+                "widths": len(self._widths), "layouts": len(self._layouts)}
+
+
+class ReportDocument(FPDF):
+    """FPDF dont les cellules et paragraphes simples passent par le gabarit."""
+
+    def __init__(self, template, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.template = template
+
+    def _fast_path(self):
+        return not (self.text_shaping or self.underline or self.strikethrough or self.char_spacing
+                    or self.font_stretching != 100 or self._record_text_quad_points)
+
+    def cell(self, w=None, h=None, text="", border=0, ln="DEPRECATED", align=Align.L, fill=False,
+             link="", center=False, markdown=False, new_x=XPos.RIGHT, new_y=YPos.TOP, **kwargs):
+        if ln != "DEPRECATED" and ln in _LN_POSITIONS:
+            new_x, new_y = _LN_POSITIONS[ln]
+            ln = "DEPRECATED"
+        new_x, new_y, align = XPos.coerce(new_x), YPos.coerce(new_y), Align.coerce(align)
+        if (w is None or h is None or kwargs or center or markdown or ln != "DEPRECATED"
+                or align not in (Align.L, Align.C, Align.R) or new_x not in _FAST_NEW_X
+                or new_y not in _FAST_NEW_Y or not self._fast_path()):
+            return super().cell(w, h, text, border, ln, align, fill, link, center, markdown,
+                                new_x, new_y, **kwargs)
+
+        if w == 0:
+            w = self.w - self.r_margin - self.x
+        page_break = self._perform_page_break_if_need_be(h)
+        x, y = self.x, self.y
+        if isinstance(border, str) and set(border).issuperset("LTRB"):
+            border = 1
+        if fill:
+            self.rect(x, y, w, h, "DF" if border == 1 else "F")
+        elif border == 1:
+            self.rect(x, y, w, h, "D")
+        if isinstance(border, str):
+            for side, (x1, y1, x2, y2) in (("L", (x, y, x, y + h)), ("T", (x, y, x + w, y)),
+                                            ("R", (x + w, y, x + w, y + h)), ("B", (x, y + h, x + w, y + h))):
+                if side in border:
+                    self.line(x1, y1, x2, y2)
+        if text:
+            if align == Align.L:
+                dx = self.c_margin
+            else:
+                text_width = self.template.text_width(self, text)
+                dx = (w - text_width) / 2 if align == Align.C else w - self.c_margin - text_width
+            self.text(x + dx, y + 0.5 * h + 0.3 * self.font_size, text)
+        if link:
+            self.link(x, y, w, h, link)
+
+        self.x = {XPos.RIGHT: x + w, XPos.LMARGIN: self.l_margin, XPos.LEFT: x}[new_x]
+        self.y = y + h if new_y == YPos.NEXT else y
+        return page_break
+
+    def multi_cell(self, w, h=None, text="", *args, **kwargs):
+        if args or kwargs or h is None or not self._fast_path():
+            return super().multi_cell(w, h, text, *args, **kwargs)
+
+        x = self.x
+        width = w or self.w - self.r_margin - x
+        page_break = False
+        for placed in self.template.layout(self, text, width, h):
+            page_break |= self._perform_page_break_if_need_be(h)
+            baseline = self.y + 0.5 * h + 0.3 * self.font_size
+            for dx, word in placed:
+                self.text(x + dx, baseline, word)
+            self.y += h
+        # Position par défaut de multi_cell : à droite du bloc, sous la dernière ligne
+        self.x = x + width
+        return page_break
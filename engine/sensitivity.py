@@ -0,0 +1,171 @@
+# Analyse de sensibilité Monte Carlo des poids AHP et des performances
+"""
+Robustesse du verdict CAMWATER / FORAGE / HYBRIDE.
+
+Les jugements de comparaison sont perturbés de façon multiplicative
+(bruit log-normal, ce qui préserve la réciprocité) et les notes 1-10 des
+options par un bruit gaussien borné. Tous les tirages sont évalués en un
+seul lot via AHPEngine.compute_weights_batch.
+
+La carte des inversions énumère, elle, toutes les combinaisons de l'échelle
+des curseurs pour situer le verdict courant par rapport au plus proche
+verdict différent.
+"""
+
+from itertools import product
+
+import numpy as np
+
+from engine.ahp_logic import AHPEngine, SAATY_SLIDER_SCALE, reciprocal_matrices
+
+
+def monte_carlo_sensitivity(comparisons, performances, option_names=None,
+                            n_samples=10000, judgment_spread=0.25, score_spread=1.0,
+                            seed=None, engine=None):
+    """
+    Tire des jugements et des notes perturbés et mesure la stabilité du classement.
+
+    Args:
+        comparisons (sequence): Jugements du triangle supérieur (ex. c_vs_d, c_vs_a, d_vs_a)
+        performances (array): Notes 1-10, forme (options, critères)
+        option_names (list): Noms des options (par défaut "Option 1", ...)
+        n_samples (int): Nombre de tirages
+        judgment_spread (float): Écart-type du bruit sur le log des jugements
+        score_spread (float): Écart-type du bruit sur les notes (en points)
+        seed (int): Graine pour des résultats reproductibles
+        engine (AHPEngine): Moteur utilisé pour les poids
+
+    Returns:
+        dict: Scores tirés, probabilités de victoire, de rang et d'inversion
+            du classement, percentiles des scores et part des tirages cohérents
+    """
+    engine = engine or AHPEngine(lambda_method="auto")
+    rng = np.random.default_rng(seed)
+    comparisons = np.asarray(comparisons, dtype=float)
+    performances = np.asarray(performances, dtype=float)
+    n_options = performances.shape[0]
+    option_names = list(option_names or [f"Option {i + 1}" for i in range(n_options)])
+
+    # Classement de référence, sans perturbation
+    base_weights, _ = engine.compute_weights(reciprocal_matrices(comparisons[np.newaxis])[0])
+    base_scores = performances @ base_weights / 10
+    base_winner = int(np.argmax(base_scores))
+
+    # Perturbation multiplicative des jugements (la réciprocité est conservée)
+    noise = rng.normal(0.0, judgment_spread, size=(n_samples, comparisons.size))
+    sampled = comparisons * np.exp(noise)
+    weights, cr = engine.compute_weights_batch(reciprocal_matrices(sampled))
+
+    # Perturbation des notes, bornées à l'échelle 1-10
+    sampled_perf = performances + rng.normal(0.0, score_spread, size=(n_samples,) + performances.shape)
+    np.clip(sampled_perf, 1, 10, out=sampled_perf)
+
+    scores = np.einsum("soc,sc->so", sampled_perf, weights) / 10
+    # rank[s, o] = rang de l'option o dans le tirage s (0 = meilleure)
+    ranks = np.argsort(np.argsort(-scores, axis=1), axis=1)
+    rank_probabilities = np.stack([(ranks == r).mean(axis=0) for r in range(n_options)], axis=1)
+    winners = ranks.argmin(axis=1)
+
+    percentiles = np.percentile(scores, [5, 50, 95], axis=0)
+    return {
+        "options": option_names,
+        "base_scores": dict(zip(option_names, base_scores.tolist())),
+        "base_winner": option_names[base_winner],
+        "scores": scores,
+        "win_probability": dict(zip(option_names, rank_probabilities[:, 0].tolist())),
+        "rank_probabilities": rank_probabilities,
+        "rank_reversal_probability": float((winners != base_winner).mean()),
+        "score_percentiles": {
+            name: tuple(percentiles[:, i].tolist()) for i, name in enumerate(option_names)
+        },
+        "consistent_ratio": float((cr < 0.1).mean()),
+    }
+
+
+def rank_reversal_map(performances, option_names=None, scale=SAATY_SLIDER_SCALE,
+                      engine=None, max_combinations=200_000):
+    """
+    Évalue toutes les combinaisons de jugements de l'échelle en un seul lot.
+
+    Args:
+        performances (array): Notes 1-10, forme (options, critères)
+        option_names (list): Noms des options
+        scale (sequence): Valeurs possibles de chaque curseur de comparaison
+        engine (AHPEngine): Moteur utilisé pour les poids
+        max_combinations (int): Garde-fou sur la taille de l'énumération
+
+    Returns:
+        dict: Indices des jugements dans l'échelle (k, m), scores (k, options),
+            gagnant (k,) et CR (k,) de chaque combinaison
+    """
+    engine = engine or AHPEngine(lambda_method="auto")
+    performances = np.asarray(performances, dtype=float)
+    n_options, n_criteria = performances.shape
+    option_names = list(option_names or [f"Option {i + 1}" for i in range(n_options)])
+    m = n_criteria * (n_criteria - 1) // 2
+    count = len(scale) ** m
+    if count > max_combinations:
+        raise ValueError(f"{count} combinaisons pour {n_criteria} critères (max {max_combinations})")
+
+    indices = np.array(list(product(range(len(scale)), repeat=m)), dtype=np.intp).reshape(count, m)
+    values = np.asarray(scale, dtype=float)[indices]
+    weights, cr = engine.compute_weights_batch(reciprocal_matrices(values))
+    scores = weights @ performances.T / 10
+    return {
+        "options": option_names,
+        "scale": tuple(scale),
+        "indices": indices,
+        "scores": scores,
+        "winners": scores.argmax(axis=1),
+        "cr": cr,
+    }
+
+
+def nearest_reversals(rank_map, comparisons, consistent_only=False, limit=5):
+    """
+    Cherche les combinaisons les plus proches qui changent le verdict.
+
+    La distance est le nombre de crans de curseur à déplacer (distance L1
+    entre les positions dans l'échelle).
+
+    Args:
+        rank_map (dict): Résultat de rank_reversal_map
+        comparisons (sequence): Jugements courants ; une valeur hors de l'échelle
+            (jugements agrégés d'un groupe) est ramenée au cran le plus proche
+            en échelle logarithmique
+        consistent_only (bool): Ne retenir que les combinaisons avec CR < 0.1
+        limit (int): Nombre de combinaisons retournées
+
+    Returns:
+        dict: Verdict courant, part des combinaisons gagnées par option et
+            liste des inversions les plus proches (distance, jugements, gagnant, CR)
+    """
+    scale = np.asarray(rank_map["scale"], dtype=float)
+    current = np.abs(np.log(scale)[np.newaxis, :]
+                     - np.log(np.asarray(comparisons, dtype=float))[:, np.newaxis]).argmin(axis=1)
+    indices = rank_map["indices"]
+    current_row = int(np.ravel_multi_index(current, (len(scale),) * len(current))) if len(current) else 0
+    winner = int(rank_map["winners"][current_row])
+
+    distances = np.abs(indices - current).sum(axis=1)
+    candidates = rank_map["winners"] != winner
+    if consistent_only:
+        candidates &= rank_map["cr"] < 0.1
+    rows = np.flatnonzero(candidates)
+    rows = rows[np.argsort(distances[rows], kind="stable")][:limit]
+
+    options = rank_map["options"]
+    shares = np.bincount(rank_map["winners"], minlength=len(options)) / len(rank_map["winners"])
+    return {
+        "winner": options[winner],
+        "win_share": dict(zip(options, shares.tolist())),
+        "reversals": [
+            {
+                "distance": int(distances[r]),
+                "comparisons": scale[indices[r]].tolist(),
+                "winner": options[rank_map["winners"][r]],
+                "cr": float(rank_map["cr"][r]),
+            }
+            for r in rows
+        ],
+    }
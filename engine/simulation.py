@@ -0,0 +1,144 @@
+# Simulation stochastique des coûts : pannes de pompe, électricité, coupures, forage
+"""
+Courbes de coûts cumulés P10 / P50 / P90 des options CAMWATER, FORAGE et
+HYBRIDE sous incertitude.
+
+Chaque trajectoire tire :
+- un dépassement du coût de forage (loi exponentielle, en part du CAPEX) ;
+- une trajectoire du prix de l'électricité (marche aléatoire géométrique
+  mensuelle), qui porte la part énergie de l'OPEX du forage ;
+- des pannes de pompe (loi de Poisson mensuelle), chacune facturée et
+  suivie de jours sans eau achetée au détail ;
+- des jours de coupure du réseau (loi de Poisson mensuelle), pendant
+  lesquels l'abonné CAMWATER achète son eau.
+
+L'option hybride bascule sur le réseau quand la pompe est en panne et sur
+le forage pendant les coupures : elle paie les réparations mais pas l'eau
+de secours. Tous les tirages d'un bloc sont vectorisés (trajectoires ×
+mois) ; les grands lots peuvent être répartis sur un pool de processus.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from engine.pipeline import DEFAULT_FINANCE, HYBRID_NETWORK_SHARE
+
+# Hypothèses de risque par défaut (Yaoundé VII, FCFA)
+DEFAULT_RISKS = {
+    "drilling_overrun": 0.15,        # dépassement moyen du CAPEX forage (part)
+    "energy_share": 0.6,             # part de l'électricité dans l'OPEX forage
+    "electricity_drift": 0.05,       # hausse annuelle moyenne du prix de l'électricité
+    "electricity_volatility": 0.10,  # volatilité annuelle du prix de l'électricité
+    "pump_failures_per_year": 0.5,   # pannes de pompe par an
+    "pump_repair_cost": 120000,      # coût d'une réparation
+    "repair_days": 4,                # jours sans forage par panne
+    "outage_days_per_month": 3.0,    # jours de coupure du réseau par mois
+    "water_purchase_per_day": 1500,  # eau achetée au détail par jour sans eau
+}
+
+# Percentiles des courbes restituées
+PERCENTILES = (10, 50, 90)
+
+
+def _simulate_block(capex, opex, months, n_paths, risks, network_share, seed):
+    """Coûts cumulés d'un bloc de trajectoires, forme (3, mois + 1, trajectoires)."""
+    rng = np.random.default_rng(seed)
+    capex_cw, capex_f = capex
+    opex_cw, opex_f = opex
+    dtype = np.float32
+    # Les trajectoires sont sur le dernier axe : tris et cumuls restent contigus
+    shape = (months, n_paths)
+
+    # Dépassement du forage, payé au mois 0 (forage et hybride)
+    drilling = capex_f * (1 + rng.exponential(risks["drilling_overrun"], n_paths).astype(dtype))
+
+    # Indice du prix de l'électricité, à 1 au mois 0
+    sigma = risks["electricity_volatility"] / np.sqrt(12)
+    mu = np.log1p(risks["electricity_drift"]) / 12 - sigma ** 2 / 2
+    steps = rng.standard_normal(shape, dtype=dtype) * dtype(sigma) + dtype(mu)
+    price = np.exp(np.cumsum(steps, axis=0, out=steps), out=steps)
+    share = risks["energy_share"]
+    opex_f_paths = opex_f * (share * price + (1 - share))
+
+    # Pannes de pompe : réparation et jours d'eau achetée
+    failures = rng.poisson(risks["pump_failures_per_year"] / 12, shape).astype(dtype)
+    repairs = failures * dtype(risks["pump_repair_cost"])
+    pump_downtime = failures * dtype(risks["repair_days"] * risks["water_purchase_per_day"])
+
+    # Coupures du réseau : eau achetée les jours sans service
+    outages = rng.poisson(risks["outage_days_per_month"], shape).astype(dtype)
+    outage_cost = outages * dtype(risks["water_purchase_per_day"])
+
+    flows = np.empty((3, months + 1, n_paths), dtype=dtype)
+    flows[0, 0] = capex_cw
+    flows[1, 0] = drilling
+    flows[2, 0] = capex_cw + drilling
+    flows[0, 1:] = opex_cw + outage_cost
+    flows[1, 1:] = opex_f_paths + repairs + pump_downtime
+    flows[2, 1:] = network_share * opex_cw + (1 - network_share) * opex_f_paths + repairs
+    return np.cumsum(flows, axis=1, out=flows)
+
+
+def _percentile_curves(cumulative, percentiles):
+    """Percentiles par tri en place (interpolation linéaire, comme np.percentile)."""
+    cumulative.sort(axis=-1)
+    position = np.asarray(percentiles, dtype=float) / 100 * (cumulative.shape[-1] - 1)
+    lower = np.floor(position).astype(int)
+    upper = np.minimum(lower + 1, cumulative.shape[-1] - 1)
+    fraction = position - lower
+    curves = cumulative[..., lower] * (1 - fraction) + cumulative[..., upper] * fraction
+    return np.moveaxis(curves, -1, 1)
+
+
+def simulate_cash_flows(capex=None, opex_monthly=None, months=120, n_paths=50000, risks=None,
+                        network_share=HYBRID_NETWORK_SHARE, seed=None, processes=None,
+                        chunk_size=50000):
+    """
+    Simule les coûts cumulés des trois options et en tire les courbes P10/P50/P90.
+
+    Args:
+        capex (sequence): CAPEX (CAMWATER, FORAGE) ; par défaut DEFAULT_FINANCE
+        opex_monthly (sequence): OPEX mensuel (CAMWATER, FORAGE) ; par défaut DEFAULT_FINANCE
+        months (int): Horizon en mois
+        n_paths (int): Nombre de trajectoires
+        risks (dict): Hypothèses remplaçant celles de DEFAULT_RISKS
+        network_share (float): Part du réseau dans l'OPEX hybride
+        seed (int): Graine pour des résultats reproductibles
+        processes (int): Taille du pool de processus (None = calcul local)
+        chunk_size (int): Trajectoires par bloc
+
+    Returns:
+        dict: Mois, percentiles, courbes (options, percentiles, mois + 1),
+            coûts finaux de chaque trajectoire (trajectoires, options) et
+            probabilité pour chaque option d'être la moins chère à l'horizon
+    """
+    unknown = set(risks or {}) - set(DEFAULT_RISKS)
+    if unknown:
+        raise ValueError(f"Hypothèses de risque inconnues : {', '.join(sorted(unknown))}")
+    risks = {**DEFAULT_RISKS, **(risks or {})}
+    capex = tuple(capex) if capex is not None else (DEFAULT_FINANCE["capex_cw"], DEFAULT_FINANCE["capex_f"])
+    opex = tuple(opex_monthly) if opex_monthly is not None else (DEFAULT_FINANCE["opex_cw"],
+                                                                 DEFAULT_FINANCE["opex_f"])
+
+    # Un flux aléatoire indépendant par bloc : même résultat en local ou en pool
+    sizes = [min(chunk_size, n_paths - start) for start in range(0, n_paths, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(capex, opex, months, size, risks, network_share, s) for size, s in zip(sizes, seeds)]
+    if processes and len(sizes) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            blocks = list(pool.map(_simulate_block, *zip(*args)))
+    else:
+        blocks = [_simulate_block(*a) for a in args]
+    cumulative = blocks[0] if len(blocks) == 1 else np.concatenate(blocks, axis=-1)
+
+    final = cumulative[:, -1].T.copy()
+    cheapest = np.bincount(final.argmin(axis=1), minlength=3) / n_paths
+    curves = _percentile_curves(cumulative, PERCENTILES)
+    return {
+        "months": np.arange(months + 1),
+        "percentiles": PERCENTILES,
+        "curves": curves,
+        "final_costs": final,
+        "cheapest_probability": cheapest,
+    }
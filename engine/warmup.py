@@ -0,0 +1,82 @@
+# Préchauffage du processus : travaux d'initialisation lancés en arrière-plan
+"""
+Préchauffage d'un processus du tableau de bord.
+
+Les travaux coûteux du premier affichage (tables AHP, gabarits Plotly,
+carte de base, mesures des polices du rapport...) sont faits une fois par
+processus, dans un thread lancé dès la page d'accueil : quand
+l'utilisateur entre dans le tableau de bord, ils sont en général déjà
+terminés. L'écran de chargement n'est affiché que tant qu'ils ne le sont
+pas (voir ready et wait).
+
+Le module n'importe pas Streamlit : les étapes sont de simples fonctions.
+"""
+
+import threading
+import time
+
+
+class WarmUp:
+    """
+    Étapes de préchauffage exécutées dans l'ordre, dans un thread de fond.
+
+    Usage :
+        warm_up = WarmUp({"Tables AHP": build_lookup, "Carte": build_map}).start()
+        lookup = warm_up.result("Tables AHP")   # attend la fin si besoin
+    """
+
+    def __init__(self, steps):
+        self.steps = dict(steps)
+        self.timings = {}
+        self.started_at = None
+        self.finished_at = None
+        self._results = {}
+        self._errors = {}
+        self._done = threading.Event()
+        self._thread = None
+
+    def __repr__(self):
+        state = "prêt" if self.ready else "en cours" if self._thread else "non lancé"
+        return f"WarmUp({len(self.steps)} étapes, {state})"
+
+    def start(self):
+        """Lance le préchauffage (sans effet s'il est déjà lancé) ; renvoie self."""
+        if self._thread is None:
+            self.started_at = time.perf_counter()
+            self._thread = threading.Thread(target=self._run, name="warm-up", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        for name, step in self.steps.items():
+            start = time.perf_counter()
+            try:
+                self._results[name] = step()
+            except Exception as exc:
+                # Une étape en échec n'empêche pas les suivantes ; result() relève l'erreur
+                self._errors[name] = exc
+            self.timings[name] = time.perf_counter() - start
+        self.finished_at = time.perf_counter()
+        self._done.set()
+
+    @property
+    def ready(self):
+        """Vrai quand toutes les étapes sont terminées."""
+        return self._done.is_set()
+
+    @property
+    def seconds(self):
+        """Durée totale du préchauffage (None tant qu'il n'est pas terminé)."""
+        return self.finished_at - self.started_at if self.ready else None
+
+    def wait(self, timeout=None):
+        """Attend la fin du préchauffage ; renvoie ready."""
+        self.start()
+        return self._done.wait(timeout)
+
+    def result(self, name):
+        """Résultat d'une étape, après la fin du préchauffage (relève son erreur éventuelle)."""
+        self.wait()
+        if name in self._errors:
+            raise self._errors[name]
+        return self._results[name]
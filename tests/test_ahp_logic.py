@@ -0,0 +1,174 @@
+"""
+Tests du moteur AHP : stratégies de lambda max comparées à np.linalg.eigvals,
+calcul par lot identique à la boucle matrice par matrice et tailles hors
+de la table RI de Saaty.
+
+Usage :
+    python -m pytest -q tests
+"""
+import numpy as np
+import pytest
+
+from benchmarks.bench_ahp import random_reciprocal_matrices
+from engine.ahp_logic import RANDOM_INDEX, AHPEngine, reciprocal_matrix
+
+SIZES = range(3, 16)
+# Tolérance de la comparaison à eigvals (tol par défaut de l'engine : 1e-12)
+RTOL = 1e-9
+
+
+def reference_lambda_max(matrices):
+    return np.real(np.linalg.eigvals(matrices).max(axis=-1))
+
+
+def reference_cr(matrices):
+    n = matrices.shape[-1]
+    return (reference_lambda_max(matrices) - n) / (n - 1) / RANDOM_INDEX[n]
+
+
+def consistent_matrix(n, seed=0):
+    """Matrice parfaitement cohérente a_ij = w_i / w_j (lambda max = n, CR = 0)."""
+    w = np.random.default_rng(seed).uniform(1, 9, n)
+    return w[:, np.newaxis] / w[np.newaxis, :]
+
+
+def methods_for(n):
+    # La formule exacte n'existe que pour n=3
+    return ["power", "auto", "closed_form"] if n == 3 else ["power", "auto"]
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_lambda_max_matches_eigvals(n):
+    # 200 matrices : au-delà de POWER_MIN_BATCH, "auto" choisit la puissance pour n >= 8
+    matrices = random_reciprocal_matrices(200, n, seed=n)
+    reference = reference_lambda_max(matrices)
+    for method in methods_for(n):
+        engine = AHPEngine(lambda_method=method)
+        weights, _ = engine.compute_weights_batch(matrices)
+        np.testing.assert_allclose(engine.lambda_max_batch(matrices, weights), reference, rtol=RTOL, atol=0,
+                                   err_msg=f"{method}, n={n}")
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_consistency_ratio_matches_eigvals(n):
+    matrices = random_reciprocal_matrices(200, n, seed=100 + n)
+    reference = reference_cr(matrices)
+    for method in methods_for(n):
+        _, cr = AHPEngine(lambda_method=method).compute_weights_batch(matrices)
+        np.testing.assert_allclose(cr, reference, rtol=1e-7, atol=1e-9, err_msg=f"{method}, n={n}")
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_single_matrix_matches_eigvals(n):
+    # Une seule matrice : "auto" passe par eigvals (sauf n=3), la puissance reste testée seule
+    matrix = random_reciprocal_matrices(1, n, seed=200 + n)[0]
+    reference = reference_cr(matrix[np.newaxis])[0]
+    for method in methods_for(n):
+        _, cr = AHPEngine(lambda_method=method).compute_weights(matrix)
+        assert cr == pytest.approx(reference, rel=1e-7, abs=1e-9), f"{method}, n={n}"
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_consistent_matrix(n):
+    matrices = np.stack([consistent_matrix(n, seed) for seed in range(100)])
+    # Poids exacts : w normalisé
+    expected = matrices[:, :, 0] / matrices[:, :, 0].sum(axis=1, keepdims=True)
+    for method in ["eigvals", *methods_for(n)]:
+        engine = AHPEngine(lambda_method=method)
+        weights, cr = engine.compute_weights_batch(matrices)
+        np.testing.assert_allclose(engine.lambda_max_batch(matrices, weights), n, rtol=1e-12, err_msg=method)
+        np.testing.assert_allclose(cr, 0, atol=1e-12, err_msg=method)
+        np.testing.assert_allclose(weights, expected, rtol=1e-12, err_msg=method)
+
+
+@pytest.mark.parametrize("tol", [1e-3, 1e-6, 1e-9])
+def test_power_tolerance(tol):
+    # Arrêt sur variation relative <= tol : l'erreur sur lambda max reste de l'ordre de tol
+    matrices = random_reciprocal_matrices(500, 10, seed=1)
+    reference = reference_lambda_max(matrices)
+    engine = AHPEngine(lambda_method="power", tol=tol)
+    weights, _ = engine.compute_weights_batch(matrices)
+    result = engine.lambda_max_batch(matrices, weights)
+    np.testing.assert_allclose(result, reference, rtol=10 * tol, atol=0)
+
+
+def test_power_max_iter_bounds_iterations():
+    # Une seule itération : estimation finie mais grossière, l'itération complète converge
+    matrices = random_reciprocal_matrices(50, 10, seed=2)
+    reference = reference_lambda_max(matrices)
+    one_step = AHPEngine(lambda_method="power", max_iter=1).lambda_max_batch(matrices)
+    converged = AHPEngine(lambda_method="power").lambda_max_batch(matrices)
+    assert np.isfinite(one_step).all()
+    assert np.abs(one_step - reference).max() > np.abs(converged - reference).max()
+
+
+def test_closed_form_rejects_other_sizes():
+    with pytest.raises(ValueError, match="n=3"):
+        AHPEngine(lambda_method="closed_form").compute_weights(random_reciprocal_matrices(1, 4)[0])
+
+
+def test_unknown_methods():
+    with pytest.raises(ValueError, match="lambda max inconnue"):
+        AHPEngine(lambda_method="qr")
+    with pytest.raises(ValueError, match="pondération inconnue"):
+        AHPEngine(weight_method="harmonic")
+
+
+@pytest.mark.parametrize("method", ["eigvals", "power", "auto"])
+@pytest.mark.parametrize("weight_method", ["column", "geometric"])
+@pytest.mark.parametrize("n", [3, 5, 9, 15])
+def test_batch_matches_loop(method, weight_method, n):
+    matrices = random_reciprocal_matrices(100, n, seed=n)
+    engine = AHPEngine(lambda_method=method, weight_method=weight_method)
+    weights, cr = engine.compute_weights_batch(matrices)
+    loop = [engine.compute_weights(matrix) for matrix in matrices]
+    np.testing.assert_allclose(weights, np.array([w for w, _ in loop]), rtol=1e-12, atol=0)
+    # Le lot peut changer de stratégie ("auto") ; les CR restent ceux d'eigvals
+    np.testing.assert_allclose(cr, np.array([c for _, c in loop]), rtol=1e-7, atol=1e-9)
+
+
+def test_batch_matches_loop_exactly_with_eigvals():
+    matrices = random_reciprocal_matrices(100, 4, seed=3)
+    engine = AHPEngine()
+    weights, cr = engine.compute_weights_batch(matrices)
+    for i, matrix in enumerate(matrices):
+        w, c = engine.compute_weights(matrix)
+        np.testing.assert_allclose(w, weights[i], rtol=1e-14)
+        assert c == pytest.approx(cr[i], rel=1e-12, abs=1e-14)
+
+
+def test_reciprocal_matrix_roundtrip():
+    matrix = reciprocal_matrix((5, 1 / 9, 1 / 5))
+    np.testing.assert_allclose(matrix * matrix.T, np.ones((3, 3)))
+    assert matrix[0, 1] == 5 and matrix[1, 0] == pytest.approx(1 / 5)
+
+
+@pytest.mark.parametrize("n", [16, 20])
+def test_unknown_size_raises(n):
+    with pytest.raises(ValueError, match=f"n={n}"):
+        AHPEngine().compute_weights(random_reciprocal_matrices(1, n)[0])
+    with pytest.raises(ValueError, match=f"n={n}"):
+        AHPEngine().compute_weights_batch(random_reciprocal_matrices(3, n))
+
+
+def test_bad_shape_raises():
+    with pytest.raises(ValueError, match="forme"):
+        AHPEngine().compute_weights_batch(np.ones((3, 4)))
+    with pytest.raises(ValueError, match="forme"):
+        AHPEngine().compute_weights_batch(np.ones((2, 3, 4)))
+
+
+@pytest.mark.parametrize("n", [1, 2])
+def test_small_sizes_are_consistent(n):
+    weights, cr = AHPEngine().compute_weights(random_reciprocal_matrices(1, n)[0])
+    assert weights.sum() == pytest.approx(1)
+    assert cr == 0
+
+
+def test_compute_criteria_weights_any_length():
+    criteria = ["Coût", "Disponibilité", "Accessibilité", "Qualité", "Énergie"]
+    weights, cr = AHPEngine().compute_criteria_weights(criteria, {("Coût", "Qualité"): 3, ("Énergie", "Coût"): 5})
+    assert list(weights) == criteria
+    assert sum(weights.values()) == pytest.approx(1)
+    assert weights["Énergie"] > weights["Coût"] > weights["Qualité"]
+    assert cr >= 0
@@ -0,0 +1,42 @@
+"""
+Tests de la base des zones : chaque appel renvoie une copie indépendante.
+
+Usage :
+    python -m pytest -q tests
+"""
+import pytest
+
+from engine.data_loader import ZONES_DATABASE, get_available_zones, get_zone_context, get_zone_criteria
+
+
+@pytest.mark.parametrize("zone", get_available_zones())
+def test_zone_context_equals_database(zone):
+    assert get_zone_context(zone) == ZONES_DATABASE[zone]
+
+
+def test_unknown_zone_falls_back_to_nkolbisson():
+    assert get_zone_context("Inconnue") == ZONES_DATABASE["Nkolbisson"]
+
+
+def test_mutating_a_context_leaves_the_database_intact():
+    context = get_zone_context("Nkolbisson")
+    context["quartier"] = "Modifié"
+    context["coordonnees"]["latitude"] = 0.0
+    context["criteres"]["Coût"]["definition"] = "Modifiée"
+    context["performances_par_defaut"]["forage"]["cout"] = 1
+    del context["criteres"]["Disponibilité"]
+
+    fresh = get_zone_context("Nkolbisson")
+    assert fresh["quartier"] == "Nkolbisson"
+    assert fresh["coordonnees"]["latitude"] == ZONES_DATABASE["Nkolbisson"]["coordonnees"]["latitude"] != 0.0
+    assert fresh["criteres"]["Coût"]["definition"] != "Modifiée"
+    assert fresh["performances_par_defaut"]["forage"]["cout"] != 1
+    assert "Disponibilité" in fresh["criteres"]
+
+
+def test_zones_sharing_default_criteria_stay_independent():
+    # "Autre" reprend CRITERES_PAR_DEFAUT : une copie modifiée ne doit pas déteindre sur la constante
+    context = get_zone_context("Autre")
+    context["criteres"]["Coût"]["details"] = "Modifié"
+    assert get_zone_context("Autre")["criteres"]["Coût"]["details"] != "Modifié"
+    assert [c["nom"] for c in get_zone_criteria(get_zone_context("Autre"))] == list(ZONES_DATABASE["Autre"]["criteres"])
@@ -0,0 +1,125 @@
+"""
+Tests de cohérence entre les figures Plotly du tableau de bord et les
+graphiques SVG du rapport : mêmes catégories, couleurs, séries et bornes.
+
+Usage :
+    python -m pytest -q tests
+"""
+import logging
+import re
+from xml.etree.ElementTree import ParseError
+
+import numpy as np
+import pytest
+from fpdf import FPDF
+
+from engine.charts import OPTION_COLORS, PALETTE, RADAR_RANGE, render_chart, report_chart_specs
+from engine.figures import FIGURES, _rgba, create_cost_curves, create_radar_chart, create_weights_donut
+from engine.finance import project_options
+from engine.report import _draw_chart
+
+OPTIONS = ("CAMWATER", "FORAGE", "HYBRIDE")
+CRITERIA = ["Coût", "Disponibilité", "Accessibilité", "Qualité de l'eau"]
+PERFORMANCES = [[7, 5, 6, 4], [6, 9, 7, 8], [5, 8, 8, 6]]
+WEIGHTS = [0.4, 0.3, 0.2, 0.1]
+
+
+@pytest.fixture(scope="module")
+def specs():
+    finance = project_options(OPTIONS, [150000, 2500000, 2650000], [15000, 5000, 9000], years=12,
+                              discount_rate=0.05, inflation=0.03)
+    return finance, report_chart_specs(PERFORMANCES, CRITERIA, WEIGHTS, finance)
+
+
+def svg_colors(svg):
+    return set(re.findall(rb'(?:fill|stroke)="(#[0-9A-Fa-f]{6})"', svg))
+
+
+def test_radar_matches_svg(specs):
+    _, charts = specs
+    _, spec = charts["radar"]
+    fig = create_radar_chart(*PERFORMANCES, categories=CRITERIA)
+    assert fig.to_plotly_json() == FIGURES["radar"](spec).to_plotly_json()
+    assert [trace.name for trace in fig.data] == [item["label"] for item in spec["series"]] == list(OPTIONS)
+    for trace, item in zip(fig.data, spec["series"]):
+        assert list(trace.theta) == spec["categories"] == CRITERIA
+        assert list(trace.r) == item["values"]
+        assert trace.line.color == item["color"] == OPTION_COLORS[trace.name]
+        assert trace.fillcolor == _rgba(item["color"], 0.2)
+    assert tuple(fig.layout.polar.radialaxis.range) == RADAR_RANGE == (0, spec["max_value"])
+    assert fig.layout.title.text == spec["title"]
+
+    svg = render_chart("radar", spec)
+    assert {color.encode() for color in OPTION_COLORS.values()} <= svg_colors(svg)
+    for name in CRITERIA:
+        assert f">{name}</text>".encode() in svg
+    assert f">{RADAR_RANGE[1]:g}</text>".encode() in svg
+
+
+def test_default_radar_categories():
+    fig = create_radar_chart([7, 5, 6], [6, 9, 7], [5, 8, 8])
+    assert list(fig.data[0].theta) == ['Coût', 'Disponibilité', 'Accessibilité']
+
+
+def test_donut_matches_svg(specs):
+    _, charts = specs
+    _, spec = charts["weights"]
+    fig = create_weights_donut(WEIGHTS, CRITERIA)
+    pie = fig.data[0]
+    assert list(pie.labels) == spec["labels"] == CRITERIA
+    assert list(pie.values) == spec["values"]
+    assert list(pie.marker.colors) == spec["colors"] == PALETTE[:len(CRITERIA)]
+    # Secteurs triés par poids décroissant, départ à midi, sens trigonométrique, comme le SVG
+    assert pie.sort in (None, True) and pie.direction == "counterclockwise" and pie.hole == 0.5
+
+    svg = render_chart("donut", spec)
+    assert {color.encode() for color in spec["colors"]} <= svg_colors(svg)
+
+
+def test_cost_curves_match_svg(specs):
+    finance, charts = specs
+    _, spec = charts["costs"]
+    fig = create_cost_curves(finance.years, finance.cumulative, finance.options)
+    assert fig.to_plotly_json() == FIGURES["costs"](spec).to_plotly_json()
+    assert fig.layout.title.text == spec["title"] == "Coûts cumulés sur 12 ans"
+    for j, (trace, item) in enumerate(zip(fig.data, spec["series"])):
+        assert trace.name == item["label"] == OPTIONS[j]
+        assert list(trace.x) == spec["years"] == list(range(13))
+        np.testing.assert_allclose(trace.y, finance.cumulative[j])
+        assert trace.line.color == item["color"] == OPTION_COLORS[trace.name]
+        # Hybride (dernière option) en pointillés des deux côtés
+        assert (trace.line.dash == "dash") == item["dash"] == (j == len(OPTIONS) - 1)
+
+    svg = render_chart("costs", spec)
+    assert {color.encode() for color in OPTION_COLORS.values()} <= svg_colors(svg)
+    assert svg.count(b'stroke-dasharray') == 2  # courbe et légende de l'hybride
+
+
+class FailedJob:
+    def result(self):
+        raise RuntimeError("rendu interrompu")
+
+
+def test_draw_chart_logs_failed_render(caplog):
+    pdf = FPDF()
+    pdf.add_page()
+    with caplog.at_level(logging.ERROR, logger="engine.report"):
+        assert _draw_chart(pdf, FailedJob()) is False
+    assert "rendu interrompu" in caplog.text
+
+
+def test_draw_chart_inserts_svg(specs):
+    _, charts = specs
+    pdf = FPDF()
+    pdf.add_page()
+    y = pdf.get_y()
+    assert _draw_chart(pdf, render_chart(*charts["radar"]))
+    assert pdf.get_y() > y
+
+
+def test_draw_chart_propagates_embedding_errors():
+    # Un SVG invalide est une erreur du générateur : elle n'est pas masquée
+    pdf = FPDF()
+    pdf.add_page()
+    with pytest.raises(ParseError):
+        _draw_chart(pdf, b'<svg viewBox="0 0 10 10"><path d="M 0 0 Q"')
@@ -0,0 +1,120 @@
+"""
+Tests de la projection financière : TRI par Newton borné comparé à une
+annuité connue et à une dichotomie de référence, délais de récupération,
+cas NaN (pas de changement de signe, récupération au-delà de l'horizon)
+et coûts à taux nuls.
+
+Usage :
+    python -m pytest -q tests
+"""
+import numpy as np
+import pytest
+
+from engine.finance import financial_projection, internal_rate_of_return, project_options, projected_costs
+
+OPTIONS = ["CAMWATER", "FORAGE", "HYBRIDE"]
+
+
+def annuity_flows(monthly_rate, months=120, payment=1000.0):
+    """Investissement puis mensualités constantes dont le TRI mensuel vaut monthly_rate."""
+    investment = payment * (1 - (1 + monthly_rate) ** -months) / monthly_rate
+    return np.concatenate([[-investment], np.full(months, payment)])
+
+
+def bisection_irr(flows, low=-0.05, high=0.2, iterations=200):
+    """TRI annuel de référence, par dichotomie pure sur le taux mensuel."""
+    m = np.arange(len(flows))
+    npv = lambda rate: (flows / (1 + rate) ** m).sum()
+    if np.sign(npv(low)) * np.sign(npv(high)) >= 0:
+        return np.nan
+    for _ in range(iterations):
+        mid = (low + high) / 2
+        low, high = (mid, high) if np.sign(npv(mid)) == np.sign(npv(low)) else (low, mid)
+    return (1 + (low + high) / 2) ** 12 - 1
+
+
+@pytest.mark.parametrize("monthly_rate", [0.001, 0.005, 0.01, 0.03, 0.1])
+def test_irr_of_known_annuity(monthly_rate):
+    irr = internal_rate_of_return(annuity_flows(monthly_rate))
+    assert irr == pytest.approx((1 + monthly_rate) ** 12 - 1, rel=1e-9)
+
+
+def test_irr_batch_matches_bisection():
+    rng = np.random.default_rng(0)
+    flows = np.concatenate([-rng.uniform(5e3, 1e5, (200, 1)), rng.uniform(0, 2e3, (200, 120))], axis=1)
+    # Quelques investissements jamais remboursés dans le lot : NaN attendus
+    flows[:20, 1:] *= 0.01
+    irr = internal_rate_of_return(flows)
+    expected = np.array([bisection_irr(f) for f in flows])
+    np.testing.assert_array_equal(np.isnan(irr), np.isnan(expected))
+    assert 0 < np.isnan(irr).sum() < len(irr)
+    # tol de 1e-10 sur le taux mensuel : de l'ordre de 1e-9 sur le TRI annuel
+    np.testing.assert_allclose(irr[~np.isnan(irr)], expected[~np.isnan(expected)], rtol=0, atol=1e-8)
+
+
+def test_irr_outside_bracket_is_nan():
+    # TRI mensuel de 50 % : au-delà de la borne haute (20 %)
+    assert np.isnan(internal_rate_of_return(annuity_flows(0.5)))
+    # Investissement jamais remboursé : TRI mensuel sous la borne basse (-5 %)
+    assert np.isnan(internal_rate_of_return(np.concatenate([[-1e6], np.full(120, 10.0)])))
+
+
+def test_irr_without_sign_change_is_nan():
+    assert np.isnan(internal_rate_of_return(np.full(121, 100.0)))
+    assert np.isnan(internal_rate_of_return(np.zeros(121)))
+
+
+def test_payback_within_horizon():
+    # FORAGE : 12 000 d'investissement, aucun OPEX ; CAMWATER : 1 000 par mois
+    result = financial_projection(np.array([0.0, 12_000.0]), np.array([1_000.0, 0.0]), years=10)
+    assert result["payback_month"][1] == 12
+    assert result["payback_year"][1] == pytest.approx(1.0)
+    assert np.isnan(result["payback_month"][0]) and np.isnan(result["irr"][0])
+    incremental = np.concatenate([[-12_000.0], np.full(120, 1_000.0)])
+    assert result["irr"][1] == pytest.approx(bisection_irr(incremental), abs=1e-8)
+
+
+def test_discounting_delays_payback():
+    capex, opex = np.array([0.0, 12_000.0]), np.array([1_000.0, 0.0])
+    plain = financial_projection(capex, opex, years=10)
+    discounted = financial_projection(capex, opex, years=10, discount_rate=0.12)
+    assert discounted["payback_month"][1] > plain["payback_month"][1]
+
+
+def test_payback_beyond_horizon_is_nan():
+    # Économie de 1 000 par mois, investissement de 10 ans d'économies plus 1
+    result = financial_projection(np.array([0.0, 120_001.0]), np.array([1_000.0, 0.0]), years=10)
+    assert np.isnan(result["payback_month"][1]) and np.isnan(result["payback_year"][1])
+    longer = financial_projection(np.array([0.0, 120_001.0]), np.array([1_000.0, 0.0]), years=11)
+    assert longer["payback_month"][1] == 121
+
+
+def test_zero_rates_match_plain_totals():
+    capex = np.array([150_000.0, 2_500_000.0, 1_800_000.0])
+    opex = np.array([25_000.0, 5_000.0, 12_000.0])
+    years = 10
+    expected = capex + opex * 12 * years
+
+    result = financial_projection(capex, opex, years=years)
+    np.testing.assert_allclose(result["cumulative"][..., -1], expected, rtol=1e-12)
+    np.testing.assert_allclose(result["npv"], expected, rtol=1e-12)
+
+    totals, npv = projected_costs(capex, opex, years=years)
+    np.testing.assert_allclose(totals, expected, rtol=1e-12)
+    np.testing.assert_allclose(npv, expected, rtol=1e-12)
+
+    summary = project_options(OPTIONS, capex, opex, years=years)
+    np.testing.assert_allclose(summary.totals, expected, rtol=1e-12)
+    np.testing.assert_allclose(summary.cumulative[:, 1], capex + opex * 12, rtol=1e-12)
+    assert summary.cheapest == OPTIONS[int(np.argmin(expected))]
+
+
+def test_projected_costs_match_projection_with_rates():
+    capex = np.array([150_000.0, 2_500_000.0, 1_800_000.0])
+    opex = np.array([25_000.0, 5_000.0, 12_000.0])
+    rates = dict(discount_rate=0.08, inflation=0.04, opex_escalation=np.array([0.06, 0.04, 0.05]),
+                 replacement_cost=np.array([0.0, 400_000.0, 200_000.0]), replacement_cycle_years=5)
+    result = financial_projection(capex, opex, years=15, **rates)
+    totals, npv = projected_costs(capex, opex, years=15, **rates)
+    np.testing.assert_allclose(totals, result["cumulative"][..., -1], rtol=1e-12)
+    np.testing.assert_allclose(npv, result["npv"], rtol=1e-12)
@@ -0,0 +1,48 @@
+"""
+Tests de l'AHP hiérarchique : priorités globales et noms de nœuds.
+
+Usage :
+    python -m pytest -q tests
+"""
+import numpy as np
+import pytest
+
+from engine.ahp_logic import AHPEngine
+from engine.hierarchy import AHPHierarchy, HierarchyNode
+
+
+def sample_root():
+    return HierarchyNode("Objectif", [
+        HierarchyNode("Coût", [HierarchyNode("CAPEX"), HierarchyNode("OPEX")], [3]),
+        HierarchyNode("Disponibilité", [HierarchyNode("Débit"), HierarchyNode("Continuité"),
+                                        HierarchyNode("Saison sèche")], [5, 3, 1 / 3]),
+    ], [1 / 5])
+
+
+def test_global_weights_are_products_of_local_weights():
+    hierarchy = AHPHierarchy(sample_root())
+    engine = AHPEngine()
+    top, _ = engine.compute_weights(np.array([[1, 1 / 5], [5, 1]]))
+    cost, _ = engine.compute_weights(np.array([[1, 3], [1 / 3, 1]]))
+    weights = hierarchy.leaf_weights()
+    assert list(weights) == ["CAPEX", "OPEX", "Débit", "Continuité", "Saison sèche"]
+    assert sum(weights.values()) == pytest.approx(1)
+    assert weights["CAPEX"] == pytest.approx(top[0] * cost[0])
+    assert weights["OPEX"] == pytest.approx(top[0] * cost[1])
+
+
+def test_consistency_per_internal_node():
+    hierarchy = AHPHierarchy(sample_root())
+    assert set(hierarchy.consistency) == {"Objectif", "Coût", "Disponibilité"}
+    assert hierarchy.consistency["Coût"] == pytest.approx(0)
+    assert hierarchy.consistency["Disponibilité"] > 0
+
+
+def test_duplicate_names_are_rejected():
+    # Deux sous-critères "Coût" écraseraient mutuellement leur CR et leur poids global
+    root = HierarchyNode("Objectif", [
+        HierarchyNode("Forage", [HierarchyNode("Coût"), HierarchyNode("Débit")], [9]),
+        HierarchyNode("Réseau", [HierarchyNode("Coût"), HierarchyNode("Pression")], [1 / 9]),
+    ], [1])
+    with pytest.raises(ValueError, match="Coût"):
+        AHPHierarchy(root)
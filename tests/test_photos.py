@@ -0,0 +1,55 @@
+"""
+Tests du pipeline des photos : un seul décodage par photo, quelle que soit
+la qualité JPEG demandée, et vignettes indépendantes de la qualité.
+
+Usage :
+    python -m pytest -q tests
+"""
+import glob
+import io
+from pathlib import Path
+
+from PIL import Image
+
+from benchmarks.bench_photos import phone_photo
+from engine.photos import PhotoPipeline, print_width_px
+
+ROOT = Path(__file__).resolve().parent.parent
+SAMPLES = sorted(glob.glob(str(ROOT / "temp_site_img_*.png")))
+
+
+def photos(count):
+    return [phone_photo(SAMPLES[i % len(SAMPLES)], seed=i, size=(1600, 1200)) for i in range(count)]
+
+
+def test_quality_change_reencodes_without_decoding():
+    pipeline = PhotoPipeline(workers=2)
+    batch = photos(3)
+    first = pipeline.process_many(batch, quality=85)
+    assert pipeline.stats["decodes"] == 3
+    for quality in range(50, 100, 5):
+        again = pipeline.process_many(batch, quality=quality)
+        assert [p.thumbnail for p in again] == [p.thumbnail for p in first]
+    assert pipeline.stats["decodes"] == 3
+    assert pipeline.process(batch[0], 50) != pipeline.process(batch[0], 95)
+    assert pipeline.process(batch[0], 85) is first[0].print_jpeg
+
+
+def test_print_version_is_resized_jpeg():
+    pipeline = PhotoPipeline()
+    with Image.open(io.BytesIO(pipeline.process(photos(1)[0]))) as image:
+        assert image.format == "JPEG"
+        # phone_photo porte une orientation EXIF 90° : la largeur d'impression s'applique après rotation
+        assert image.width == min(print_width_px(), 1200)
+        assert not image.getexif()
+
+
+def test_caches_stay_within_budget():
+    pipeline = PhotoPipeline(max_bytes=200_000, max_image_bytes=8_000_000, workers=1)
+    for data in photos(6):
+        pipeline.process(data)
+    stats = pipeline.stats
+    assert stats["decodes"] == 6
+    assert stats["bytes"] <= 200_000 or stats["size"] == 1
+    assert stats["image_bytes"] <= 8_000_000 or stats["images"] == 1
+    assert stats["images"] < 6
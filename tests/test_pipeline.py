@@ -0,0 +1,70 @@
+"""
+Tests de la chaîne de décision en lot : les coûts d'evaluate_sites, des
+rapports par site et du tableau de bord suivent la même projection.
+
+Usage :
+    python -m pytest -q tests
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from engine.finance import project_options
+from engine.pipeline import DEFAULT_FINANCE, HORIZON_YEARS, OPTIONS, evaluate_sites, option_projection
+from engine.report_batch import site_report_inputs
+
+LABELS = [label for *_, label in OPTIONS]
+
+RATES = {"discount_rate": 0.08, "inflation": 0.05, "tariff_escalation": 0.07, "pump_cost": 400000,
+         "pump_cycle": 4, "network_share": 0.3}
+
+
+def sample_sites(k=20, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({key: rng.choice([1 / 9, 1 / 5, 1, 5, 9], k) for key in ("c_vs_d", "c_vs_a", "d_vs_a")})
+    for _, prefix, _, _ in OPTIONS:
+        for key in "cda":
+            frame[f"{prefix}_{key}"] = rng.integers(1, 11, k)
+    for key, default in DEFAULT_FINANCE.items():
+        frame[key] = default * rng.uniform(0.5, 2, k)
+    return frame
+
+
+def dashboard_projection(row, years=HORIZON_YEARS, **rates):
+    """Projection d'un site telle que la calcule la section finance du tableau de bord."""
+    capex, opex, params = option_projection(*(row[key] for key in DEFAULT_FINANCE), **rates)
+    return project_options(LABELS, capex, opex, years=years, **params)
+
+
+@pytest.mark.parametrize("rates", [{}, RATES])
+def test_batch_totals_match_dashboard(rates):
+    evaluated = evaluate_sites(sample_sites(), years=12, **rates)
+    for row in evaluated.to_dict("records"):
+        finance = dashboard_projection(row, years=12, **rates)
+        np.testing.assert_allclose([row[f"total_{p}"] for _, p, _, _ in OPTIONS], finance.totals, rtol=1e-12)
+        np.testing.assert_allclose([row[f"van_{p}"] for _, p, _, _ in OPTIONS], finance.npv, rtol=1e-12)
+        assert row["option_economique"] == finance.cheapest
+
+
+def test_reports_use_batch_projection():
+    evaluated = evaluate_sites(sample_sites(5), **RATES)
+    for index, row in enumerate(evaluated.to_dict("records")):
+        _, inputs = site_report_inputs(row, index=index, charts=False, projection=RATES)
+        np.testing.assert_allclose(inputs["finance"].totals, [row[f"total_{p}"] for _, p, _, _ in OPTIONS],
+                                   rtol=1e-12)
+
+
+def test_default_projection_is_straight_line():
+    # Sans taux ni remplacement : CAPEX + 12 mois d'OPEX par an
+    row = evaluate_sites(sample_sites(1)).iloc[0]
+    assert row["total_cw"] == pytest.approx(row["capex_cw"] + row["opex_cw"] * 12 * HORIZON_YEARS)
+    assert row["van_f"] == pytest.approx(row["total_f"])
+
+
+def test_rates_change_the_cheapest_option():
+    frame = sample_sites(200)
+    base = evaluate_sites(frame)
+    escalated = evaluate_sites(frame, tariff_escalation=0.25)
+    assert (escalated["total_cw"] > base["total_cw"]).all()
+    assert (escalated["total_f"] == base["total_f"]).all()
+    assert (escalated["option_economique"] != "CAMWATER").sum() >= (base["option_economique"] != "CAMWATER").sum()
@@ -0,0 +1,93 @@
+"""
+Tests des rapports en lot : archive ZIP et document fusionné écrit au fil
+du rendu (pages, sommaire, signets).
+
+Usage :
+    python -m pytest -q tests
+"""
+import glob
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from benchmarks.bench_pipeline import random_sites
+from engine.pipeline import evaluate_sites
+from engine.report_batch import TOC_ENTRIES_PER_PAGE, _render_site, render_reports, site_report_inputs
+
+pypdf = pytest.importorskip("pypdf")
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def sample_reports(n, charts=False, photos=()):
+    rows = evaluate_sites(random_sites(n)).to_dict("records")
+    for index, row in enumerate(rows):
+        row["site"] = f"Site {index + 1} - Nkolbisson"
+        row["photos"] = ";".join(photos)
+    return [site_report_inputs(row, index=index, charts=charts) for index, row in enumerate(rows)]
+
+
+def test_merged_pdf(tmp_path):
+    photos = sorted(glob.glob(str(ROOT / "temp_site_img_*.png")))[:2]
+    sites = sample_reports(3, charts=True, photos=photos)
+    output = tmp_path / "revue.pdf"
+    stats = render_reports(iter(sites), output)
+
+    reader = pypdf.PdfReader(output, strict=True)
+    assert len(reader.pages) == stats["pages"]
+    titles = [item.title for item in reader.outline]
+    assert titles == ["Sommaire", *(name for name, _ in sites)]
+    # Sommaire : une page, puis chaque rapport à la page annoncée
+    toc_text = reader.pages[0].extract_text()
+    first_pages = [reader.get_destination_page_number(item) for item in reader.outline]
+    assert first_pages[:2] == [0, 1]
+    for (name, _), page in zip(sites, first_pages[1:]):
+        assert f"{name} {page + 1}" in toc_text
+        assert "HYDRO-DECISIO" in reader.pages[page].extract_text()
+    assert any(page.images for page in reader.pages)
+
+
+def test_merged_pdf_toc_spans_pages(tmp_path):
+    sites = sample_reports(TOC_ENTRIES_PER_PAGE + 1)
+    output = tmp_path / "revue.pdf"
+    stats = render_reports(sites, output)
+    reader = pypdf.PdfReader(output)
+    assert stats["reports"] == TOC_ENTRIES_PER_PAGE + 1
+    assert len(reader.pages) == stats["pages"]
+    assert reader.get_destination_page_number(reader.outline[1]) == 2
+
+
+def test_zip_archive(tmp_path):
+    sites = sample_reports(2)
+    output = tmp_path / "rapports.zip"
+    stats = render_reports(sites, output)
+    with zipfile.ZipFile(output) as archive:
+        names = archive.namelist()
+        assert names == ["0001_Site_1_-_Nkolbisson.pdf", "0002_Site_2_-_Nkolbisson.pdf"]
+        assert archive.read(names[0]).startswith(b"%PDF")
+    assert stats["reports"] == 2
+
+
+def test_unsupported_suffix_fails_before_rendering(tmp_path):
+    def sites():
+        raise AssertionError("aucun rapport ne doit être rendu")
+        yield
+
+    with pytest.raises(ValueError, match=".docx"):
+        render_reports(sites(), tmp_path / "rapports.docx")
+    assert not (tmp_path / "rapports.docx").exists()
+
+
+def test_charts_rendered_in_worker(tmp_path):
+    # Les entrées ne portent que les specs (légères à transmettre) ; le SVG est rendu par le processus de rendu
+    (name, inputs), = sample_reports(1, charts=True)
+    assert set(inputs["chart_specs"]) == {"radar", "weights", "costs"}
+    assert "charts" not in inputs
+    _, with_charts, _ = _render_site(name, inputs)
+    _, without, _ = _render_site(name, {key: value for key, value in inputs.items() if key != "chart_specs"})
+    assert "chart_specs" in inputs
+    assert len(with_charts) > len(without)
+
+    stats = render_reports(iter(sample_reports(2, charts=True)), tmp_path / "revue.zip", processes=2)
+    assert stats["reports"] == 2
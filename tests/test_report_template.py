@@ -0,0 +1,88 @@
+"""
+Tests du gabarit des rapports : le texte écrit par ReportDocument (mesures
+et mises en page en cache) est placé comme avec un FPDF ordinaire, mot à
+mot, sur le rapport complet.
+
+Usage :
+    python -m pytest -q tests
+"""
+import io
+
+import pytest
+from fpdf import FPDF
+
+from benchmarks.bench_report_template import PlainTemplate, sample_reports
+from engine.report import build_report
+from engine.report_template import ReportTemplate
+
+pypdf = pytest.importorskip("pypdf")
+
+# Polices standard (/BaseFont) -> style fpdf2
+CORE_STYLES = {"Helvetica": "", "Helvetica-Bold": "B", "Helvetica-Oblique": "I", "Helvetica-BoldOblique": "BI"}
+
+
+def word_positions(document):
+    """(page, x, y, mot) de chaque mot écrit, en points, espacement des mots (Tw) compris."""
+    reader = pypdf.PdfReader(io.BytesIO(bytes(document.output())))
+    metrics = FPDF(unit="pt")
+    words = []
+    for number, page in enumerate(reader.pages):
+        fonts = page["/Resources"]["/Font"]
+        spacing = 0.0
+        for operands, operator in pypdf.generic.ContentStream(page.get_contents(), reader).operations:
+            if operator == b"BT":
+                spacing = 0.0
+            elif operator == b"Tf":
+                family, style = "Helvetica", CORE_STYLES[fonts[operands[0]].get_object()["/BaseFont"][1:]]
+                metrics.set_font(family, style, float(operands[1]))
+            elif operator == b"Tw":
+                spacing = float(operands[0])
+            elif operator == b"Td":
+                x, y = float(operands[0]), float(operands[1])
+            elif operator == b"Tj":
+                text = operands[0]
+                text = text.decode("cp1252") if isinstance(text, bytes) else str(text)
+                offset = 0.0
+                for word in text.split(" "):
+                    if word:
+                        words.append((number, x + offset, y, word))
+                    offset += metrics.get_string_width(word + " ") + spacing
+    return sorted(words, key=lambda w: (w[0], -round(w[2], 2), w[1]))
+
+
+@pytest.fixture(scope="module")
+def report_inputs():
+    inputs = sample_reports(1)[0]
+    # Paragraphes séparés par \n : dernière ligne de chacun alignée à gauche
+    inputs["zone_context"] = dict(inputs["zone_context"], description=(
+        "Premier paragraphe court avec quelques mots.\n"
+        "Deuxième paragraphe beaucoup plus long, qui doit passer sur plusieurs lignes pour que la "
+        "justification apparaisse dans le rendu, avec une dernière ligne alignée à gauche.\n\n"
+        "Troisième paragraphe après une ligne vide.\n"))
+    return inputs
+
+
+def test_text_positions_match_plain_fpdf(report_inputs):
+    expected = word_positions(build_report(**report_inputs, template=PlainTemplate()))
+    template = ReportTemplate()
+    # Deux rendus : mises en page calculées, puis servies par le cache
+    for _ in range(2):
+        result = word_positions(build_report(**report_inputs, template=template))
+        assert [(page, word) for page, _, _, word in result] == [(page, word) for page, _, _, word in expected]
+        for got, want in zip(result, expected):
+            assert got[1:3] == pytest.approx(want[1:3], abs=0.01), got[3]
+    assert template.stats["hits"] > 0
+
+
+def test_layout_paragraph_ends_left_aligned():
+    template = ReportTemplate()
+    pdf = template.new_document()
+    pdf.add_page()
+    pdf.set_font("Helvetica", "", 12)
+    lines = template.layout(pdf, "Premier paragraphe court avec quelques mots.\nSuite", pdf.epw, 6)
+    first = lines[0]
+    # Mots séparés d'une espace simple, pas étalés sur la largeur de la page
+    space = pdf.get_string_width(" ")
+    for (x, word), (next_x, _) in zip(first, first[1:]):
+        assert next_x == pytest.approx(x + pdf.get_string_width(word) + space)
+    assert [word for _, word in lines[1]] == ["Suite"]
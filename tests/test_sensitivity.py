@@ -0,0 +1,34 @@
+"""
+Tests de l'analyse de sensibilité : jugements agrégés d'un groupe (hors de
+l'échelle des curseurs) dans le Monte Carlo et la carte des inversions.
+
+Usage :
+    python -m pytest -q tests
+"""
+import numpy as np
+import pytest
+
+from engine.ahp_logic import SAATY_SLIDER_SCALE, AHPEngine, reciprocal_matrices
+from engine.group import group_decision
+from engine.sensitivity import monte_carlo_sensitivity, nearest_reversals, rank_reversal_map
+
+PERFORMANCES = [[7, 5, 6], [6, 9, 7], [5, 8, 8]]
+OPTIONS = ["CAMWATER", "FORAGE", "HYBRIDE"]
+
+
+def test_group_comparisons_reproduce_aij_weights():
+    experts = reciprocal_matrices(np.array([[3, 5, 1 / 2], [1, 7, 2], [1 / 3, 3, 1]]))
+    group = group_decision(experts, engine=AHPEngine(lambda_method="auto"))
+    comparisons = group["group_matrix"][np.triu_indices(3, 1)]
+    mc = monte_carlo_sensitivity(comparisons, PERFORMANCES, OPTIONS, n_samples=100, seed=0)
+    expected = np.asarray(PERFORMANCES) @ group["aij_weights"] / 10
+    assert list(mc["base_scores"].values()) == pytest.approx(expected.tolist())
+
+
+def test_nearest_reversals_snaps_in_log_scale():
+    rank_map = rank_reversal_map(PERFORMANCES, OPTIONS)
+    # 2.5 est plus proche de 5 que de 1 en échelle logarithmique (pas en écart absolu)
+    snapped = nearest_reversals(rank_map, [2.5, 0.4, 1.0])
+    exact = nearest_reversals(rank_map, [5, 1 / 5, 1])
+    assert snapped == exact
+    assert nearest_reversals(rank_map, list(SAATY_SLIDER_SCALE[1:4])) == nearest_reversals(rank_map, [1 / 5, 1, 5])